@@ -0,0 +1,61 @@
+"""
+Measure batch throughput (layouts per second) for an increasing number of worker processes.
+
+Usage:
+    python -m benchmarks.batch_benchmark --layouts 2000 --panels 40 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import List
+
+from source.batch import BatchProcessor
+
+
+def build_layout_lines(layouts: int, panels: int, seed: int = 7) -> List[str]:
+    """Builds residential roofs: 1-4 rows of touching panels, randomly positioned on the rafter grid."""
+    rnd = random.Random(seed)
+    lines = []
+    for i in range(layouts):
+        rows = rnd.randint(1, 4)
+        per_row = max(1, panels // rows)
+        x0 = rnd.randint(0, 100) * 16.0
+        y0 = rnd.uniform(0, 500)
+        roof = [
+            {"x": round(x0 + c * 45.05, 2), "y": round(y0 + r * 71.6, 2)}
+            for r in range(rows)
+            for c in range(per_row)
+        ]
+        lines.append(json.dumps({"id": f"roof-{i}", "panels": roof}))
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--layouts", type=int, default=2000)
+    parser.add_argument("--panels", type=int, default=40)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+    args = parser.parse_args()
+
+    lines = build_layout_lines(args.layouts, args.panels)
+
+    print(f"{'workers':>8} {'seconds':>9} {'layouts/s':>10}")
+    for workers in args.workers:
+        processor = BatchProcessor(workers=workers, chunk_size=args.chunk_size)
+
+        start = time.perf_counter()
+        count = sum(1 for _ in processor.run(lines))
+        elapsed = time.perf_counter() - start
+
+        assert count == len(lines)
+        print(f"{workers:>8} {elapsed:>9.2f} {count / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
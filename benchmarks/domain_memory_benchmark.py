@@ -0,0 +1,101 @@
+"""
+Measure memory per panel and per mount of the domain model representations.
+
+Usage:
+    python -m benchmarks.domain_memory_benchmark --count 100000
+"""
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from source.arrays import MountArray, PanelArray
+from source.config import PANEL_HEIGHT, PANEL_WIDTH
+from source.domain import Mount, Panel, Point, intern_point
+from source.fixed_point import to_fixed
+
+
+@dataclass(frozen=True)
+class LegacyPoint:
+    """Previous representation: frozen dataclass with __dict__."""
+
+    x: float
+    y: float
+
+
+@dataclass(frozen=True)
+class LegacyPanel:
+    top_left: LegacyPoint
+    width: float = PANEL_WIDTH
+    height: float = PANEL_HEIGHT
+
+
+@dataclass(frozen=True)
+class LegacyMount:
+    position: LegacyPoint
+
+
+def bytes_per_item(count: int, build: Callable[[int], object]) -> float:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def coordinate(i: int) -> tuple:
+    return float(i % 1000) * 45.05, float(i // 1000) * 71.6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    def legacy_panels(n):
+        return [LegacyPanel(top_left=LegacyPoint(*coordinate(i))) for i in range(n)]
+
+    def slotted_panels(n):
+        return [Panel(top_left=Point(*coordinate(i))) for i in range(n)]
+
+    def panel_array(n):
+        panels = PanelArray()
+        for i in range(n):
+            panels.append(*coordinate(i))
+        return panels
+
+    # mounts of a rafter shared by two panels: every candidate used to allocate its own Point
+    def legacy_mounts(n):
+        return [LegacyMount(position=LegacyPoint(float(i // 2 % 500) * 16.0, 0.0)) for i in range(n)]
+
+    def interned_mounts(n):
+        return [Mount(position=intern_point(float(i // 2 % 500) * 16.0, 0.0)) for i in range(n)]
+
+    # deduplicated mounts of the result: fixed-point keys, then their columns
+    def mount_keys(n):
+        return [(to_fixed(float(i % 500) * 16.0), to_fixed(float(i // 500) * 71.6)) for i in range(n)]
+
+    def mount_array(n):
+        return MountArray.from_keys(mount_keys(n))
+
+    rows = [
+        ("panel: dataclass + __dict__ (before)", legacy_panels),
+        ("panel: __slots__ + precomputed edges", slotted_panels),
+        ("panel: PanelArray columns", panel_array),
+        ("mount: dataclass + own Point (before)", legacy_mounts),
+        ("mount: __slots__ + interned Point", interned_mounts),
+        ("mount: (x, y) centi-unit key", mount_keys),
+        ("mount: MountArray columns", mount_array),
+    ]
+
+    print(f"{'representation':<40} {'bytes/item':>10}")
+    for name, build in rows:
+        print(f"{name:<40} {bytes_per_item(args.count, build):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
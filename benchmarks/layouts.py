@@ -0,0 +1,110 @@
+"""
+Seeded generator of realistic synthetic layouts for benchmarks.
+
+Every layout keeps panel tables aligned to the rafter grid, so the layouts pass validation
+and all calculation stages run to completion.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+from source.config import PANEL_HEIGHT, PANEL_WIDTH, RAFTER_SPACING
+from source.domain import Panel, Point
+
+PANEL_PITCH = 45.05  # touching panels: gap 0.35
+ROW_PITCH = PANEL_HEIGHT + 0.5  # touching rows: gap 0.5, shared joints
+TABLE_SIZE = 4  # panels per table, longer rows exceed the right cantilever limit
+TABLE_PITCH = 12 * RAFTER_SPACING  # tables start on the same rafter phase
+
+
+def _panel(x: float, y: float) -> Panel:
+    return Panel(top_left=Point(round(x, 2), round(y, 2)))
+
+
+def grid_layout(panels: int, rnd: random.Random, x0: float = 0.0, y0: float = 0.0) -> List[Panel]:
+    """Full rectangular grid of 4-panel tables in touching rows."""
+    per_row = max(TABLE_SIZE, int(panels ** 0.5) // TABLE_SIZE * TABLE_SIZE)
+    layout = []
+    for i in range(panels):
+        column, row = i % per_row, i // per_row
+        x = x0 + (column // TABLE_SIZE) * TABLE_PITCH + (column % TABLE_SIZE) * PANEL_PITCH
+        layout.append(_panel(x, y0 + row * ROW_PITCH))
+    return layout
+
+
+def staggered_layout(panels: int, rnd: random.Random) -> List[Panel]:
+    """Grid where every other row is shifted by two rafters."""
+    layout = grid_layout(panels, rnd)
+    per_row_top = {}
+    for panel in layout:
+        per_row_top.setdefault(panel.top, len(per_row_top))
+    return [
+        _panel(p.left + (2 * RAFTER_SPACING if per_row_top[p.top] % 2 else 0.0), p.top)
+        for p in layout
+    ]
+
+
+def islands_layout(panels: int, rnd: random.Random) -> List[Panel]:
+    """Sparse islands: small blocks of 1-4 x 1-3 panels scattered over a large site."""
+    layout: List[Panel] = []
+    site_columns = max(4, int((panels / 6) ** 0.5) * 3)
+    while len(layout) < panels:
+        columns, rows = rnd.randint(1, TABLE_SIZE), rnd.randint(1, 3)
+        x = rnd.randrange(site_columns) * TABLE_PITCH
+        y = rnd.randrange(site_columns) * 4 * ROW_PITCH
+        for row in range(rows):
+            for column in range(columns):
+                if len(layout) < panels:
+                    layout.append(_panel(x + column * PANEL_PITCH, y + row * ROW_PITCH))
+    return layout
+
+
+def gappy_layout(panels: int, rnd: random.Random) -> List[Panel]:
+    """Rows broken into many segments: runs of 1-4 touching panels, each run starting on the next free rafter."""
+    per_row = max(1, int(panels ** 0.5))
+    layout: List[Panel] = []
+    row = 0
+    while len(layout) < panels:
+        x, in_row = 0.0, 0
+        while in_row < per_row and len(layout) < panels:
+            run = min(rnd.randint(1, TABLE_SIZE), per_row - in_row, panels - len(layout))
+            for column in range(run):
+                layout.append(_panel(x + column * PANEL_PITCH, row * ROW_PITCH))
+            end = x + (run - 1) * PANEL_PITCH + PANEL_WIDTH
+            # next run starts on the first rafter after the gap (gap >= 1.3, above CONTINUOUS_GAP)
+            x = (int((end + 1.3) // RAFTER_SPACING) + 1) * RAFTER_SPACING
+            in_row += run
+        row += 1
+    return layout
+
+
+def far_origin_layout(panels: int, rnd: random.Random) -> List[Panel]:
+    """Grid placed in site coordinates far from the origin."""
+    return grid_layout(panels, rnd, x0=62_500 * RAFTER_SPACING, y0=500_000.0)
+
+
+LAYOUTS: Dict[str, Callable[[int, random.Random], List[Panel]]] = {
+    "grid": grid_layout,
+    "staggered": staggered_layout,
+    "islands": islands_layout,
+    "gappy": gappy_layout,
+    "far_origin": far_origin_layout,
+}
+
+
+def generate_layout(kind: str, panels: int, seed: int = 0) -> List[Panel]:
+    """
+    Generate a layout of given kind and number of panels; the same seed gives the same layout.
+
+    Args:
+        kind: one of LAYOUTS ("grid", "staggered", "islands", "gappy", "far_origin").
+        panels: number of panels.
+        seed: random seed.
+
+    Returns:
+        List[Panel]: panels in shuffled order, as they come from site exports.
+    """
+    rnd = random.Random(seed)
+    layout = LAYOUTS[kind](panels, rnd)
+    rnd.shuffle(layout)
+    return layout
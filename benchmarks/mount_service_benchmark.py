@@ -0,0 +1,77 @@
+"""
+Compare the indexed MountService rafter lookup against the previous linear scan.
+
+Usage:
+    python -m benchmarks.mount_service_benchmark --panels 5000 --repeat 3
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from source.config import EDGE_CLEARANCE, PANEL_HEIGHT
+from source.domain import Panel, Point
+from source.services.mount_service import MountService
+from source.services.rafter_service import RafterGrid
+
+
+def scan_mounts_for_panel(rafters: List[float], panel: Panel) -> List[float]:
+    """Previous implementation: filter every rafter, then re-sort the result."""
+    min_allowed_x = panel.left + EDGE_CLEARANCE
+    max_allowed_x = panel.right - EDGE_CLEARANCE
+
+    return sorted(x for x in rafters if min_allowed_x <= x <= max_allowed_x)
+
+
+def build_row_layout(panels_count: int, per_row: int = 100) -> List[Panel]:
+    """Builds wide commercial rows of touching panels (gap 0.35)."""
+    return [
+        Panel(top_left=Point((i % per_row) * 45.05, (i // per_row) * (PANEL_HEIGHT + 0.5)))
+        for i in range(panels_count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--panels", type=int, default=5000)
+    parser.add_argument("--per-row", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    panels = build_row_layout(args.panels, args.per_row)
+    grid = RafterGrid().generate_grid(panels)
+    rafters = list(grid)
+    service = MountService(grid)
+
+    for panel in panels:
+        assert service.get_mounts_for_panel(panel) == scan_mounts_for_panel(rafters, panel)
+
+    scan = best_of(
+        args.repeat, lambda: [scan_mounts_for_panel(rafters, p) for p in panels]
+    )
+    indexed = best_of(
+        args.repeat, lambda: [service.get_mounts_for_panel(p) for p in panels]
+    )
+    arithmetic = best_of(
+        args.repeat,
+        lambda: [grid.between(p.left + EDGE_CLEARANCE, p.right - EDGE_CLEARANCE) for p in panels],
+    )
+
+    print(f"panels: {len(panels)}, rafters: {len(rafters)}")
+    print(f"linear scan:  {scan * 1000:10.2f} ms")
+    print(f"binary search:{indexed * 1000:10.2f} ms")
+    print(f"grid interval:{arithmetic * 1000:10.2f} ms")
+    print(f"speedup:      {scan / indexed:10.1f}x (binary search), {scan / arithmetic:.1f}x (grid interval)")
+
+
+if __name__ == "__main__":
+    main()
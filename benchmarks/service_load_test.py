@@ -0,0 +1,147 @@
+"""
+Load test of the calculation service: concurrent keep-alive clients posting residential roofs.
+
+Starts the service in this process unless --url points to a running one, and reports throughput,
+503 rejections, client latency percentiles and the service statistics.
+
+Usage:
+    python -m benchmarks.service_load_test --requests 2000 --concurrency 64 --workers 4
+    python -m benchmarks.service_load_test --url http://127.0.0.1:8080 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.batch_benchmark import build_layout_lines
+from source.server import CalculationService, HttpServer
+
+
+async def _post(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str, body: bytes
+) -> Tuple[int, bytes]:
+    writer.write(
+        (
+            f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = int(head.split(" ", 2)[1])
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _get_json(host: str, port: int, path: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def run_load(
+    host: str, port: int, lines: List[str], concurrency: int
+) -> Tuple[List[float], int, int, float]:
+    """
+    Post every layout record with `concurrency` clients.
+
+    Returns:
+        Tuple[List[float], int, int, float]: latencies of answered requests in seconds,
+        number of answered and rejected (503) requests, and the wall time.
+    """
+    bodies = [line.encode("utf-8") for line in lines]
+    next_index = 0
+    latencies: List[float] = []
+    rejected = 0
+
+    async def client() -> None:
+        nonlocal next_index, rejected
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(bodies):
+                body = bodies[next_index]
+                next_index += 1
+                start = time.perf_counter()
+                status, _ = await _post(reader, writer, host, "/calculate", body)
+                if status == 503:
+                    rejected += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, len(latencies), rejected, time.perf_counter() - start
+
+
+async def _main(args: argparse.Namespace) -> None:
+    lines = build_layout_lines(args.requests, args.panels)
+
+    server: Optional[HttpServer] = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        server = HttpServer(
+            CalculationService(
+                workers=args.workers,
+                max_batch_size=args.max_batch_size,
+                max_batch_delay=args.max_batch_delay,
+                max_queue=args.max_queue,
+            )
+        )
+        await server.start("127.0.0.1", 0)
+        host, port = "127.0.0.1", server.port
+
+    try:
+        latencies, answered, rejected, elapsed = await run_load(
+            host, port, lines, args.concurrency
+        )
+        stats = await _get_json(host, port, "/stats")
+    finally:
+        if server is not None:
+            await server.close()
+
+    latencies.sort()
+
+    def ms(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    print(
+        f"{answered} answered, {rejected} rejected in {elapsed:.2f}s "
+        f"({answered / elapsed:.0f} req/s); client latency ms "
+        f"p50 {ms(0.5):.1f}  p95 {ms(0.95):.1f}  p99 {ms(0.99):.1f}  max {ms(1.0):.1f}"
+    )
+    print(json.dumps(stats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", default=None, help="running service, e.g. http://127.0.0.1:8080")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--panels", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-batch-delay", type=float, default=0.002)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
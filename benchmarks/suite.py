@@ -0,0 +1,137 @@
+"""
+Scaling benchmark of every SolarPanelCalculator stage with a regression gate.
+
+Usage:
+    # record a baseline
+    python -m benchmarks.suite --sizes 10 1000 100000 --save-baseline benchmarks/baseline.json
+
+    # compare against it, exit code 1 when a stage is slower than baseline * (1 + threshold)
+    python -m benchmarks.suite --sizes 10 1000 100000 --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+STAGES = ("rafter_grid", "rows_segments", "validation", "mounts", "joints", "formatting", "total")
+
+
+def time_stages(panels: List[Panel], repeat: int = 1) -> Dict[str, float]:
+    """
+    Time every calculation stage on the layout (best of `repeat` runs).
+    Stage timings are the calculator's own metrics, so they measure the pipeline calculate() runs.
+
+    Returns:
+        Dict[str, float]: seconds per stage.
+    """
+    best: Dict[str, float] = {}
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = SolarPanelCalculator(panels, include_metrics=True).calculate()
+        timings = dict(result["metrics"]["timings"], total=time.perf_counter() - start)
+
+        for stage, seconds in timings.items():
+            best[stage] = min(seconds, best.get(stage, seconds))
+
+    return best
+
+
+def run_suite(
+    kinds: List[str], sizes: List[int], repeat: int = 1, seed: int = 0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time all stages for every layout kind and size.
+
+    Returns:
+        Dict[str, Dict[str, float]]: {"<kind>/<size>": {stage: seconds}}
+    """
+    results = {}
+    for kind in kinds:
+        for size in sizes:
+            panels = generate_layout(kind, size, seed)
+            results[f"{kind}/{size}"] = time_stages(panels, repeat)
+    return results
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    min_seconds: float = 0.001,
+) -> List[str]:
+    """
+    Compare results with the baseline.
+    A stage regresses when it is slower than baseline * (1 + threshold); stages faster than
+    min_seconds in both runs are ignored as timer noise.
+
+    Returns:
+        List[str]: descriptions of regressed stages.
+    """
+    regressions = []
+    for case, stages in results.items():
+        for stage, seconds in stages.items():
+            reference = baseline.get(case, {}).get(stage)
+            if reference is None or max(seconds, reference) < min_seconds:
+                continue
+            if seconds > reference * (1 + threshold):
+                regressions.append(
+                    f"{case} {stage}: {seconds:.6f} s > {reference:.6f} s (+{seconds / reference - 1:.0%})"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'case':<22}" + "".join(f"{stage:>14}" for stage in STAGES))
+    for case, stages in results.items():
+        print(f"{case:<22}" + "".join(f"{stages.get(stage, 0.0):>14.6f}" for stage in STAGES))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--kinds", nargs="+", choices=tuple(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="up to 1000000 panels"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON baseline to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.001, help="ignore stages faster than this"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.kinds, args.sizes, args.repeat, args.seed)
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Compare the per-object and the numpy backends of SolarPanelCalculator at several layout sizes.
+
+Usage:
+    python -m benchmarks.vectorized_benchmark --sizes 1000 10000 100000
+"""
+
+import argparse
+import time
+from typing import List
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+
+
+def build_farm_layout(panels_count: int, per_row: int = 200) -> List[Panel]:
+    """Builds a rectangular farm of rows made of 4-panel tables placed every 192.0 units (12 rafters)."""
+    panels = []
+    for i in range(panels_count):
+        column, row = i % per_row, i // per_row
+        x = (column // 4) * 192.0 + (column % 4) * 45.05
+        panels.append(Panel(top_left=Point(round(x, 2), round(row * 71.6, 2))))
+    return panels
+
+
+def timed(calculator: SolarPanelCalculator) -> tuple:
+    start = time.perf_counter()
+    result = calculator.calculate()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'panels':>10} {'python, s':>10} {'numpy, s':>10} {'speedup':>8}")
+
+    for size in args.sizes:
+        panels = build_farm_layout(size)
+
+        python_time, expected = timed(SolarPanelCalculator(panels))
+        numpy_time, actual = timed(SolarPanelCalculator(panels, backend="numpy"))
+
+        assert "mounts" in expected, expected
+        assert actual == expected, "numpy backend result differs from python backend"
+        print(f"{size:>10} {python_time:>10.3f} {numpy_time:>10.3f} {python_time / numpy_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,40 @@
-import json
+import sys
 from typing import List
 
 from source.calculators.solar_panel_calculator import SolarPanelCalculator
-from source.domain import Panel, Point
+from source.domain import Panel
+from source.readers.panel_reader import iter_panels
+from source.writers.result_writer import JsonResultWriter
 
 
 def load_panels_from_file(path: str) -> List[Panel]:
     """
     Load Panel data from a JSON file and return Panel objects.
+    The file is parsed incrementally, so the raw JSON tree is never held in memory.
 
     Args:
-        path (str): Path to a JSON file containing a list of Panel data.
+        path (str): Path to a JSON file containing a list of Panel data
+            (or a JSON Lines file with one panel per line).
 
     Returns:
         list[Panel]: List of panels -> [Panel(x, y)].
     """
-    with open(path, "r") as f:
-        data = json.load(f)
-
-    return [Panel(top_left=Point(p["x"], p["y"])) for p in data["panels"]]
+    return list(iter_panels(path))
 
 
 def main() -> None:
     """
-    Loads panels from file, runs the solar panel calculator, and prints results.
+    Loads panels from file, runs the solar panel calculator, and writes results to stdout as JSON.
 
     Returns:
         JSON: {
-            'mounts': [],
-            'joints': []
+            "mounts": [],
+            "joints": []
         }
     """
     panels = load_panels_from_file("examples/sample_input.json")
-    result = SolarPanelCalculator(panels).calculate()
 
-    print(result)
+    SolarPanelCalculator(panels).write(JsonResultWriter(sys.stdout))
 
 
 if __name__ == "__main__":
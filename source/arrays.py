@@ -0,0 +1,221 @@
+from array import array
+from itertools import chain
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from source.config import PANEL_HEIGHT, PANEL_WIDTH
+from source.domain import Joint, Mount, Panel, Point
+from source.fixed_point import SCALE, FixedPoint, IntegralCentis, from_fixed, to_point
+
+
+def _int_flags(left: float, top: float, width: float, height: float) -> int:
+    return (
+        (type(left) is int)
+        | (type(top) is int) << 1
+        | (type(width) is int) << 2
+        | (type(height) is int) << 3
+    )
+
+
+def integral_flags(
+    left: Sequence[float], top: Sequence[float], width: Sequence[float], height: Sequence[float]
+) -> Optional[bytearray]:
+    """
+    Returns the PanelArray.integral flags of the columns, None when all their values are floats.
+    """
+    if int not in set(map(type, chain(left, top, width, height))):
+        return None
+    return bytearray(map(_int_flags, left, top, width, height))
+
+
+class PanelArray:
+    """
+    Column storage of panels backed by array('d'): left, top, width, height.
+    Takes 32 bytes per panel and can be iterated by the calculators without building Panel objects.
+    Coordinates given as int are flagged in the integral column, so Panels built from the columns
+    keep them int and the results match those of the Panels the columns were built from.
+    """
+
+    __slots__ = ("left", "top", "width", "height", "integral")
+
+    def __init__(self):
+        self.left = array("d")
+        self.top = array("d")
+        self.width = array("d")
+        self.height = array("d")
+        # per panel, bits 0-3 set for an int left, top, width and height; None while there is none
+        self.integral: Optional[bytearray] = None
+
+    @classmethod
+    def from_panels(cls, panels: Iterable[Panel]) -> "PanelArray":
+        panel_array = cls()
+        for panel in panels:
+            panel_array.append(panel.left, panel.top, panel.width, panel.height)
+        return panel_array
+
+    @classmethod
+    def from_columns(
+        cls,
+        left: Sequence[float],
+        top: Sequence[float],
+        width: Sequence[float],
+        height: Sequence[float],
+        integral: Optional[bytearray] = None,
+    ) -> "PanelArray":
+        """
+        Wrap existing columns without copying them, e.g. memoryviews of a mapped file.
+
+        Args:
+            left, top, width, height: float columns of the same length.
+            integral: flags of the int coordinates (see integral_flags), None if there is none.
+
+        Returns:
+            PanelArray
+        """
+        panel_array = cls()
+        panel_array.left, panel_array.top = left, top
+        panel_array.width, panel_array.height = width, height
+        panel_array.integral = integral
+        return panel_array
+
+    def append(
+        self,
+        left: float,
+        top: float,
+        width: float = PANEL_WIDTH,
+        height: float = PANEL_HEIGHT,
+    ) -> None:
+        flags = _int_flags(left, top, width, height)
+        if flags and self.integral is None:
+            self.integral = bytearray(len(self.left))
+        if self.integral is not None:
+            self.integral.append(flags)
+        self.left.append(left)
+        self.top.append(top)
+        self.width.append(width)
+        self.height.append(height)
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    def __getitem__(self, index: int) -> Panel:
+        left, top = self.left[index], self.top[index]
+        width, height = self.width[index], self.height[index]
+        if self.integral is not None and self.integral[index]:
+            left, top, width, height = _restore_ints(self.integral[index], left, top, width, height)
+        return Panel(top_left=Point(left, top), width=width, height=height)
+
+    def __iter__(self) -> Iterator[Panel]:
+        columns = zip(self.left, self.top, self.width, self.height)
+        if self.integral is None:
+            for left, top, width, height in columns:
+                yield Panel(top_left=Point(left, top), width=width, height=height)
+            return
+
+        for flags, (left, top, width, height) in zip(self.integral, columns):
+            if flags:
+                left, top, width, height = _restore_ints(flags, left, top, width, height)
+            yield Panel(top_left=Point(left, top), width=width, height=height)
+
+    def extent(self) -> Tuple[float, float]:
+        """
+        Returns horizontal extent of the layout: (leftmost edge, rightmost edge).
+        """
+        return min(self.left), max(
+            left + width for left, width in zip(self.left, self.width)
+        )
+
+    def to_panels(self) -> List[Panel]:
+        return list(self)
+
+
+def _restore_ints(
+    flags: int, left: float, top: float, width: float, height: float
+) -> Tuple[float, float, float, float]:
+    return (
+        int(left) if flags & 1 else left,
+        int(top) if flags & 2 else top,
+        int(width) if flags & 4 else width,
+        int(height) if flags & 8 else height,
+    )
+
+
+class PointArray:
+    """
+    Column storage of result points in centi-units backed by array('q'): x, y.
+    Takes 16 bytes per point (and a flag byte once there are IntegralCentis) instead of a tuple of two ints,
+    and gives the result coordinates without building objects.
+    """
+
+    __slots__ = ("x", "y", "integral")
+
+    def __init__(self):
+        self.x = array("q")
+        self.y = array("q")
+        # per point, bit 0 set for an IntegralCentis x and bit 1 for y; None while there is none
+        self.integral: Optional[bytearray] = None
+
+    @classmethod
+    def from_keys(cls, keys: Sequence[FixedPoint]) -> "PointArray":
+        """Store fixed points, e.g. the deduplicated mount keys of a calculation."""
+        points = cls()
+        points.x = array("q", map(itemgetter(0), keys))
+        points.y = array("q", map(itemgetter(1), keys))
+        if IntegralCentis in set(map(type, chain.from_iterable(keys))):
+            points.integral = bytearray(
+                (type(x) is IntegralCentis) | (type(y) is IntegralCentis) << 1 for x, y in keys
+            )
+        return points
+
+    def append(self, key: FixedPoint) -> None:
+        x, y = key
+        flags = (type(x) is IntegralCentis) | (type(y) is IntegralCentis) << 1
+        if flags and self.integral is None:
+            self.integral = bytearray(len(self.x))
+        if self.integral is not None:
+            self.integral.append(flags)
+        self.x.append(x)
+        self.y.append(y)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[FixedPoint]:
+        """Iterate the fixed points, IntegralCentis restored."""
+        if self.integral is None:
+            return zip(self.x, self.y)
+        return (
+            (IntegralCentis(x) if flags & 1 else x, IntegralCentis(y) if flags & 2 else y)
+            for x, y, flags in zip(self.x, self.y, self.integral)
+        )
+
+    def iter_coordinates(self) -> Iterator[Tuple[float, float]]:
+        """Iterate the (x, y) coordinates of the result, e.g. for a ResultWriter."""
+        if self.integral is None:
+            for x, y in zip(self.x, self.y):
+                yield x / SCALE, y / SCALE
+            return
+        for x, y in self:
+            yield from_fixed(x), from_fixed(y)
+
+    def to_list(self) -> List[dict]:
+        """Returns the {"x": .., "y": ..} dictionaries of the result."""
+        return [{"x": x, "y": y} for x, y in self.iter_coordinates()]
+
+
+class MountArray(PointArray):
+    """Column storage of Mount positions."""
+
+    __slots__ = ()
+
+    def to_mounts(self) -> List[Mount]:
+        return [Mount(position=to_point(key)) for key in self]
+
+
+class JointArray(PointArray):
+    """Column storage of Joint positions."""
+
+    __slots__ = ()
+
+    def to_joints(self) -> List[Joint]:
+        return [Joint(position=to_point(key)) for key in self]
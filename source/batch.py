@@ -0,0 +1,220 @@
+"""
+Batch calculation of many layouts (one roof per JSON Lines record) on a process pool.
+
+Usage:
+    python -m source.batch layouts.jsonl -o results.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.config import PANEL_HEIGHT, PANEL_WIDTH
+from source.domain import Panel, Point
+
+Chunk = List[Tuple[int, str]]
+# JSON output records of a chunk and the number of its layouts that failed
+ChunkRecords = Tuple[List[str], int]
+
+
+def evaluate_layout(line: str, backend: str = "python") -> Tuple[Any, dict, bool]:
+    """
+    Calculate one layout record {"id": ..., "panels": [{"x": .., "y": ..}, ...]}.
+
+    Returns:
+        Tuple[Any, dict, bool]: layout id (None if missing), calculation result or error structure,
+        and whether the record itself was valid.
+    """
+    layout_id = None
+    try:
+        layout = json.loads(line)
+        layout_id = layout.get("id")
+        panels = [
+            Panel(
+                top_left=Point(p["x"], p["y"]),
+                width=p.get("width", PANEL_WIDTH),
+                height=p.get("height", PANEL_HEIGHT),
+            )
+            for p in layout["panels"]
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        result = {
+            "status": "ERROR",
+            "message": "Invalid layout record.",
+            "details": f"{type(e).__name__}: {e}",
+        }
+        return layout_id, result, False
+
+    return layout_id, SolarPanelCalculator(panels, backend=backend).calculate(), True
+
+
+def calculate_layout(line_number: int, line: str, backend: str = "python") -> str:
+    """
+    Calculate one layout record {"id": ..., "panels": [{"x": .., "y": ..}, ...]}.
+    Errors of a layout (invalid record, validation errors) are reported in its own output record.
+
+    Returns:
+        str: JSON output record {"line": .., "id": .., "result": {...}}
+    """
+    layout_id, result, _ = evaluate_layout(line, backend)
+    return json.dumps({"line": line_number, "id": layout_id, "result": result})
+
+
+def calculate_chunk(chunk: Chunk, backend: str = "python") -> ChunkRecords:
+    """
+    Calculate a chunk of (line number, layout record) pairs in a worker process.
+
+    Returns:
+        ChunkRecords: JSON output records and the number of layouts with an error structure as result.
+    """
+    records = []
+    failed = 0
+    for line_number, line in chunk:
+        layout_id, result, _ = evaluate_layout(line, backend)
+        failed += "mounts" not in result
+        records.append(json.dumps({"line": line_number, "id": layout_id, "result": result}))
+    return records, failed
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Chunk]:
+    numbered = ((n, line) for n, line in enumerate(lines, start=1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BatchProcessor:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        max_in_flight: Optional[int] = None,
+        ordered: bool = True,
+        backend: str = "python",
+    ):
+        """
+        Args:
+            workers: number of worker processes (default: CPU count), 0 or 1 to calculate in this process.
+            chunk_size: number of layouts submitted to a worker at once.
+            max_in_flight: max number of submitted, not yet written chunks (default: 2 per worker),
+                bounds memory regardless of the input size.
+            ordered: yield results in input order; otherwise as soon as chunks complete.
+            backend: SolarPanelCalculator backend.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or 2 * max(self.workers, 1)
+        self.ordered = ordered
+        self.backend = backend
+        # layouts of the last run with an error structure as result
+        self.failed = 0
+
+    def run(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Calculate layout records and yield JSON output records.
+        The number of layouts that failed is counted in `failed`.
+
+        Args:
+            lines: Iterable of JSON layout records, one per layout (empty lines are skipped).
+
+        Returns:
+            Iterator[str]: JSON output records, one per layout.
+        """
+        chunks = _chunks(lines, self.chunk_size)
+        self.failed = 0
+
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield from self._records(calculate_chunk(chunk, self.backend))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if self.ordered:
+                yield from self._run_ordered(executor, chunks)
+            else:
+                yield from self._run_unordered(executor, chunks)
+
+    def _run_ordered(self, executor: Executor, chunks: Iterator[Chunk]) -> Iterator[str]:
+        in_flight: Deque[Future] = deque()
+
+        for chunk in chunks:
+            if len(in_flight) >= self.max_in_flight:
+                yield from self._records(in_flight.popleft().result())
+            in_flight.append(executor.submit(calculate_chunk, chunk, self.backend))
+
+        while in_flight:
+            yield from self._records(in_flight.popleft().result())
+
+    def _run_unordered(self, executor: Executor, chunks: Iterator[Chunk]) -> Iterator[str]:
+        in_flight: Set[Future] = set()
+
+        for chunk in chunks:
+            if len(in_flight) >= self.max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from self._records(future.result())
+            in_flight.add(executor.submit(calculate_chunk, chunk, self.backend))
+
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from self._records(future.result())
+
+    def _records(self, chunk_records: ChunkRecords) -> List[str]:
+        records, failed = chunk_records
+        self.failed += failed
+        return records
+
+    def run_file(self, input_path: str, output_path: str) -> int:
+        """
+        Calculate all layouts of a JSON Lines file and write output records to a JSON Lines file.
+
+        Returns:
+            int: number of processed layouts.
+        """
+        count = 0
+        with open(input_path, "r") as source, open(
+            output_path, "w", buffering=1 << 20
+        ) as target:
+            for record in self.run(source):
+                target.write(record + "\n")
+                count += 1
+        return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help="JSON Lines file with one layout per line")
+    parser.add_argument("-o", "--output", required=True, help="JSON Lines file for results")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument(
+        "--unordered", action="store_true", help="write results as soon as they are ready"
+    )
+    parser.add_argument("--backend", choices=SolarPanelCalculator.BACKENDS, default="python")
+    args = parser.parse_args()
+
+    processor = BatchProcessor(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        ordered=not args.unordered,
+        backend=args.backend,
+    )
+    processor.run_file(args.input, args.output)
+    return 1 if processor.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Versioned binary containers of panels and results, read through mmap without copying.
+
+Panels (magic b"SPCP"): header (magic, version, panel count) followed by little-endian float64 columns
+x, y, width, height. Results use the BinaryResultWriter layout (magic b"SPCR": header, (x, y) pairs
+of the mounts, then of the joints, and a trailer with the mount and joint counts; magic b"SPCE" for an error).
+Headers are multiples of 8 bytes, so every column is aligned for memoryview.cast("d")
+and numpy.frombuffer.
+
+Usage:
+    python -m source.binary layout.json layout.spcp      # JSON panels -> binary panels
+    python -m source.binary layout.spcp layout.json      # binary panels -> JSON panels
+    python -m source.binary result.spcr result.json      # binary result -> JSON result
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import IO, Iterable, List, Optional, Tuple, Union
+
+from source.arrays import PanelArray
+from source.domain import Panel
+from source.readers.panel_reader import (
+    JSONL_SUFFIXES,
+    PanelReaderError,
+    panel_array_from_records,
+    read_panel_array,
+)
+from source.writers.result_writer import BinaryResultWriter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+PANELS_MAGIC = b"SPCP"
+PANELS_VERSION = 1
+PANELS_HEADER = struct.Struct("<4sHxxQ")
+
+RESULT_MAGIC = BinaryResultWriter.MAGIC
+ERROR_MAGIC = BinaryResultWriter.ERROR_MAGIC
+RESULT_HEADER = BinaryResultWriter.HEADER
+RESULT_TRAILER = BinaryResultWriter.TRAILER
+ERROR_HEADER = BinaryResultWriter.ERROR_HEADER
+
+# columns are cast in place only when the host byte order matches the file
+_NATIVE = sys.byteorder == "little"
+
+
+class BinaryFormatError(ValueError):
+    pass
+
+
+def write_binary_panels(panels: Union[Iterable[Panel], PanelArray], stream: IO[bytes]) -> int:
+    """
+    Write panels as a binary panels container.
+
+    Args:
+        panels: Panels or PanelArray.
+        stream: binary stream.
+
+    Returns:
+        int: number of panels written.
+    """
+    if not isinstance(panels, PanelArray):
+        panels = PanelArray.from_panels(panels)
+
+    stream.write(PANELS_HEADER.pack(PANELS_MAGIC, PANELS_VERSION, len(panels)))
+    for column in (panels.left, panels.top, panels.width, panels.height):
+        column = array("d", column)
+        if not _NATIVE:
+            column.byteswap()
+        stream.write(column.tobytes())
+    stream.flush()
+    return len(panels)
+
+
+def _map(path: str) -> memoryview:
+    """Map the file read-only; the memoryview keeps the mapping alive."""
+    with open(path, "rb") as file:
+        try:
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        except ValueError:  # an empty file cannot be mapped
+            return memoryview(b"")
+
+
+def _columns(buffer: memoryview, offset: int, count: int, columns: int) -> List[memoryview]:
+    """Returns float64 columns of `count` items starting at offset, without copying on little-endian hosts."""
+    end = offset + 8 * count * columns
+    if len(buffer) < end:
+        raise BinaryFormatError(
+            f"Binary container is truncated: {len(buffer)} bytes, expected {end}"
+        )
+
+    result = []
+    for index in range(columns):
+        start = offset + 8 * count * index
+        column = buffer[start : start + 8 * count]
+        if _NATIVE:
+            result.append(column.cast("d"))
+        else:
+            swapped = array("d", column.tobytes())
+            swapped.byteswap()
+            result.append(memoryview(swapped))
+    return result
+
+
+def _check_header(
+    buffer: memoryview, header: struct.Struct, expected_magic: bytes, expected_version: int
+) -> tuple:
+    if len(buffer) < header.size:
+        raise BinaryFormatError("Binary container is truncated: incomplete header")
+    values = header.unpack_from(buffer)
+    magic, version = values[0], values[1]
+    if magic != expected_magic:
+        raise BinaryFormatError(
+            f"Unexpected binary container magic {magic!r}, expected {expected_magic!r}"
+        )
+    if version != expected_version:
+        raise BinaryFormatError(f"Unsupported binary container version {version}")
+    return values
+
+
+def read_binary_panels(path: str) -> PanelArray:
+    """
+    Map a binary panels container.
+    The returned PanelArray columns are read-only memoryviews of the mapped file (no copy),
+    so the array can be calculated but not appended to.
+
+    Args:
+        path: path to the file.
+
+    Returns:
+        PanelArray
+    """
+    buffer = _map(path)
+    _, _, count = _check_header(buffer, PANELS_HEADER, PANELS_MAGIC, PANELS_VERSION)
+
+    return PanelArray.from_columns(*_columns(buffer, PANELS_HEADER.size, count, 4))
+
+
+class BinaryResult:
+    """
+    Mapped binary result: float64 (x, y) pairs of mounts and joints, or the error structure.
+    The columns mounts_x, mounts_y, joints_x and joints_y are strided views of the pairs.
+    """
+
+    def __init__(
+        self,
+        mounts: Optional[memoryview] = None,
+        joints: Optional[memoryview] = None,
+        error: Optional[dict] = None,
+    ):
+        self.mounts = memoryview(array("d")) if mounts is None else mounts
+        self.joints = memoryview(array("d")) if joints is None else joints
+        self.mounts_x, self.mounts_y = self.mounts[0::2], self.mounts[1::2]
+        self.joints_x, self.joints_y = self.joints[0::2], self.joints[1::2]
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def numpy(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Returns columns mounts x, mounts y, joints x, joints y as read-only numpy arrays
+        sharing memory with the mapped file. Requires numpy.
+        """
+        if np is None:
+            raise ImportError("numpy is required for BinaryResult.numpy()")
+        mounts = np.frombuffer(self.mounts, dtype=float).reshape(-1, 2)
+        joints = np.frombuffer(self.joints, dtype=float).reshape(-1, 2)
+        return mounts[:, 0], mounts[:, 1], joints[:, 0], joints[:, 1]
+
+    def to_dict(self) -> dict:
+        """Returns the same structure as SolarPanelCalculator.calculate()."""
+        if self.error is not None:
+            return dict(self.error)
+        return {
+            "mounts": [{"x": x, "y": y} for x, y in zip(self.mounts_x, self.mounts_y)],
+            "joints": [{"x": x, "y": y} for x, y in zip(self.joints_x, self.joints_y)],
+        }
+
+
+def read_binary_result(path: str) -> BinaryResult:
+    """
+    Map a binary result written by BinaryResultWriter.
+
+    Args:
+        path: path to the file.
+
+    Returns:
+        BinaryResult
+    """
+    buffer = _map(path)
+    if bytes(buffer[:4]) == ERROR_MAGIC:
+        _, _, length = _check_header(
+            buffer, ERROR_HEADER, ERROR_MAGIC, BinaryResultWriter.VERSION
+        )
+        payload = buffer[ERROR_HEADER.size : ERROR_HEADER.size + length]
+        return BinaryResult(error=json.loads(bytes(payload).decode("utf-8")))
+
+    _check_header(buffer, RESULT_HEADER, RESULT_MAGIC, BinaryResultWriter.VERSION)
+    if len(buffer) < RESULT_HEADER.size + RESULT_TRAILER.size:
+        raise BinaryFormatError("Binary container is truncated: incomplete trailer")
+    mounts, joints = RESULT_TRAILER.unpack_from(buffer, len(buffer) - RESULT_TRAILER.size)
+    expected = RESULT_HEADER.size + 16 * (mounts + joints) + RESULT_TRAILER.size
+    if len(buffer) != expected:
+        raise BinaryFormatError(
+            f"Binary container is truncated: {len(buffer)} bytes, expected {expected}"
+        )
+
+    offset = RESULT_HEADER.size
+    (mount_pairs,) = _columns(buffer, offset, 2 * mounts, 1)
+    (joint_pairs,) = _columns(buffer, offset + 16 * mounts, 2 * joints, 1)
+    return BinaryResult(mount_pairs, joint_pairs)
+
+
+def write_binary_result(result: dict, stream: IO[bytes]) -> None:
+    """Write a calculate() result (or error structure) as a binary result."""
+    writer = BinaryResultWriter(stream)
+    if "mounts" in result:
+        writer.write_result(
+            ((point["x"], point["y"]) for point in result["mounts"]),
+            ((point["x"], point["y"]) for point in result["joints"]),
+        )
+    else:
+        writer.write_error(result)
+
+
+def detect_container(path: str) -> Optional[bytes]:
+    """Returns magic of the binary container at path, or None for other (e.g. JSON) files."""
+    with open(path, "rb") as file:
+        magic = file.read(4)
+    return magic if magic in (PANELS_MAGIC, RESULT_MAGIC, ERROR_MAGIC) else None
+
+
+def convert(source: str, target: str) -> None:
+    """
+    Convert between JSON and binary: binary panels and results are written as JSON,
+    a JSON panels document (or JSON Lines) as binary panels, and a JSON result as binary result.
+    The source is read completely before the target is created.
+    """
+    magic = detect_container(source)
+
+    if magic == PANELS_MAGIC:
+        panels = read_binary_panels(source)
+        document = {
+            "panels": [
+                {"x": x, "y": y, "width": width, "height": height}
+                for x, y, width, height in zip(
+                    panels.left, panels.top, panels.width, panels.height
+                )
+            ]
+        }
+        with open(target, "w") as file:
+            json.dump(document, file)
+        return
+
+    if magic is not None:
+        result = read_binary_result(source).to_dict()
+        with open(target, "w") as file:
+            json.dump(result, file)
+        return
+
+    if source.endswith(JSONL_SUFFIXES):
+        panels = read_panel_array(source, jsonl=True)
+    else:
+        with open(source, "r") as file:
+            document = json.load(file)
+        if not isinstance(document, dict):
+            raise PanelReaderError("JSON document is neither a panels document nor a result")
+
+        if "mounts" in document or "status" in document:
+            with open(target, "wb") as file:
+                write_binary_result(document, file)
+            return
+        if "panels" not in document:
+            raise PanelReaderError("Panels document has no 'panels' key")
+        panels = panel_array_from_records(document["panels"])
+
+    with open(target, "wb") as file:
+        write_binary_panels(panels, file)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("source", help="JSON or binary file")
+    parser.add_argument("target", help="output file in the other format")
+    args = parser.parse_args(argv)
+    convert(args.source, args.target)
+
+
+if __name__ == "__main__":
+    main()
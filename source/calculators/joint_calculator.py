@@ -1,97 +1,238 @@
-from typing import List
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from source.config import JOINT_GAP_THRESHOLD
+from source.constructors.layout_index import LayoutIndex
 from source.constructors.row_constructor import RowConstructor
-from source.domain import Panel, Joint, Point
+from source.constructors.spatial_hash import SpatialHash, check_placement
+from source.domain import Panel, Joint
+from source.fixed_point import (
+    FixedPoint,
+    from_fixed,
+    merge_sorted,
+    merge_sorted_lazily,
+    to_fixed,
+    to_point,
+)
 
 
-class JointCalculator:
-    def __init__(self, panels: List[Panel]):
-        self.panels = panels
+def horizontal_joints_in_row(row: List[Panel]) -> List[FixedPoint]:
+    """
+    Find joints between neighbours of the row: two per pair of panels closer than JOINT_GAP_THRESHOLD,
+    at the top and bottom of the gap.
 
-    def _horizontal_joints_in_row(self, row: List[Panel]) -> List[Joint]:
-        if not row:
-            return []
+    Args:
+        row: panels of a row sorted by X.
 
-        joints: List[Joint] = []
+    Returns:
+        List[FixedPoint]: joints as (x, y) in centi-units, duplicates included.
+    """
+    if not row:
+        return []
 
-        for panel_a, panel_b in zip(row, row[1:]):
-            gap = panel_b.left - panel_a.right
-            if abs(gap) < JOINT_GAP_THRESHOLD:
-                joint_x = round((panel_a.right + panel_b.left) / 2, 2)
-                joints.append(Joint(position=Point(joint_x, round(panel_a.top, 2))))
-                joints.append(Joint(position=Point(joint_x, round(panel_a.bottom, 2))))
+    joints: List[FixedPoint] = []
 
-        return joints
+    for panel_a, panel_b in zip(row, row[1:]):
+        gap = panel_b.left - panel_a.right
+        if abs(gap) < JOINT_GAP_THRESHOLD:
+            joint_x = to_fixed((panel_a.right + panel_b.left) / 2)
+            joints.append((joint_x, to_fixed(panel_a.top)))
+            joints.append((joint_x, to_fixed(panel_a.bottom)))
 
-    @staticmethod
-    def rounded_coord(joint: Joint, digits: int = 2) -> tuple:
-        """
-        Method to round Joint coordinates to N digits after coma
+    return joints
 
-        Args:
-            joint: Joint,
-            digits: int
 
-        Returns:
-            Tuple[float, float]
-        """
-        return (round(joint.position.x, digits), round(joint.position.y, digits))
+def shared_joints_between_rows(
+    top_row: List[Panel],
+    bottom_row: List[Panel],
+    top_row_joints: Optional[List[FixedPoint]] = None,
+    bottom_row_joints: Optional[List[FixedPoint]] = None,
+) -> List[FixedPoint]:
+    """
+    Find joints shared by two adjacent rows, as (x, y) in centi-units.
+    Horizontal joints of the rows are reused when already calculated, and matched
+    through a hash on the X-coordinate in linear time.
 
-    def _shared_joints_between_rows(
-        self, top_row: List[Panel], bottom_row: List[Panel]
-    ) -> List[Joint]:
-        if not top_row or not bottom_row:
-            return []
+    Args:
+        top_row: upper row sorted by X.
+        bottom_row: row right below it, sorted by X.
+        top_row_joints: horizontal_joints_in_row of top_row, None to calculate them.
+        bottom_row_joints: horizontal_joints_in_row of bottom_row, None to calculate them.
 
-        if abs(top_row[0].bottom - bottom_row[0].top) >= JOINT_GAP_THRESHOLD:
-            return []
+    Returns:
+        List[FixedPoint]: shared joints without duplicates, in the order of top_row_joints.
+    """
+    if not top_row or not bottom_row:
+        return []
+
+    if abs(top_row[0].bottom - bottom_row[0].top) >= JOINT_GAP_THRESHOLD:
+        return []
+
+    if top_row_joints is None:
+        top_row_joints = horizontal_joints_in_row(top_row)
+    if bottom_row_joints is None:
+        bottom_row_joints = horizontal_joints_in_row(bottom_row)
+
+    top_row_bottom_joints = [
+        joint
+        for joint in top_row_joints
+        if abs(from_fixed(joint[1]) - top_row[0].bottom)
+        < JOINT_GAP_THRESHOLD  # checking is it lower joints of top row panels
+    ]
+
+    bottom_row_top_joints: Dict[int, List[int]] = {}
+    for x, y in bottom_row_joints:
+        if (
+            abs(from_fixed(y) - bottom_row[0].top) < JOINT_GAP_THRESHOLD
+        ):  # checking is it upper joins of bottom row panels
+            bottom_row_top_joints.setdefault(x, []).append(y)
+
+    shared_joints: Dict[FixedPoint, None] = {}
+
+    for x, y_t in top_row_bottom_joints:
+        for y_b in bottom_row_top_joints.get(x, ()):
+            shared_joints.setdefault((x, _middle(y_t, y_b)))
+
+    return list(shared_joints)
 
-        top_row_joints = self._horizontal_joints_in_row(top_row)
-        bottom_row_joints = self._horizontal_joints_in_row(bottom_row)
-
-        top_row_bottom_joints = [
-            joint
-            for joint in top_row_joints
-            if abs(joint.position.y - top_row[0].bottom)
-            < JOINT_GAP_THRESHOLD  # checking is it lower joints of top row panels
-        ]
-
-        bottom_row_top_joints = [
-            joint
-            for joint in bottom_row_joints
-            if abs(joint.position.y - bottom_row[0].top)
-            < JOINT_GAP_THRESHOLD  # checking is it upper joins of bottom row panels
-        ]
-
-        shared_joints: List[Joint] = []
-        result = set()
-
-        for joint_t in top_row_bottom_joints:
-            for joint_b in bottom_row_top_joints:
-                if round(joint_t.position.x, 2) == round(joint_b.position.x, 2):
-                    shared_x = round((joint_t.position.x + joint_b.position.x) / 2, 2)
-                    shared_y = round((joint_t.position.y + joint_b.position.y) / 2, 2)
-                    shared_joint = (shared_x, shared_y)
-                    if shared_joint not in result:
-                        result.add(shared_joint)
-                        shared_joints.append(Joint(position=Point(shared_x, shared_y)))
-
-        return shared_joints
-
-    def _deduplicate_joints(self, joints: List[Joint], digits: int = 2) -> List[Joint]:
+
+def _middle(a: int, b: int) -> int:
+    """Returns the middle of two centi-unit coordinates, rounded as their float middle is."""
+    if a == b:
+        return int(a)
+    return to_fixed((from_fixed(a) + from_fixed(b)) / 2)
+
+
+def deduplicate_joints(joints: List[FixedPoint]) -> List[FixedPoint]:
+    """
+    Remove duplicated joints, keeping the first occurrence of each (x, y) in centi-units.
+    """
+    return list(dict.fromkeys(joints))
+
+
+def row_joint_keys(
+    rows: List[List[Panel]], next_row: Optional[List[Panel]] = None
+) -> Tuple[List[FixedPoint], List[FixedPoint]]:
+    """
+    Returns joints of consecutive rows in centi-units, duplicates included: the horizontal joints
+    of every row and the joints shared by every pair of adjacent rows, both in the order of rows.
+    Rows of a layout can be calculated in parts: next_row, the row following the part, only adds
+    the joints shared with the last row.
+
+    Args:
+        rows: consecutive rows, each sorted by X.
+        next_row: row following the last one, None for the last part of the layout.
+
+    Returns:
+        Tuple[List[FixedPoint], List[FixedPoint]]: horizontal joints and shared joints.
+    """
+    horizontal_joints: List[FixedPoint] = []
+    shared_joints: List[FixedPoint] = []
+
+    rows_joints = [horizontal_joints_in_row(row) for row in rows]
+    for row_joints in rows_joints:
+        horizontal_joints.extend(row_joints)
+
+    if next_row is not None:
+        rows = rows + [next_row]
+        rows_joints.append(horizontal_joints_in_row(next_row))
+
+    for i, (upper_row, lower_row) in enumerate(zip(rows, rows[1:])):
+        shared_joints.extend(
+            shared_joints_between_rows(
+                upper_row, lower_row, rows_joints[i], rows_joints[i + 1]
+            )
+        )
+
+    return horizontal_joints, shared_joints
+
+
+class JointCalculator:
+    def __init__(
+        self,
+        panels: List[Panel],
+        layout_index: Optional[LayoutIndex] = None,
+        placement: str = "rows",
+        spatial_hash: Optional[SpatialHash] = None,
+    ):
         """
-        Remove duplicated Joint objects by rounding coordinates to N decimal places.
-        Returns a list of unique Joint instances.
+        Args:
+            panels: Panels of the layout.
+            layout_index: LayoutIndex of the panels with already grouped rows.
+            placement: "rows" (default) to look for joints between neighbours in a row and between
+                adjacent rows, or "free" to look for them between any touching panels.
+            spatial_hash: SpatialHash of the panels reused by the "free" placement.
         """
-        unique = {}
+        check_placement(placement)
+        self.panels = panels
+        self.layout_index = layout_index
+        self.placement = placement
+        self.spatial_hash = spatial_hash
+        # number of joints found by the last calculate_joints call before deduplication
+        self.candidate_count = 0
 
-        for joint in joints:
-            key = self.rounded_coord(joint, digits)
-            if key not in unique:
-                unique[key] = Joint(position=Point(key[0], key[1]))
+    def _joints_of_touching_panels(self) -> List[FixedPoint]:
+        """
+        Find joints of any placement through the spatial hash.
 
-        return list(unique.values())
+        Two panels side by side closer than JOINT_GAP_THRESHOLD get a joint at both ends of their
+        common vertical edge. A bottom joint and a top joint of two such pairs at the same X and closer
+        than JOINT_GAP_THRESHOLD vertically give a shared joint, as for adjacent rows.
+        Joints are ordered like the row placement orders them: horizontal joints by the top, then
+        left edge of the left panel, then shared joints.
+        """
+        spatial_hash = self.spatial_hash or SpatialHash(self.panels)
+        panels = spatial_hash.panels
+        order = sorted(range(len(panels)), key=lambda i: (panels[i].top, panels[i].left))
+
+        horizontal_joints: List[FixedPoint] = []
+        bottom_joints: List[Tuple[int, FixedPoint]] = []
+        # top joints by X and by the band of height JOINT_GAP_THRESHOLD their Y falls into
+        top_joints: Dict[Tuple[int, int], List[Tuple[int, FixedPoint]]] = {}
+
+        for index in order:
+            panel_a = panels[index]
+            neighbours = sorted(
+                spatial_hash.right_neighbours(index),
+                key=lambda i: (panels[i].left, panels[i].top),
+            )
+
+            for neighbour in neighbours:
+                panel_b = panels[neighbour]
+                pair = len(bottom_joints)
+                joint_x = to_fixed((panel_a.right + panel_b.left) / 2)
+                top_joint = (joint_x, to_fixed(max(panel_a.top, panel_b.top)))
+                bottom_joint = (joint_x, to_fixed(min(panel_a.bottom, panel_b.bottom)))
+
+                horizontal_joints.append(top_joint)
+                horizontal_joints.append(bottom_joint)
+                bottom_joints.append((pair, bottom_joint))
+                top_joints.setdefault(
+                    (joint_x, math.floor(from_fixed(top_joint[1]) / JOINT_GAP_THRESHOLD)), []
+                ).append((pair, top_joint))
+
+        shared_joints: Dict[FixedPoint, None] = {}
+
+        for pair_t, (x, y_t) in bottom_joints:
+            band = math.floor(from_fixed(y_t) / JOINT_GAP_THRESHOLD)
+            candidates = [
+                candidate
+                for nearby_band in (band - 1, band, band + 1)
+                for candidate in top_joints.get((x, nearby_band), ())
+            ]
+            # in the order the joints were found, as the row placement matches them
+            candidates.sort(key=lambda candidate: candidate[0])
+
+            for pair_b, (_, y_b) in candidates:
+                if (
+                    pair_b == pair_t
+                    or abs(from_fixed(y_b) - from_fixed(y_t)) >= JOINT_GAP_THRESHOLD
+                ):
+                    continue
+
+                shared_joints.setdefault((x, _middle(y_t, y_b)))
+
+        return horizontal_joints + list(shared_joints)
 
     def calculate_joints(self) -> List[Joint]:
         """
@@ -100,21 +241,105 @@ class JointCalculator:
         Returns:
             List[Joint]
         """
-        row_constructor = RowConstructor(self.panels)
-        rows = row_constructor.group_panels_into_row()
+        return [Joint(position=to_point(key)) for key in self.calculate_joint_keys()]
+
+    def calculate_joint_keys(self) -> List[FixedPoint]:
+        """
+        Same as calculate_joints, but returns the joint positions as (x, y) in centi-units,
+        without building Joint objects.
+
+        Returns:
+            List[FixedPoint]
+        """
+        if self.placement == "free":
+            all_joints = self._joints_of_touching_panels()
+            self.candidate_count = len(all_joints)
+            return deduplicate_joints(all_joints)
+
+        rows = self._rows()
         if not rows:
             return []
 
-        all_joints: List[Joint] = []
+        horizontal_joints, shared_joints = row_joint_keys(rows)
+        all_joints = horizontal_joints + shared_joints
+
+        self.candidate_count = len(all_joints)
 
-        for row in rows:
-            horizontal_joints = self._horizontal_joints_in_row(row)
-            if horizontal_joints:
-                all_joints.extend(horizontal_joints)
+        return deduplicate_joints(all_joints)
 
-        for upper_row, lower_row in zip(rows, rows[1:]):
-            shared_joints = self._shared_joints_between_rows(upper_row, lower_row)
-            if shared_joints:
-                all_joints.extend(shared_joints)
+    def iter_joints(self) -> Iterator[Joint]:
+        """
+        Lazy version of calculate_joints: yields the same Joints sorted by (x, y)
+        instead of in the order they are found (see iter_joint_keys).
+
+        Returns:
+            Iterator[Joint]
+        """
+        for key in self.iter_joint_keys():
+            yield Joint(position=to_point(key))
+
+    def iter_joint_keys(self) -> Iterator[FixedPoint]:
+        """
+        Yields the joint positions of calculate_joint_keys in centi-units, sorted by (x, y).
+
+        Joints of every row, with the joints it shares with the next row, form a sorted stream.
+        A row stream is calculated only when the k-way merge reaches the left edge of the row, and the
+        horizontal joints of a row are kept only until both streams using them are calculated; duplicates,
+        which the merge puts next to each other, are dropped. Rows to the right of the consumed joints
+        are not calculated, but where rows start at the same X (e.g. a grid) every row is in the merge
+        at once. The "free" placement has no rows and sorts its joints at once.
+
+        Returns:
+            Iterator[FixedPoint]
+        """
+        if self.placement == "free":
+            all_joints = self._joints_of_touching_panels()
+            self.candidate_count = len(all_joints)
+            yield from merge_sorted([sorted(all_joints)])
+            return
+
+        rows = self._rows()
+        self.candidate_count = 0
+        # horizontal joints of rows calculated by one of the two streams using them
+        rows_joints: Dict[int, List[FixedPoint]] = {}
+
+        yield from merge_sorted_lazily(
+            [self._row_joint_stream(rows, index, rows_joints) for index in range(len(rows))],
+            # joints are between panels of the row, which is sorted by X
+            [to_fixed(row[0].left) for row in rows],
+        )
+
+    def _row_joint_stream(
+        self, rows: List[List[Panel]], index: int, rows_joints: Dict[int, List[FixedPoint]]
+    ) -> Iterator[FixedPoint]:
+        """Sorted joints of the row and those it shares with the next row, calculated when first pulled."""
+        row_joints = self._take_row_joints(rows, index, rows_joints)
+        joints = list(row_joints)
+        if index + 1 < len(rows):
+            next_row_joints = self._take_row_joints(rows, index + 1, rows_joints)
+            joints.extend(
+                shared_joints_between_rows(
+                    rows[index], rows[index + 1], row_joints, next_row_joints
+                )
+            )
+        joints.sort()
+        self.candidate_count += len(joints)
+
+        yield from joints
+
+    @staticmethod
+    def _take_row_joints(
+        rows: List[List[Panel]], index: int, rows_joints: Dict[int, List[FixedPoint]]
+    ) -> List[FixedPoint]:
+        # joints of a row are used by the stream of the row and of the row above it
+        row_joints = rows_joints.pop(index, None)
+        if row_joints is None:
+            row_joints = horizontal_joints_in_row(rows[index])
+            if index > 0:
+                rows_joints[index] = row_joints
+        return row_joints
 
-        return self._deduplicate_joints(all_joints)
+    def _rows(self) -> List[List[Panel]]:
+        if self.layout_index is not None:
+            return self.layout_index.rows
+        return RowConstructor(self.panels).group_panels_into_row()
@@ -1,12 +1,96 @@
-from typing import List
+import heapq
+import warnings
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from source.domain import Panel, Mount, Point
+from source.config import EDGE_CLEARANCE
+from source.constructors.row_constructor import RowConstructor
+from source.domain import Panel, Mount, intern_point
+from source.fixed_point import FixedPoint, merge_sorted, to_fixed, to_point
 from source.services.mount_service import MountService
+from source.services.pattern_cache import PatternCache
+from source.services.rafter_service import RafterSequence
+from source.validators.cantilever_validator import CantileverValidator
+from source.validators.span_limit_validator import SpanLimitValidator
+
+NO_RAFTERS_MESSAGE = "No rafters available for the panel"
+
+
+class NoRaftersWarning(UserWarning):
+    """A panel without a rafter under it was skipped, it has no mounts."""
+
+
+def warn_no_rafters(panel: Panel) -> None:
+    """Warn on stderr (not stdout, which carries the results) that the panel is skipped."""
+    warnings.warn(
+        f"Skipping panel with coordinates {panel.top_left} due to: {NO_RAFTERS_MESSAGE}",
+        NoRaftersWarning,
+        stacklevel=3,
+    )
+
+
+def validated_mount_positions(
+    segments: List[List[Panel]],
+    rafters: RafterSequence,
+    mount_service: MountService,
+    pattern_cache: Optional[PatternCache] = None,
+) -> List[Tuple[Panel, List[float]]]:
+    """
+    Validate the segments and return the mount X-coordinates of their panels.
+    Raises CantileverValidatorError/SpanLimitValidatorError at the first segment that is not valid.
+
+    Returns:
+        List[Tuple[Panel, List[float]]]: (panel, mount X-coordinates) of every panel, segment after segment.
+    """
+    cantilever_validator = CantileverValidator()
+    span_limit_validator = SpanLimitValidator()
+
+    panels_mounts_x = []
+    for segment in segments:
+        if pattern_cache is not None:
+            base, key = pattern_cache.segment_key(segment)
+            cached_ranges = pattern_cache.get(key, base, segment)
+
+            if cached_ranges is not None:
+                # valid pattern translated into place, no validation needed
+                offset = rafters.start
+                for panel, (start, stop) in zip(segment, cached_ranges):
+                    panels_mounts_x.append(
+                        (panel, mount_service.get_mounts_in_range(start - offset, stop - offset))
+                    )
+                continue
+
+        rafter_ranges = [mount_service.get_rafter_range(panel) for panel in segment]
+
+        mounts_x = mount_service.merge_rafter_ranges(rafter_ranges)
+
+        cantilever_validator.validate(segment, mounts_x)
+
+        for panel, (start, stop) in zip(segment, rafter_ranges):
+            panel_mounts_x = mount_service.get_mounts_in_range(start, stop)
+
+            span_limit_validator.validate(panel_mounts_x)
+
+            panels_mounts_x.append((panel, panel_mounts_x))
+
+        if pattern_cache is not None:
+            pattern_cache.put(
+                key,
+                base,
+                segment,
+                [(rafters.start + start, rafters.start + stop) for start, stop in rafter_ranges],
+            )
+
+    return panels_mounts_x
 
 
 class MountCalculator:
-    def __init__(self, rafters_x_coordinates: List[float]):
-        self.mount_service = MountService(rafters_x_coordinates)
+    def __init__(
+        self,
+        rafters_x_coordinates: List[float],
+        edge_clearance: float = EDGE_CLEARANCE,
+    ):
+        self.mount_service = MountService(rafters_x_coordinates, edge_clearance)
 
     def mounts_for_panel(self, panel: Panel) -> list[Mount]:
         """
@@ -20,14 +104,28 @@ class MountCalculator:
         """
         possible_mounts = self.mount_service.get_mounts_for_panel(panel)
 
-        if not possible_mounts:
-            raise ValueError("No rafters available for the panel")
+        return self.mounts_from_positions(panel, possible_mounts)
+
+    @staticmethod
+    def mounts_from_positions(panel: Panel, mounts_x: List[float]) -> List[Mount]:
+        """
+        Return list of mounts for one panel from already calculated mount X-coordinates
+
+        Args:
+            panel: Panel
+            mounts_x: List[float], X-coordinates of the panel mounts
+
+        Returns:
+            List[Mount]
+        """
+        if not mounts_x:
+            raise ValueError(NO_RAFTERS_MESSAGE)
 
         mounts: List[Mount] = []
 
-        for x in possible_mounts:
-            mounts.append(Mount(position=Point(x, panel.top)))
-            mounts.append(Mount(position=Point(x, panel.bottom)))
+        for x in mounts_x:
+            mounts.append(Mount(position=intern_point(x, panel.top)))
+            mounts.append(Mount(position=intern_point(x, panel.bottom)))
 
         return mounts
 
@@ -42,20 +140,11 @@ class MountCalculator:
         Returns:
             List[Mount]
         """
-        if not mounts:
-            return []
-
-        unique_mounts = {}
+        unique_mounts = {
+            (to_fixed(mount.position.x), to_fixed(mount.position.y)) for mount in mounts
+        }
 
-        for mount in mounts:
-            key = (round(mount.position.x, 2), round(mount.position.y, 2))
-            if key not in unique_mounts:
-                unique_mounts[key] = Mount(position=Point(key[0], key[1]))
-
-        unique_sorted = sorted(
-            unique_mounts.values(), key=lambda mt: (mt.position.x, mt.position.y)
-        )
-        return unique_sorted
+        return [Mount(position=to_point(key)) for key in sorted(unique_mounts)]
 
     def collect_mounts_for_all_panels(
         self, panels: List[Panel], ignore_error: bool = True
@@ -75,20 +164,145 @@ class MountCalculator:
         if not panels:
             return []
 
-        all_mounts: List[Mount] = []
+        return self.collect_mounts_from_positions(
+            ((panel, self.mount_service.get_mounts_for_panel(panel)) for panel in panels),
+            ignore_error,
+        )
+
+    def collect_mounts_from_positions(
+        self,
+        panels_mounts_x: Iterable[Tuple[Panel, List[float]]],
+        ignore_error: bool = True,
+    ) -> List[Mount]:
+        """
+        Same as collect_mounts_for_all_panels, but takes already calculated mount X-coordinates of each panel,
+        so positions computed once for validation are reused to build Mounts.
+
+        Args:
+            panels_mounts_x: Iterable of (Panel, mount X-coordinates) pairs
+            ignore_error: bool, condition to ignore errors
+
+        Returns:
+            List[Mount]
+        """
+        return [
+            Mount(position=to_point(key))
+            for key in self.collect_mount_keys(panels_mounts_x, ignore_error)
+        ]
+
+    def collect_mount_keys(
+        self,
+        panels_mounts_x: Iterable[Tuple[Panel, List[float]]],
+        ignore_error: bool = True,
+    ) -> List[FixedPoint]:
+        """
+        Same as collect_mounts_from_positions, but returns the deduplicated mount positions
+        as (x, y) in centi-units sorted by (x, y), without building Mount objects.
+
+        Args:
+            panels_mounts_x: Iterable of (Panel, mount X-coordinates) pairs
+            ignore_error: bool, condition to ignore errors
+
+        Returns:
+            List[FixedPoint]
+        """
+        keys: Set[FixedPoint] = set()
 
-        for panel in panels:
-            try:
-                panel_mounts = self.mounts_for_panel(panel)
-            except ValueError as e:
+        for panel, mounts_x in panels_mounts_x:
+            if not mounts_x:
+                error = ValueError(NO_RAFTERS_MESSAGE)
                 if not ignore_error:
-                    raise
-                print(
-                    f"Warning: skipping panel with coordinates {panel.top_left} due to: {e}"
-                )
+                    raise error
+                warn_no_rafters(panel)
                 continue
-            all_mounts.extend(panel_mounts)
 
-        unique_mounts = self.deduplicate_mounts(all_mounts)
+            top, bottom = to_fixed(panel.top), to_fixed(panel.bottom)
+            for x in mounts_x:
+                fx = to_fixed(x)
+                keys.add((fx, top))
+                keys.add((fx, bottom))
 
-        return unique_mounts
+        return sorted(keys)
+
+    def iter_mounts_for_all_panels(
+        self, panels: List[Panel], ignore_error: bool = True
+    ) -> Iterator[Mount]:
+        """
+        Lazy version of collect_mounts_for_all_panels: yields the same Mounts in the same order,
+        merging the sorted mounts of each row (see iter_mount_keys).
+
+        Args:
+            panels: List[Panel]
+            ignore_error: bool, condition to ignore errors
+
+        Returns:
+            Iterator[Mount]
+        """
+        rows_mounts_x = (
+            [(panel, self.mount_service.get_mounts_for_panel(panel)) for panel in row]
+            for row in RowConstructor(panels).group_panels_into_row()
+        )
+        for key in self.iter_mount_keys(rows_mounts_x, ignore_error):
+            yield Mount(position=to_point(key))
+
+    def iter_mount_keys(
+        self,
+        rows_mounts_x: Iterable[Sequence[Tuple[Panel, List[float]]]],
+        ignore_error: bool = True,
+    ) -> Iterator[FixedPoint]:
+        """
+        Lazy version of collect_mount_keys: yields the deduplicated mount positions in centi-units
+        sorted by (x, y), without collecting all candidate mounts first.
+
+        Mounts of a row come out sorted by (x, y) when its panels are sorted by X and do not share
+        rafters, so every row is a sorted stream; the rows are combined in a k-way heap merge and
+        duplicates, which the merge puts next to each other, are dropped. Only one pending mount per
+        panel is held at a time.
+
+        Args:
+            rows_mounts_x: Iterable of rows (or parts of rows, e.g. segments), each a sequence of
+                (Panel, mount X-coordinates in ascending order) pairs sorted by X
+            ignore_error: bool, condition to ignore errors
+
+        Returns:
+            Iterator[FixedPoint]
+        """
+        yield from merge_sorted(
+            [self._row_mount_keys(row, ignore_error) for row in rows_mounts_x]
+        )
+
+    @staticmethod
+    def _row_mount_keys(
+        row: Sequence[Tuple[Panel, List[float]]], ignore_error: bool
+    ) -> Iterator[FixedPoint]:
+        """Returns sorted stream of mount positions of the row, duplicates included."""
+        streams = []
+        ordered = True
+        last_x = None
+
+        for panel, mounts_x in row:
+            if not mounts_x:
+                error = ValueError(NO_RAFTERS_MESSAGE)
+                if not ignore_error:
+                    raise error
+                warn_no_rafters(panel)
+                continue
+
+            first_x = to_fixed(mounts_x[0])
+            if last_x is not None and first_x <= last_x:
+                ordered = False  # panels share or interleave rafters
+            last_x = to_fixed(mounts_x[-1])
+            streams.append(MountCalculator._panel_mount_keys(panel, mounts_x))
+
+        return chain.from_iterable(streams) if ordered else heapq.merge(*streams)
+
+    @staticmethod
+    def _panel_mount_keys(panel: Panel, mounts_x: List[float]) -> Iterator[FixedPoint]:
+        top, bottom = sorted((to_fixed(panel.top), to_fixed(panel.bottom)))
+        last_x = None
+        for x in mounts_x:
+            fx = to_fixed(x)
+            if fx != last_x:  # rafters closer than 0.005 give the same mounts
+                last_x = fx
+                yield fx, top
+                yield fx, bottom
@@ -0,0 +1,246 @@
+"""
+Row-parallel calculation of one layout with the per-object pipeline.
+
+The parent orders the panels by top, finds the rows (row_bounds) and cuts them into chunks of consecutive rows
+with about the same number of panels. A chunk goes to a worker as PanelArray columns of its panels followed by
+those of the next row, so that the joints shared with the next chunk are found too. The worker groups the panels
+into rows and segments, validates the segments and returns its mounts and joints as MountArray and JointArray columns. The parent
+merges the chunks in order, so the result and the violation raised are those of the sequential pipeline.
+
+Process workers exchange pickled bytes: the pickling time in the parent and the workers is recorded as
+the "transfer" timing and their size as the "transfer_bytes" counter.
+"""
+import pickle
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
+from operator import attrgetter, le
+from typing import List, NamedTuple, Sequence, Tuple, Union
+
+from source.arrays import JointArray, MountArray, PanelArray, integral_flags
+from source.constructors.row_constructor import RowConstructor, row_bounds
+from source.domain import Panel
+from source.instrumentation import Instrumentation
+from source.calculators.joint_calculator import deduplicate_joints, row_joint_keys
+from source.calculators.mount_calculator import MountCalculator, validated_mount_positions
+from source.services.rafter_service import RafterSequence
+
+POOLS = ("process", "thread")
+
+# chunks of rows per worker, so uneven chunks even out
+ROW_CHUNKS_PER_WORKER = 4
+
+_COLUMNS = tuple(map(attrgetter, ("left", "top", "width", "height")))
+
+
+class RowChunk(NamedTuple):
+    """Panels of consecutive rows ordered by top, calculated by a worker."""
+
+    panels: PanelArray
+    # the panels of the last row are those of the row following the chunk
+    has_next_row: bool
+
+
+class ChunkResult(NamedTuple):
+    """Result of a chunk of rows calculated by a worker."""
+
+    segments: int
+    candidate_mounts: int
+    mounts: MountArray  # deduplicated, sorted by (x, y)
+    horizontal_joints: JointArray
+    shared_joints: JointArray
+
+
+def evaluate_rows_in_parallel(
+    panels: Union[List[Panel], PanelArray],
+    rafters: RafterSequence,
+    workers: int,
+    pool: str,
+    instrumentation: Instrumentation,
+) -> Tuple[MountArray, JointArray]:
+    """
+    Run the per-object calculation pipeline on chunks of consecutive rows in a pool of workers.
+    Raises CantileverValidatorError/SpanLimitValidatorError of the first chunk that is not valid.
+
+    Args:
+        panels: Panels of the layout or their PanelArray columns.
+        rafters: RafterSequence of the layout.
+        workers: number of workers.
+        pool: "process" or "thread".
+        instrumentation: Instrumentation measuring the stages.
+
+    Returns:
+        Tuple[MountArray, JointArray]: deduplicated mounts (sorted by x, y) and joints.
+    """
+    with instrumentation.stage("partition"):
+        chunks, rows = _partition(panels, workers * ROW_CHUNKS_PER_WORKER)
+    instrumentation.count("rows", rows)
+    instrumentation.count("row_chunks", len(chunks))
+
+    with instrumentation.stage("parallel"):
+        if len(chunks) == 1:
+            results = [_evaluate_chunk(chunks[0], rafters)]
+        elif pool == "thread":
+            with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                # results come in the order of chunks, the first error is that of the first chunk
+                results = list(executor.map(_evaluate_chunk, chunks, repeat(rafters)))
+        else:
+            results = _evaluate_in_processes(chunks, rafters, workers, instrumentation)
+
+    with instrumentation.stage("merge"):
+        # a stable sort of the sorted runs of the chunks keeps the first of equal mounts, as merge_sorted does
+        all_mounts = MountArray.from_keys(
+            list(dict.fromkeys(sorted(chain.from_iterable(result.mounts for result in results))))
+        )
+        candidate_joints = list(
+            chain.from_iterable(result.horizontal_joints for result in results)
+        )
+        for result in results:
+            candidate_joints.extend(result.shared_joints)
+        all_joints = JointArray.from_keys(deduplicate_joints(candidate_joints))
+
+    instrumentation.count("segments", sum(result.segments for result in results))
+    instrumentation.count(
+        "candidate_mounts", sum(result.candidate_mounts for result in results)
+    )
+    instrumentation.count("mounts", len(all_mounts))
+    instrumentation.count("candidate_joints", len(candidate_joints))
+    instrumentation.count("joints", len(all_joints))
+
+    return all_mounts, all_joints
+
+
+def _partition(
+    panels: Union[List[Panel], PanelArray], count: int
+) -> Tuple[List[RowChunk], int]:
+    """
+    Order the panels by top with a stable sort (skipped when they are in that order), as RowConstructor does,
+    find their rows and cut them into up to count chunks.
+
+    Returns:
+        Tuple[List[RowChunk], int]: the chunks and the number of rows.
+    """
+    if isinstance(panels, PanelArray):
+        columns: List[Sequence[float]] = [panels.left, panels.top, panels.width, panels.height]
+        integral = panels.integral
+    else:
+        columns = [list(map(getter, panels)) for getter in _COLUMNS]
+        integral = integral_flags(*columns)
+
+    tops = columns[1]
+    if not all(map(le, tops, islice(tops, 1, None))):
+        order = sorted(range(len(tops)), key=tops.__getitem__)
+        columns = [array("d", map(column.__getitem__, order)) for column in columns]
+        if integral is not None:
+            integral = bytearray(map(integral.__getitem__, order))
+
+    bounds = row_bounds(columns[1])
+    rows = len(bounds) - 1
+
+    chunks = []
+    for start_row, stop_row in _row_chunks(bounds, count):
+        start, stop = bounds[start_row], bounds[min(stop_row + 1, rows)]
+        chunks.append(
+            RowChunk(
+                PanelArray.from_columns(
+                    *(array("d", column[start:stop]) for column in columns),
+                    integral[start:stop] if integral is not None else None,
+                ),
+                stop_row < rows,
+            )
+        )
+
+    return chunks, rows
+
+
+def _row_chunks(bounds: List[int], count: int) -> List[Tuple[int, int]]:
+    """
+    Returns (start, stop) of up to count ranges of consecutive rows with about the same number of panels.
+
+    Args:
+        bounds: position of the first panel of every row followed by the number of panels (see row_bounds).
+        count: number of chunks.
+    """
+    total = bounds[-1]
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+
+    for row in range(1, len(bounds) - 1):
+        if bounds[row] * count >= total * (len(chunks) + 1):
+            chunks.append((start, row))
+            start = row
+    chunks.append((start, len(bounds) - 1))
+
+    return chunks
+
+
+def _evaluate_chunk(chunk: RowChunk, rafters: RafterSequence) -> ChunkResult:
+    """Calculate a chunk of consecutive rows; runs in a worker."""
+    rows, segments, segment_rows = RowConstructor(
+        chunk.panels.to_panels()
+    ).group_panels_into_rows_and_segments()
+    next_row = rows.pop() if chunk.has_next_row else None
+    # segments of the next row are calculated by the next chunk
+    segments = segments[: bisect_left(segment_rows, len(rows))]
+
+    mount_calculator = MountCalculator(rafters)
+    panels_mounts_x = validated_mount_positions(
+        segments, rafters, mount_calculator.mount_service
+    )
+    horizontal_joints, shared_joints = row_joint_keys(rows, next_row)
+
+    return ChunkResult(
+        len(segments),
+        sum(2 * len(xs) for _, xs in panels_mounts_x),
+        MountArray.from_keys(mount_calculator.collect_mount_keys(panels_mounts_x)),
+        JointArray.from_keys(horizontal_joints),
+        JointArray.from_keys(shared_joints),
+    )
+
+
+def _evaluate_pickled_chunk(payload: bytes, rafters: RafterSequence) -> Tuple[bytes, float]:
+    """
+    _evaluate_chunk of a pickled chunk; runs in a worker process.
+
+    Returns:
+        Tuple[bytes, float]: the pickled ChunkResult and the seconds spent unpickling and pickling.
+    """
+    start = time.perf_counter()
+    chunk = pickle.loads(payload)
+    seconds = time.perf_counter() - start
+
+    result = _evaluate_chunk(chunk, rafters)
+
+    start = time.perf_counter()
+    payload = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    return payload, seconds + time.perf_counter() - start
+
+
+def _evaluate_in_processes(
+    chunks: List[RowChunk],
+    rafters: RafterSequence,
+    workers: int,
+    instrumentation: Instrumentation,
+) -> List[ChunkResult]:
+    start = time.perf_counter()
+    payloads = [pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL) for chunk in chunks]
+    seconds = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        # results come in the order of chunks, the first error is that of the first chunk
+        replies = list(executor.map(_evaluate_pickled_chunk, payloads, repeat(rafters)))
+
+    start = time.perf_counter()
+    results = [pickle.loads(reply) for reply, _ in replies]
+    seconds += time.perf_counter() - start
+
+    instrumentation.add_time(
+        "transfer", seconds + sum(worker_seconds for _, worker_seconds in replies)
+    )
+    instrumentation.count(
+        "transfer_bytes",
+        sum(map(len, payloads)) + sum(len(reply) for reply, _ in replies),
+    )
+    return results
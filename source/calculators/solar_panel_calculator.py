@@ -1,11 +1,35 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
+from source.arrays import JointArray, MountArray, PanelArray
+from source.constructors.layout_index import LayoutIndex
 from source.constructors.segment_constructor import SegmentConstructor
+from source.constructors.spatial_hash import SpatialHash, check_placement
 from source.domain import Panel
-from source.formatter import OutputFormatter
+from source.fixed_point import (
+    FixedPoint,
+    fixed_coordinates,
+    fixed_points_to_list,
+)
+from source.instrumentation import (
+    Instrumentation,
+    MetricsSink,
+    NullInstrumentation,
+)
 from source.calculators.joint_calculator import JointCalculator
-from source.calculators.mount_calculator import MountCalculator
+from source.calculators.mount_calculator import (
+    MountCalculator,
+    validated_mount_positions,
+)
+from source.calculators.row_parallel import POOLS, evaluate_rows_in_parallel
+from source.calculators.vectorized_calculator import (
+    VectorizedCalculator,
+    iter_coordinates,
+    np,
+)
+from source.services.mount_service import MountService
+from source.services.pattern_cache import PatternCache
 from source.services.rafter_service import RafterGrid
+from source.services.result_cache import ResultCache
 from source.validators.cantilever_validator import (
     CantileverValidator,
     CantileverValidatorError,
@@ -14,11 +38,96 @@ from source.validators.span_limit_validator import (
     SpanLimitValidator,
     SpanLimitValidatorError,
 )
+from source.validators.verdict import (
+    CANTILEVER_RULE,
+    SPAN_RULE,
+    Verdict,
+    Violation,
+)
+from source.writers.result_writer import ResultWriter
 
 
 class SolarPanelCalculator:
-    def __init__(self, panels: List[Panel]):
+    BACKENDS = ("python", "numpy")
+    POOLS = POOLS
+
+    def __init__(
+        self,
+        panels: Union[Iterable[Panel], PanelArray],
+        backend: str = "python",
+        metrics_sink: Optional[MetricsSink] = None,
+        include_metrics: bool = False,
+        pattern_cache: Optional[PatternCache] = None,
+        placement: str = "rows",
+        result_cache: Optional[ResultCache] = None,
+        workers: int = 1,
+        pool: str = "process",
+    ):
+        """
+        Args:
+            panels: Panels of the layout (a list or any iterable, e.g. a streaming reader),
+                or their PanelArray columns.
+            backend: "python" (default) for the per-object calculation or "numpy" for
+                the vectorized calculation of large layouts (requires numpy).
+            metrics_sink: MetricsSink receiving stage timings and counters of every calculation,
+                e.g. PrometheusExporter.
+            include_metrics: add the "metrics" key with timings and counters to the calculate() result.
+            pattern_cache: PatternCache reused by calculations of the per-object backend, so segments
+                repeating the same shape and rafter phase are mounted and validated only once.
+            placement: "rows" (default) for panels placed in rows, or "free" for offset, staggered or
+                mixed-orientation layouts, whose segments and joints are found through a SpatialHash
+                (per-object backend only).
+            result_cache: ResultCache answering calculate() for layouts calculated before,
+                also when translated by whole rafter spacings.
+            workers: number of workers calculating chunks of rows of one layout in parallel
+                (per-object backend and "rows" placement, without a pattern cache);
+                1 (default) to calculate in this process.
+            pool: "process" (default) or "thread" pool of the workers; threads calculate in parallel
+                on free-threaded Python builds.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown backend {backend!r}, expected one of {self.BACKENDS}"
+            )
+        if backend == "numpy" and np is None:
+            raise ImportError("The numpy backend requires numpy to be installed")
+        check_placement(placement)
+        if placement == "free" and backend != "python":
+            raise ValueError("The free placement requires the python backend")
+        if pattern_cache is not None:
+            grid = RafterGrid()
+            if (pattern_cache.first_rafter, pattern_cache.spacing) != (
+                grid.first_rafter,
+                grid.spacing,
+            ):
+                raise ValueError("The pattern cache was built for another rafter grid")
+        if pool not in self.POOLS:
+            raise ValueError(f"Unknown pool {pool!r}, expected one of {self.POOLS}")
+        if workers > 1 and (
+            backend != "python" or placement != "rows" or pattern_cache is not None
+        ):
+            raise ValueError(
+                "Parallel workers require the python backend and the rows placement "
+                "without a pattern cache"
+            )
+
+        if not isinstance(panels, (list, PanelArray)):
+            panels = list(panels)
+
         self.panels = panels
+        self.backend = backend
+        self.metrics_sink = metrics_sink
+        self.include_metrics = include_metrics
+        self.pattern_cache = pattern_cache
+        self.placement = placement
+        self.result_cache = result_cache
+        self.workers = workers
+        self.pool = pool
+
+    def _instrumentation(self) -> Instrumentation:
+        if self.metrics_sink is None and not self.include_metrics:
+            return NullInstrumentation()
+        return Instrumentation(self.metrics_sink)
 
     def calculate(self) -> dict:
         """
@@ -28,54 +137,335 @@ class SolarPanelCalculator:
             dict: JSON-ready structure with unique mount points and joint points
             (each rounded to two decimals).
         """
-        if not self.panels:
+        instrumentation = self._instrumentation()
+
+        if self.result_cache is not None:
+            result = self._cached_calculate(instrumentation)
+        else:
+            result = self._calculate(instrumentation)
+
+        instrumentation.finish()
+        if self.include_metrics:
+            result["metrics"] = instrumentation.metrics.to_dict()
+
+        return result
+
+    def _cached_calculate(self, instrumentation: Instrumentation) -> dict:
+        panels = self.panels
+        if isinstance(panels, PanelArray):
+            panels = panels.to_panels()
+
+        cache = self.result_cache
+        with instrumentation.stage("result_cache"):
+            key, origin = cache.layout_key(panels, self.placement)
+            hit = cache.get(key, origin)
+
+        if hit is not None:
+            instrumentation.count("panels", len(panels))
+            instrumentation.count("result_cache_hits", 1)
+            result = hit.result
+            if hit.translated:
+                # mounts and the verdict are translated, joints depend on the absolute rounding
+                with instrumentation.stage("joints"):
+                    spatial_hash = SpatialHash(panels) if self.placement == "free" else None
+                    result["joints"] = fixed_points_to_list(
+                        JointCalculator(
+                            panels, None, self.placement, spatial_hash
+                        ).calculate_joint_keys()
+                    )
+            return result
+
+        instrumentation.count("result_cache_misses", 1)
+        result = self._calculate(instrumentation)
+        cache.put(key, origin, result)
+        return result
+
+    def _calculate(self, instrumentation: Instrumentation) -> dict:
+        instrumentation.count("panels", len(self.panels))
+
+        if not len(self.panels):
             return {"mounts": [], "joints": []}
 
         try:
-            rafters = RafterGrid().generate_grid(self.panels)
+            if self.backend == "numpy":
+                with instrumentation.stage("vectorized"):
+                    result = self._vectorized_calculator().calculate()
+                if "mounts" in result:
+                    instrumentation.count("mounts", len(result["mounts"]))
+                    instrumentation.count("joints", len(result["joints"]))
+                return result
 
-            segments = SegmentConstructor(self.panels).divide_rows_into_segments()
+            all_mounts, all_joints = self._evaluate(instrumentation)
 
-            mount_calculator = MountCalculator(rafters)
+            with instrumentation.stage("formatting"):
+                return {
+                    "mounts": all_mounts.to_list(),
+                    "joints": all_joints.to_list(),
+                }
+        except Exception as e:
+            return self.error_result(e)
 
-            for segment in segments:
-                mounts_x = mount_calculator.mount_service.get_mounts_for_segment(
-                    segment
-                )
+    def write(self, writer: ResultWriter) -> bool:
+        """
+        Compute mounts and joints and write them incrementally through the result writer,
+        instead of building the whole result dict.
+
+        Args:
+            writer: ResultWriter, e.g. JsonResultWriter(sys.stdout).
+
+        Returns:
+            bool: True if the layout was calculated, False if an error structure was written.
+        """
+        instrumentation = self._instrumentation()
+        instrumentation.count("panels", len(self.panels))
+
+        if not len(self.panels):
+            writer.write_result([], [])
+            instrumentation.finish()
+            return True
+
+        try:
+            if self.backend == "numpy":
+                with instrumentation.stage("vectorized"):
+                    mount_points, joint_points = self._vectorized_calculator().evaluate()
+                instrumentation.count("mounts", len(mount_points.points))
+                instrumentation.count("joints", len(joint_points.points))
+                mounts = iter_coordinates(mount_points)
+                joints = iter_coordinates(joint_points)
+            else:
+                # mounts are merged from the rows while they are written
+                all_mounts, all_joints = self._evaluate(instrumentation, lazy_mounts=True)
+                if isinstance(all_mounts, MountArray):  # calculated by row workers
+                    mounts = all_mounts.iter_coordinates()
+                else:
+                    mounts = fixed_coordinates(all_mounts)
+                joints = all_joints.iter_coordinates()
+        except Exception as e:
+            writer.write_error(self.error_result(e))
+            instrumentation.finish()
+            return False
+
+        with instrumentation.stage("writing"):
+            writer.write_result(mounts, joints)
+        instrumentation.finish()
+        return True
+
+    def check(self, collect_all: bool = False) -> Verdict:
+        """
+        Check whether the layout is buildable without producing mounts and joints.
+        Only rows, segments and the cantilever and span rules are evaluated, for both backends.
+
+        Args:
+            collect_all: False (default) to stop at the first violation, the same one calculate()
+                reports; True to collect violations of all segments and panels in one pass.
+
+        Returns:
+            Verdict: feasible flag and the violations found.
+        """
+        panels = self.panels
+        if isinstance(panels, PanelArray):
+            panels = panels.to_panels()
 
-                CantileverValidator().validate(segment, mounts_x)
+        violations: List[Violation] = []
+        if not panels:
+            return Verdict(violations)
 
-                for panel in segment:
-                    panel_mounts_x = (
-                        mount_calculator.mount_service.get_mounts_for_panel(panel)
+        rafters = RafterGrid().generate_grid(panels)
+        segments = SegmentConstructor(
+            panels, placement=self.placement
+        ).divide_rows_into_segments()
+
+        mount_service = MountService(rafters)
+        cantilever_validator = CantileverValidator()
+        span_limit_validator = SpanLimitValidator()
+
+        for segment_index, segment in enumerate(segments):
+            rafter_ranges = [mount_service.get_rafter_range(panel) for panel in segment]
+
+            try:
+                cantilever_validator.validate(
+                    segment, mount_service.merge_rafter_ranges(rafter_ranges)
+                )
+            except CantileverValidatorError as e:
+                violations.append(
+                    Violation(
+                        CANTILEVER_RULE,
+                        str(e),
+                        segment_index,
+                        segment[0].left,
+                        segment[-1].right,
                     )
+                )
+                if not collect_all:
+                    break
 
-                    SpanLimitValidator().validate(panel_mounts_x)
+            for panel, (start, stop) in zip(segment, rafter_ranges):
+                try:
+                    span_limit_validator.validate(
+                        mount_service.get_mounts_in_range(start, stop)
+                    )
+                except SpanLimitValidatorError as e:
+                    violations.append(
+                        Violation(
+                            SPAN_RULE,
+                            str(e),
+                            segment_index,
+                            segment[0].left,
+                            segment[-1].right,
+                            panel,
+                        )
+                    )
+                    if not collect_all:
+                        break
 
-            all_mounts = mount_calculator.collect_mounts_for_all_panels(self.panels)
+            if violations and not collect_all:
+                break
 
-            joint_calculator = JointCalculator(self.panels)
-            all_joints = joint_calculator.calculate_joints()
+        return Verdict(violations)
 
-            return {
-                "mounts": OutputFormatter.mounts_to_list(all_mounts),
-                "joints": OutputFormatter.joints_to_list(all_joints),
-            }
-        except CantileverValidatorError as e:
-            return {
-                "status": "ERROR",
-                "message": f"Cantilever Limit violated: {e}",
-                "details": "The distance from the segment edge to the first/last support exceeds 16.0 units.",
-            }
-        except SpanLimitValidatorError as e:
+    def is_feasible(self) -> bool:
+        """Returns True if the layout satisfies the cantilever and span rules."""
+        return self.check().feasible
+
+    def _vectorized_calculator(self) -> VectorizedCalculator:
+        if isinstance(self.panels, PanelArray):
+            return VectorizedCalculator.from_panel_array(self.panels)
+        return VectorizedCalculator.from_panels(self.panels)
+
+    def _evaluate(
+        self, instrumentation: Optional[Instrumentation] = None, lazy_mounts: bool = False
+    ) -> Tuple[Union[MountArray, Iterator[FixedPoint]], JointArray]:
+        """
+        Run the per-object calculation pipeline.
+        Raises CantileverValidatorError/SpanLimitValidatorError if the layout is not valid.
+
+        Args:
+            instrumentation: Instrumentation measuring the stages, disabled by default.
+            lazy_mounts: True to return an iterator merging the mounts of the segments as it is consumed
+                (MountCalculator.iter_mount_keys) instead of the MountArray.
+
+        Returns:
+            Tuple[Union[MountArray, Iterator[FixedPoint]], JointArray]: deduplicated mounts (sorted by x, y)
+                and joints.
+        """
+        if instrumentation is None:
+            instrumentation = NullInstrumentation()
+
+        panels = self.panels
+
+        with instrumentation.stage("rafter_grid"):
+            rafters = RafterGrid().generate_grid(panels)
+        instrumentation.count("rafters", len(rafters))
+
+        if self.workers > 1:
+            # workers build the Panels of their chunks, PanelArray columns are sent as they are
+            return evaluate_rows_in_parallel(
+                panels, rafters, self.workers, self.pool, instrumentation
+            )
+
+        if isinstance(panels, PanelArray):
+            panels = panels.to_panels()
+
+        with instrumentation.stage("rows_segments"):
+            if self.placement == "free":
+                layout_index, spatial_hash = None, SpatialHash(panels)
+                segments = SegmentConstructor(
+                    panels, placement="free", spatial_hash=spatial_hash
+                ).divide_rows_into_segments()
+            else:
+                layout_index, spatial_hash = LayoutIndex(panels), None
+                segments = SegmentConstructor(
+                    panels, layout_index
+                ).divide_rows_into_segments()
+                instrumentation.count("rows", len(layout_index.rows))
+        instrumentation.count("segments", len(segments))
+
+        mount_calculator = MountCalculator(rafters)
+        mount_service = mount_calculator.mount_service
+
+        pattern_cache = self.pattern_cache
+        if pattern_cache is not None:
+            hits, misses = pattern_cache.hits, pattern_cache.misses
+
+        # mount positions of every panel and segment are computed exactly once
+        # and shared between both validators and the mount collection below
+        with instrumentation.stage("validation"):
+            panels_mounts_x = validated_mount_positions(
+                segments, rafters, mount_service, pattern_cache
+            )
+
+        if pattern_cache is not None:
+            instrumentation.count("pattern_cache_hits", pattern_cache.hits - hits)
+            instrumentation.count("pattern_cache_misses", pattern_cache.misses - misses)
+
+        if instrumentation.enabled:
+            # every rafter under a panel gives a mount on its top and bottom edge
+            instrumentation.count(
+                "candidate_mounts", sum(2 * len(xs) for _, xs in panels_mounts_x)
+            )
+
+        if lazy_mounts:
+            # panels_mounts_x holds the panels segment after segment, each sorted by X;
+            # segments following each other to the right (those of one row) are one stream
+            rows_mounts_x = []
+            start = 0
+            for previous, segment in zip([None] + segments, segments):
+                stop = start + len(segment)
+                if previous is not None and segment[0].left > previous[-1].left:
+                    rows_mounts_x[-1].extend(panels_mounts_x[start:stop])
+                else:
+                    rows_mounts_x.append(panels_mounts_x[start:stop])
+                start = stop
+            all_mounts = _counted(
+                mount_calculator.iter_mount_keys(rows_mounts_x), instrumentation, "mounts"
+            )
+        else:
+            with instrumentation.stage("mounts"):
+                all_mounts = MountArray.from_keys(
+                    mount_calculator.collect_mount_keys(panels_mounts_x)
+                )
+            instrumentation.count("mounts", len(all_mounts))
+
+        with instrumentation.stage("joints"):
+            joint_calculator = JointCalculator(
+                panels, layout_index, self.placement, spatial_hash
+            )
+            all_joints = JointArray.from_keys(joint_calculator.calculate_joint_keys())
+        instrumentation.count("candidate_joints", joint_calculator.candidate_count)
+        instrumentation.count("joints", len(all_joints))
+
+        return all_mounts, all_joints
+
+    @staticmethod
+    def error_result(error: Exception) -> dict:
+        """
+        Converts an error raised during calculation to the JSON-ready error structure.
+        """
+        if isinstance(error, CantileverValidatorError):
             return {
                 "status": "ERROR",
-                "message": f"Span Limit violated: {e}",
-                "details": "The distance between two consecutive supports exceeds 48.0 units.",
+                "message": f"Cantilever Limit violated: {error}",
+                "details": f"The distance from the segment edge to the first/last support exceeds {error.limit} units.",
             }
-        except Exception as e:
+        if isinstance(error, SpanLimitValidatorError):
             return {
                 "status": "ERROR",
-                "message": "An unexpected error occurred during calculation.",
-                "details": str(e),
+                "message": f"Span Limit violated: {error}",
+                "details": f"The distance between two consecutive supports exceeds {error.limit} units.",
             }
+        return {
+            "status": "ERROR",
+            "message": "An unexpected error occurred during calculation.",
+            "details": str(error),
+        }
+
+
+def _counted(
+    items: Iterable[FixedPoint], instrumentation: Instrumentation, name: str
+) -> Iterator[FixedPoint]:
+    """Yields the items and counts them under name once they are exhausted."""
+    count = 0
+    for item in items:
+        count += 1
+        yield item
+    instrumentation.count(name, count)
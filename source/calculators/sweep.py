@@ -0,0 +1,337 @@
+"""
+Evaluate one layout for many rafter grids and mounting rules.
+
+Rows, segments and joints do not depend on rafters and are built once; every candidate only maps
+panels to rafter index ranges, validates segments and counts unique mount points.
+
+Usage:
+    python -m source.calculators.sweep layout.json --first-rafters 0 4 8 12 --spacings 16 24
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from source.calculators.joint_calculator import JointCalculator
+from source.calculators.mount_calculator import MountCalculator
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.config import (
+    CANTILEVER_LIMIT,
+    EDGE_CLEARANCE,
+    RAFTER_SPACING,
+    SPAN_LIMIT,
+)
+from source.constructors.layout_index import LayoutIndex
+from source.domain import Panel
+from source.fixed_point import FixedPoint, fixed_points_to_list
+from source.services.rafter_service import RafterGrid, RafterSequence
+from source.validators.cantilever_validator import (
+    CantileverValidator,
+    CantileverValidatorError,
+)
+from source.validators.span_limit_validator import (
+    SpanLimitValidator,
+    SpanLimitValidatorError,
+)
+
+
+@dataclass(frozen=True)
+class SweepCandidate:
+    """Rafter grid and mounting rules of one sweep candidate."""
+
+    first_rafter: float = 0.0
+    spacing: float = RAFTER_SPACING
+    edge_clearance: float = EDGE_CLEARANCE
+    cantilever_limit: float = CANTILEVER_LIMIT
+    span_limit: float = SPAN_LIMIT
+
+    def __post_init__(self) -> None:
+        if self.spacing <= 0:
+            raise ValueError(f"Rafter spacing must be positive, got {self.spacing}")
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    Evaluation of one candidate: unique mount count and validity.
+    message is the calculate() error message of an invalid layout.
+    """
+
+    candidate: SweepCandidate
+    feasible: bool
+    mounts: int
+    message: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self.candidate),
+            "feasible": self.feasible,
+            "mounts": self.mounts,
+            "message": self.message,
+        }
+
+
+def candidate_grid(
+    first_rafters: Iterable[float] = (0.0,),
+    spacings: Iterable[float] = (RAFTER_SPACING,),
+    edge_clearances: Iterable[float] = (EDGE_CLEARANCE,),
+    cantilever_limits: Iterable[float] = (CANTILEVER_LIMIT,),
+    span_limits: Iterable[float] = (SPAN_LIMIT,),
+) -> List[SweepCandidate]:
+    """Returns candidates for every combination of the given values."""
+    return [
+        SweepCandidate(*values)
+        for values in product(
+            first_rafters, spacings, edge_clearances, cantilever_limits, span_limits
+        )
+    ]
+
+
+class ParameterSweep:
+    def __init__(self, panels: Sequence[Panel]):
+        """
+        Args:
+            panels: Panels of the layout.
+        """
+        self.panels = list(panels)
+        self.layout_index = LayoutIndex(self.panels)
+        self.segments = self.layout_index.segments
+        self._joints: Optional[List[FixedPoint]] = None
+
+        # segments as indexes into panels, so rafter ranges of a candidate are computed once per panel
+        panel_indexes = {id(panel): index for index, panel in enumerate(self.panels)}
+        self._segment_indexes = [
+            [panel_indexes[id(panel)] for panel in segment] for segment in self.segments
+        ]
+
+        # panels by the rounded Y-coordinate of their top and bottom edges, sorted by left edge;
+        # mounts on one edge line are unique by rafter
+        edge_lines: Dict[float, List[int]] = {}
+        for index, panel in enumerate(self.panels):
+            for y in (panel.top, panel.bottom):
+                edge_lines.setdefault(round(y, 2), []).append(index)
+        self._edge_lines = [
+            sorted(indexes, key=lambda index: self.panels[index].left)
+            for indexes in edge_lines.values()
+        ]
+
+    @property
+    def joints(self) -> List[FixedPoint]:
+        """
+        Joints of the layout as (x, y) in centi-units; they do not depend on rafters and are calculated once.
+        """
+        if self._joints is None:
+            self._joints = JointCalculator(
+                self.panels, self.layout_index
+            ).calculate_joint_keys()
+        return self._joints
+
+    def evaluate(self, candidate: SweepCandidate) -> SweepResult:
+        """
+        Count unique mounts and validate the layout for one candidate.
+        The mount count equals the number of mounts calculate() returns with the candidate parameters
+        (for rafter spacing of at least 0.02, so that different rafters are not rounded together).
+        """
+        rafters = self._rafters(candidate)
+        ranges = self._rafter_ranges(candidate, rafters)
+
+        try:
+            self._validate(candidate, rafters, ranges)
+        except (CantileverValidatorError, SpanLimitValidatorError) as e:
+            feasible, message = False, SolarPanelCalculator.error_result(e)["message"]
+        else:
+            feasible, message = True, None
+
+        return SweepResult(candidate, feasible, self._count_mounts(ranges), message)
+
+    def run(
+        self,
+        candidates: Iterable[SweepCandidate],
+        workers: int = 1,
+        chunk_size: int = 64,
+    ) -> List[SweepResult]:
+        """
+        Evaluate candidates, in this process or on a process pool.
+
+        Args:
+            candidates: Iterable of SweepCandidate, e.g. candidate_grid(...).
+            workers: number of worker processes, 0 or 1 to evaluate in this process.
+            chunk_size: number of candidates submitted to a worker at once.
+
+        Returns:
+            List[SweepResult]: results in the order of candidates.
+        """
+        candidates = list(candidates)
+
+        if workers <= 1 or len(candidates) <= chunk_size:
+            return [self.evaluate(candidate) for candidate in candidates]
+
+        chunks = [
+            candidates[i : i + chunk_size] for i in range(0, len(candidates), chunk_size)
+        ]
+        # the layout is sent to every worker once, not with every chunk
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self.panels,)
+        ) as executor:
+            return [result for chunk in executor.map(_evaluate_chunk, chunks) for result in chunk]
+
+    @staticmethod
+    def best(results: Iterable[SweepResult]) -> Optional[SweepResult]:
+        """Returns the feasible result with the fewest mounts (the first one on ties), or None."""
+        feasible = [result for result in results if result.feasible]
+        return min(feasible, key=lambda result: result.mounts, default=None)
+
+    def result(self, candidate: SweepCandidate) -> dict:
+        """
+        Full calculation with the candidate parameters, reusing rows, segments and joints of the sweep.
+
+        Returns:
+            dict: the same structure as SolarPanelCalculator.calculate().
+        """
+        if not self.panels:
+            return {"mounts": [], "joints": []}
+
+        rafters = self._rafters(candidate)
+        try:
+            self._validate(candidate, rafters, self._rafter_ranges(candidate, rafters))
+        except (CantileverValidatorError, SpanLimitValidatorError) as e:
+            return SolarPanelCalculator.error_result(e)
+
+        rafters = RafterGrid(candidate.first_rafter, candidate.spacing).generate_grid(
+            self.panels
+        )
+        mount_calculator = MountCalculator(rafters, candidate.edge_clearance)
+        mount_service = mount_calculator.mount_service
+        mounts = mount_calculator.collect_mount_keys(
+            (panel, mount_service.get_mounts_for_panel(panel)) for panel in self.panels
+        )
+
+        return {
+            "mounts": fixed_points_to_list(mounts),
+            "joints": fixed_points_to_list(self.joints),
+        }
+
+    @staticmethod
+    def _rafters(candidate: SweepCandidate) -> RafterSequence:
+        # rafters of a panel do not depend on the extent of the layout, so the sequence is unbounded
+        return RafterSequence(candidate.first_rafter, candidate.spacing, 0, sys.maxsize)
+
+    def _rafter_ranges(
+        self, candidate: SweepCandidate, rafters: RafterSequence
+    ) -> List[Tuple[int, int]]:
+        """Returns rafter index ranges [start, stop) under every panel."""
+        edge_clearance = candidate.edge_clearance
+        return [
+            rafters.index_range(panel.left + edge_clearance, panel.right - edge_clearance)
+            for panel in self.panels
+        ]
+
+    def _validate(
+        self,
+        candidate: SweepCandidate,
+        rafters: RafterSequence,
+        ranges: List[Tuple[int, int]],
+    ) -> None:
+        """
+        Validate all segments in the order of calculate(), raising the same errors.
+        Validators receive only the rafters they compare, not the whole list of mounts.
+        """
+        cantilever_validator = CantileverValidator(candidate.cantilever_limit)
+        span_limit_validator = SpanLimitValidator(candidate.span_limit)
+
+        # consecutive rafters are spacing apart up to a float error
+        check_spans = candidate.spacing > candidate.span_limit * (1 - 1e-9)
+
+        for segment, indexes in zip(self.segments, self._segment_indexes):
+            mounted = [ranges[index] for index in indexes if ranges[index][0] < ranges[index][1]]
+
+            # positions are converted the same way MountService stores them
+            if mounted:
+                first = min(start for start, _ in mounted)
+                last = max(stop for _, stop in mounted) - 1
+                cantilever_validator.validate(
+                    segment, [float(rafters[first]), float(rafters[last])]
+                )
+            else:
+                cantilever_validator.validate(segment, [])
+
+            if check_spans:
+                for index in indexes:
+                    start, stop = ranges[index]
+                    span_limit_validator.validate([float(x) for x in rafters[start:stop]])
+
+    def _count_mounts(self, ranges: List[Tuple[int, int]]) -> int:
+        count = 0
+
+        for indexes in self._edge_lines:
+            last_stop = 0
+            # panels are sorted by left edge, so range starts do not decrease
+            for index in indexes:
+                start, stop = ranges[index]
+                start = max(start, last_stop)
+                if start < stop:
+                    count += stop - start
+                    last_stop = stop
+
+        return count
+
+
+_worker_sweep: Optional[ParameterSweep] = None
+
+
+def _init_worker(panels: List[Panel]) -> None:
+    global _worker_sweep
+    _worker_sweep = ParameterSweep(panels)
+
+
+def _evaluate_chunk(candidates: List[SweepCandidate]) -> List[SweepResult]:
+    return [_worker_sweep.evaluate(candidate) for candidate in candidates]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from source.readers.panel_reader import iter_panels
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help='layout file {"panels": [...]}')
+    parser.add_argument("--first-rafters", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--spacings", type=float, nargs="+", default=[RAFTER_SPACING])
+    parser.add_argument(
+        "--edge-clearances", type=float, nargs="+", default=[EDGE_CLEARANCE]
+    )
+    parser.add_argument(
+        "--cantilever-limits", type=float, nargs="+", default=[CANTILEVER_LIMIT]
+    )
+    parser.add_argument("--span-limits", type=float, nargs="+", default=[SPAN_LIMIT])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    sweep = ParameterSweep(list(iter_panels(args.input)))
+    candidates = candidate_grid(
+        args.first_rafters,
+        args.spacings,
+        args.edge_clearances,
+        args.cantilever_limits,
+        args.span_limits,
+    )
+    results = sweep.run(candidates, workers=args.workers)
+
+    best = ParameterSweep.best(results)
+    json.dump(
+        {
+            "results": [result.to_dict() for result in results],
+            "best": None if best is None else best.to_dict(),
+        },
+        sys.stdout,
+    )
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
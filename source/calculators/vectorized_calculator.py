@@ -0,0 +1,410 @@
+from operator import attrgetter
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency of the vectorized backend
+    np = None
+
+from source.arrays import PanelArray, integral_flags
+from source.config import (
+    CANTILEVER_LIMIT,
+    CONTINUOUS_GAP,
+    EDGE_CLEARANCE,
+    JOINT_GAP_THRESHOLD,
+    SPAN_LIMIT,
+)
+from source.calculators.mount_calculator import warn_no_rafters
+from source.domain import Panel, Point
+from source.services.rafter_service import RafterGrid
+from source.validators.cantilever_validator import CantileverValidator
+from source.validators.span_limit_validator import SpanLimitValidator
+
+
+def _round2(values: "np.ndarray") -> "np.ndarray":
+    """
+    Round values to 2 decimals exactly like built-in round(x, 2).
+    np.round scales by 100 and may differ in the last digit, so only the distinct values
+    are rounded in Python and mapped back.
+    """
+    if not values.size:
+        return values.astype(float)
+
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(value, 2) for value in unique.tolist()], dtype=float)
+
+    return rounded[inverse.reshape(values.shape)]
+
+
+def _expand_ranges(starts: "np.ndarray", stops: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Expand half-open [start, stop) ranges into flat indexes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (owner of each index, index)
+    """
+    counts = stops - starts
+    owners = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    return owners, starts[owners] + offsets
+
+
+class Coordinates(NamedTuple):
+    """(N, 2) coordinates rounded to 2 decimals, and which of them are int in the result."""
+
+    points: "np.ndarray"
+    # (N, 2) bool, None when the layout has no int coordinates
+    integral: Optional["np.ndarray"] = None
+
+
+def iter_coordinates(
+    coordinates: Coordinates, chunk_size: int = 1 << 16
+) -> Iterator[Tuple[float, float]]:
+    """
+    Iterate the coordinates as Python floats (ints where they are int in the result),
+    converting one chunk at a time.
+    """
+    points, integral = coordinates
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size].tolist()
+        if integral is None:
+            yield from chunk
+            continue
+        for (x, y), (x_int, y_int) in zip(chunk, integral[start:start + chunk_size].tolist()):
+            yield int(x) if x_int else x, int(y) if y_int else y
+
+
+class VectorizedCalculator:
+    """
+    NumPy backend of SolarPanelCalculator for large layouts.
+    Panels are stored as column arrays (left, top, width, height); every stage runs as array operations
+    and produces the same result as the per-object calculation.
+    """
+
+    def __init__(
+        self,
+        left: Sequence[float],
+        top: Sequence[float],
+        width: Sequence[float],
+        height: Sequence[float],
+        panels: Optional[List[Panel]] = None,
+        integral: Optional[Sequence[int]] = None,
+    ):
+        """
+        Args:
+            left, top, width, height: float columns of the panels.
+            panels: the Panels of the columns, if any, to report the panels of violations.
+            integral: per panel, bits 0-3 set for an int left, top, width and height
+                (see PanelArray.integral); None when there is none.
+        """
+        if np is None:
+            raise ImportError("The vectorized backend requires numpy to be installed")
+
+        self.left = np.asarray(left, dtype=float)
+        self.top = np.asarray(top, dtype=float)
+        self.width = np.asarray(width, dtype=float)
+        self.height = np.asarray(height, dtype=float)
+        self.right = self.left + self.width
+        self.bottom = self.top + self.height
+        self.integral = None if integral is None else np.frombuffer(bytes(integral), dtype=np.uint8)
+        self._panels = panels
+
+    @classmethod
+    def from_panels(cls, panels: List[Panel]) -> "VectorizedCalculator":
+        """Build the column arrays from Panel objects."""
+        if np is None:
+            raise ImportError("The vectorized backend requires numpy to be installed")
+
+        columns = [
+            list(map(attrgetter(name), panels)) for name in ("left", "top", "width", "height")
+        ]
+        return cls(*columns, panels=panels, integral=integral_flags(*columns))
+
+    @classmethod
+    def from_panel_array(cls, panel_array: PanelArray) -> "VectorizedCalculator":
+        """Build the calculator on top of PanelArray columns without copying them."""
+        if np is None:
+            raise ImportError("The vectorized backend requires numpy to be installed")
+
+        return cls(
+            np.frombuffer(panel_array.left, dtype=float),
+            np.frombuffer(panel_array.top, dtype=float),
+            np.frombuffer(panel_array.width, dtype=float),
+            np.frombuffer(panel_array.height, dtype=float),
+            integral=panel_array.integral,
+        )
+
+    def panel(self, index: int) -> Panel:
+        """Returns Panel object for the panel with given input index."""
+        if self._panels is not None:
+            return self._panels[index]
+
+        flags = 0 if self.integral is None else int(self.integral[index])
+        left, top, width, height = (
+            int(column[index]) if flags & bit else float(column[index])
+            for column, bit in zip((self.left, self.top, self.width, self.height), (1, 2, 4, 8))
+        )
+        return Panel(top_left=Point(left, top), width=width, height=height)
+
+    def group_rows(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Group panels into rows by Y coordinate and sort each row by X (same rules as RowConstructor).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (input indexes ordered by row and X, row index of each ordered panel)
+        """
+        by_top = np.argsort(self.top, kind="stable")
+        tops = self.top[by_top]
+        count = len(tops)
+
+        row_ids = np.empty(count, dtype=np.int64)
+        row, start = 0, 0
+
+        while start < count:
+            anchor = tops[start]
+            stop = int(np.searchsorted(tops, anchor + JOINT_GAP_THRESHOLD, side="right"))
+            # correcting the bound to the exact RowConstructor condition
+            while stop < count and abs(tops[stop] - anchor) <= JOINT_GAP_THRESHOLD:
+                stop += 1
+            while stop > start + 1 and abs(tops[stop - 1] - anchor) > JOINT_GAP_THRESHOLD:
+                stop -= 1
+
+            row_ids[start:stop] = row
+            row += 1
+            start = stop
+
+        by_row_and_left = np.lexsort((self.left[by_top], row_ids))
+
+        return by_top[by_row_and_left], row_ids[by_row_and_left]
+
+    def calculate(self) -> dict:
+        """
+        Compute mounts and joints for the layout.
+        Raises CantileverValidatorError/SpanLimitValidatorError like the per-object pipeline.
+
+        Returns:
+            dict: JSON-ready structure with unique mount points and joint points.
+        """
+        mounts, joints = self.evaluate()
+
+        return {
+            "mounts": [{"x": x, "y": y} for x, y in iter_coordinates(mounts)],
+            "joints": [{"x": x, "y": y} for x, y in iter_coordinates(joints)],
+        }
+
+    def evaluate(self) -> Tuple[Coordinates, Coordinates]:
+        """
+        Compute mounts and joints for the layout as coordinate arrays.
+        Raises CantileverValidatorError/SpanLimitValidatorError like the per-object pipeline.
+
+        Coordinates given as int stay int as in the per-object pipeline: the Y of mounts and horizontal
+        joints on an int panel edge, in the first occurrence of every deduplicated point.
+
+        Returns:
+            Tuple[Coordinates, Coordinates]: mount (sorted by x, y) and joint coordinates.
+        """
+        if not len(self.left):
+            return Coordinates(np.empty((0, 2))), Coordinates(np.empty((0, 2)))
+
+        order, row_ids = self.group_rows()
+
+        left, right = self.left[order], self.right[order]
+        top, bottom = self.top[order], self.bottom[order]
+
+        same_row = row_ids[1:] == row_ids[:-1]
+        gaps = left[1:] - right[:-1]
+
+        # segments
+        continuous = same_row & (np.abs(gaps) < CONTINUOUS_GAP)
+        segment_starts = np.flatnonzero(np.concatenate(([True], ~continuous)))
+        segment_stops = np.append(segment_starts[1:], len(order))
+
+        # rafter ranges of every panel
+        rafters = np.fromiter(
+            RafterGrid().generate_grid_for_extent(
+                float(self.left.min()), float(self.right.max())
+            ),
+            dtype=float,
+        )
+        starts = np.searchsorted(rafters, left + EDGE_CLEARANCE, side="left")
+        stops = np.searchsorted(rafters, right - EDGE_CLEARANCE, side="right")
+        stops = np.maximum(starts, stops)
+
+        self._validate(rafters, order, starts, stops, left, right, segment_starts, segment_stops)
+
+        if self.integral is None:
+            top_int = bottom_int = None
+        else:
+            flags = self.integral[order]
+            top_int = (flags & 2) != 0
+            bottom_int = (flags & 10) == 10  # int top + int height
+
+        mounts = self._mounts(rafters, order, starts, stops, top, bottom, top_int, bottom_int)
+        joints = self._joints(
+            row_ids, same_row, gaps, left, right, top, bottom, top_int, bottom_int
+        )
+
+        return mounts, joints
+
+    def _validate(self, rafters, order, starts, stops, left, right, segment_starts, segment_stops) -> None:
+        has_mounts = stops > starts
+        no_mount = len(rafters)
+
+        first_mount = np.minimum.reduceat(np.where(has_mounts, starts, no_mount), segment_starts)
+        last_mount = np.maximum.reduceat(np.where(has_mounts, stops - 1, -1), segment_starts)
+        segment_has_mounts = first_mount < no_mount
+
+        start_of_segment = left[segment_starts]
+        end_of_segment = right[segment_stops - 1]
+
+        # segments without mounts fail when they are longer than the cantilever limit
+        cantilever_failed = (end_of_segment - start_of_segment) > CANTILEVER_LIMIT
+        span_failed = np.zeros(len(starts), dtype=bool)
+
+        if no_mount:
+            first_x = rafters[np.minimum(first_mount, no_mount - 1)]
+            last_x = rafters[np.maximum(last_mount, 0)]
+            cantilever_failed = np.where(
+                segment_has_mounts,
+                (first_x - start_of_segment > CANTILEVER_LIMIT)
+                | (end_of_segment - last_x > CANTILEVER_LIMIT),
+                cantilever_failed,
+            )
+
+            # spans between consecutive rafters exceeding the limit, counted with prefix sums
+            too_long = np.concatenate(([0], np.cumsum(np.diff(rafters) > SPAN_LIMIT)))
+            several = stops - starts > 1
+            span_failed[several] = too_long[stops[several] - 1] - too_long[starts[several]] > 0
+
+        failed = cantilever_failed | np.maximum.reduceat(span_failed, segment_starts)
+
+        # re-running the validators on failing segments raises the same error as the per-object pipeline
+        cantilever_validator = CantileverValidator()
+        span_limit_validator = SpanLimitValidator()
+
+        for segment in np.flatnonzero(failed).tolist():
+            positions = range(segment_starts[segment], segment_stops[segment])
+            panels = [self.panel(int(order[i])) for i in positions]
+            panels_mounts_x = [rafters[starts[i]:stops[i]].tolist() for i in positions]
+
+            cantilever_validator.validate(
+                panels, sorted({x for mounts_x in panels_mounts_x for x in mounts_x})
+            )
+            for panel_mounts_x in panels_mounts_x:
+                span_limit_validator.validate(panel_mounts_x)
+
+    def _mounts(self, rafters, order, starts, stops, top, bottom, top_int, bottom_int) -> Coordinates:
+        for i in np.flatnonzero(stops == starts).tolist():
+            warn_no_rafters(self.panel(int(order[i])))
+
+        owners, rafter_indexes = _expand_ranges(starts, stops)
+        if not len(owners):
+            return Coordinates(np.empty((0, 2)))
+
+        xs = _round2(rafters[rafter_indexes])
+        # top and bottom mount of every rafter of every panel, in the order they are collected
+        all_mounts = np.stack(
+            (
+                np.column_stack((xs, _round2(top[owners]))),
+                np.column_stack((xs, _round2(bottom[owners]))),
+            ),
+            axis=1,
+        ).reshape(-1, 2)
+
+        if top_int is None:
+            return Coordinates(np.unique(all_mounts, axis=0))
+
+        mounts, first_occurrence = np.unique(all_mounts, axis=0, return_index=True)
+        y_int = np.column_stack((top_int[owners], bottom_int[owners])).ravel()
+        integral = np.column_stack(
+            (np.zeros(len(mounts), dtype=bool), y_int[first_occurrence])
+        )
+
+        return Coordinates(mounts, integral)
+
+    def _joints(
+        self, row_ids, same_row, gaps, left, right, top, bottom, top_int, bottom_int
+    ) -> Coordinates:
+        # horizontal joints: top and bottom joint for every touching pair of neighbours in a row
+        pairs = np.flatnonzero(same_row & (np.abs(gaps) < JOINT_GAP_THRESHOLD))
+        joint_x = _round2((right[pairs] + left[pairs + 1]) / 2)
+        joint_top = _round2(top[pairs])
+        joint_bottom = _round2(bottom[pairs])
+        joint_rows = row_ids[pairs]
+
+        horizontal_x = np.repeat(joint_x, 2)
+        horizontal_y = np.column_stack((joint_top, joint_bottom)).ravel()
+        horizontal_rows = np.repeat(joint_rows, 2)
+
+        # shared joints: bottom joints of the upper row matched with top joints of the lower row by X
+        row_starts = np.flatnonzero(np.concatenate(([True], ~same_row)))
+        rows_touching = np.abs(bottom[row_starts[:-1]] - top[row_starts[1:]]) < JOINT_GAP_THRESHOLD
+
+        upper_index = np.flatnonzero(horizontal_rows < len(row_starts) - 1)
+        upper_index = upper_index[rows_touching[horizontal_rows[upper_index]]]
+        upper_index = upper_index[
+            np.abs(horizontal_y[upper_index] - bottom[row_starts[horizontal_rows[upper_index]]])
+            < JOINT_GAP_THRESHOLD
+        ]
+
+        lower_index = np.flatnonzero(horizontal_rows > 0)
+        lower_index = lower_index[rows_touching[horizontal_rows[lower_index] - 1]]
+        lower_index = lower_index[
+            np.abs(horizontal_y[lower_index] - top[row_starts[horizontal_rows[lower_index]]])
+            < JOINT_GAP_THRESHOLD
+        ]
+
+        shared_x = np.empty(0)
+        shared_y = np.empty(0)
+
+        if len(upper_index) and len(lower_index):
+            _, x_rank = np.unique(horizontal_x, return_inverse=True)
+            x_count = int(x_rank.max()) + 1
+
+            # composite key (row pair, X) of every candidate, row pair identified by the upper row
+            upper_key = horizontal_rows[upper_index].astype(np.int64) * x_count + x_rank[upper_index]
+            lower_key = (horizontal_rows[lower_index].astype(np.int64) - 1) * x_count + x_rank[lower_index]
+
+            lower_sorted = np.argsort(lower_key, kind="stable")
+            lower_key = lower_key[lower_sorted]
+            lower_index = lower_index[lower_sorted]
+
+            owners, matches = _expand_ranges(
+                np.searchsorted(lower_key, upper_key, side="left"),
+                np.searchsorted(lower_key, upper_key, side="right"),
+            )
+            top_joints = upper_index[owners]
+            bottom_joints = lower_index[matches]
+
+            shared_x = _round2((horizontal_x[top_joints] + horizontal_x[bottom_joints]) / 2)
+            shared_y = _round2((horizontal_y[top_joints] + horizontal_y[bottom_joints]) / 2)
+
+        all_joints = np.column_stack(
+            (
+                np.concatenate((horizontal_x, shared_x)),
+                np.concatenate((horizontal_y, shared_y)),
+            )
+        )
+        if not len(all_joints):
+            return Coordinates(np.empty((0, 2)))
+
+        # deduplicate keeping the first occurrence order
+        _, first_occurrence = np.unique(all_joints, axis=0, return_index=True)
+        first_occurrence.sort()
+
+        if top_int is None:
+            return Coordinates(all_joints[first_occurrence])
+
+        # X of horizontal joints is a middle and never int, nor are shared joints
+        y_int = np.concatenate(
+            (
+                np.column_stack((top_int[pairs], bottom_int[pairs])).ravel(),
+                np.zeros(len(shared_y), dtype=bool),
+            )
+        )
+        integral = np.column_stack(
+            (np.zeros(len(first_occurrence), dtype=bool), y_int[first_occurrence])
+        )
+
+        return Coordinates(all_joints[first_occurrence], integral)
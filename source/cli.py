@@ -0,0 +1,222 @@
+"""
+Calculate mounts and joints of a solar panel layout.
+
+Examples:
+    python -m source examples/sample_input.json
+    python -m source layout.json -o result.csv --format csv --stream
+    cat layout.json | python -m source - --format jsonl
+    python -m source roofs.jsonl -o results.jsonl --batch --workers 8
+    python -m source layout.json --check
+    python -m source staggered.json --placement free
+    python -m source big_site.json --row-workers 4
+    python -m source layout.spcp -o result.spcr --format binary
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from source.batch import BatchProcessor
+from source.binary import PANELS_MAGIC, detect_container, read_binary_panels
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.constructors.spatial_hash import PLACEMENTS
+from source.instrumentation import MetricsCollector
+from source.readers.panel_reader import open_source, iter_panels, read_panel_array
+from source.writers.result_writer import BINARY_FORMATS, WRITERS, get_writer, open_output
+
+
+class Timings:
+    """Wall-clock timings of the CLI phases, printed to stderr with --timings."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.phases: Dict[str, float] = {}
+        # stage timings and counters of the calculator itself
+        self.calculator_metrics = MetricsCollector() if enabled else None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> None:
+        if not self.enabled:
+            return
+        for name, seconds in self.phases.items():
+            print(f"{name}: {seconds:.6f} s", file=sys.stderr)
+        for metrics in self.calculator_metrics.metrics:
+            for name, seconds in metrics.timings.items():
+                print(f"  {name}: {seconds:.6f} s", file=sys.stderr)
+            for name, count in metrics.counters.items():
+                print(f"  {name}: {count}", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m source",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help='layout file {"panels": [...]}, JSON Lines with one panel per line or binary '
+        'panels (see source.binary), "-" for stdin (default)',
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help='output file, "-" for stdout (default)'
+    )
+    parser.add_argument(
+        "--format",
+        choices=tuple(WRITERS),
+        default="json",
+        help="output format (default: json)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read panels into compact columns and write the result incrementally",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="input is JSON Lines (detected by .jsonl/.ndjson suffix)",
+    )
+    parser.add_argument("--backend", choices=SolarPanelCalculator.BACKENDS, default="python")
+    parser.add_argument(
+        "--placement",
+        choices=PLACEMENTS,
+        default="rows",
+        help="free: find segments and joints of offset or staggered panels without rows",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="input is JSON Lines with one layout {\"id\": .., \"panels\": [...]} per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes for --batch (default: CPU count); implies --batch",
+    )
+    parser.add_argument(
+        "--row-workers",
+        type=int,
+        default=1,
+        help="workers calculating chunks of rows of a single layout in parallel (python backend, rows placement)",
+    )
+    parser.add_argument(
+        "--row-pool",
+        choices=SolarPanelCalculator.POOLS,
+        default="process",
+        help="pool of --row-workers; thread pools run in parallel on free-threaded Python builds",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only check the cantilever and span rules and write all violations as JSON",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print phase timings and calculator stage timings and counters to stderr",
+    )
+    return parser
+
+
+def run_single(args: argparse.Namespace, timings: Timings) -> int:
+    jsonl = True if args.jsonl else None
+
+    with timings.phase("read"):
+        if args.input != "-" and detect_container(args.input) == PANELS_MAGIC:
+            panels = read_binary_panels(args.input)  # mapped columns, no parsing
+        elif args.stream:
+            panels = read_panel_array(args.input, jsonl)
+        else:
+            panels = list(iter_panels(args.input, jsonl))
+
+    calculator = SolarPanelCalculator(
+        panels,
+        backend=args.backend,
+        metrics_sink=timings.calculator_metrics,
+        placement=args.placement,
+        workers=args.row_workers,
+        pool=args.row_pool,
+    )
+    binary = args.format in BINARY_FORMATS
+
+    if args.check:
+        with timings.phase("check"):
+            verdict = calculator.check(collect_all=True)
+        with open_output(args.output) as stream:
+            json.dump(verdict.to_dict(), stream)
+            stream.write("\n")
+            stream.flush()
+        return 0 if verdict.feasible else 1
+
+    with open_output(args.output, binary=binary) as stream:
+        if args.stream or args.format != "json":
+            with timings.phase("calculate+write"):
+                ok = calculator.write(get_writer(args.format, stream))
+        else:
+            with timings.phase("calculate"):
+                result = calculator.calculate()
+            with timings.phase("write"):
+                json.dump(result, stream)
+                stream.write("\n")
+                stream.flush()
+            ok = "status" not in result
+
+    return 0 if ok else 1
+
+
+def run_batch(args: argparse.Namespace, timings: Timings) -> int:
+    processor = BatchProcessor(workers=args.workers, backend=args.backend)
+
+    with timings.phase("batch"), open_source(args.input) as source, open_output(
+        args.output
+    ) as target:
+        for record in processor.run(source):
+            target.write(record + "\n")
+        target.flush()
+
+    return 1 if processor.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Returns:
+        int: exit code, 0 on success and 1 if the layout (in batch mode: any layout) is not valid.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    batch = args.batch or args.workers is not None
+    if batch and args.format not in ("json", "jsonl"):
+        parser.error("--batch writes one JSON record per layout, use --format jsonl")
+    if batch and args.check:
+        parser.error("--check is not supported with --batch")
+    if args.placement == "free" and (batch or args.backend != "python"):
+        parser.error("--placement free requires the python backend without --batch")
+    if args.row_workers > 1 and (
+        batch or args.backend != "python" or args.placement != "rows"
+    ):
+        parser.error(
+            "--row-workers requires the python backend and the rows placement without --batch"
+        )
+
+    timings = Timings(args.timings)
+    exit_code = run_batch(args, timings) if batch else run_single(args, timings)
+    timings.report()
+
+    return exit_code
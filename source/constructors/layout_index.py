@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional, Tuple
+
+from source.constructors.row_constructor import RowConstructor
+from source.domain import Panel
+
+
+class LayoutIndex:
+    """
+    Rows, segments and panel membership of one layout.
+    Built once per calculation and shared by segment, mount and joint stages,
+    so none of them sorts or groups the panels again.
+    """
+
+    def __init__(self, panels: List[Panel]):
+        self.panels = panels
+        # rows and segments are built in one pass
+        self.rows, self.segments, self.segment_rows = RowConstructor(
+            panels
+        ).group_panels_into_rows_and_segments()
+
+        # panel membership, keyed by id() as equal panels may appear in the layout more than once;
+        # built on first use, the calculation itself only needs rows and segments
+        self._row_positions: Optional[Dict[int, Tuple[int, int]]] = None
+        self._segment_indexes: Dict[int, int] = {}
+
+    def _membership(self) -> Dict[int, Tuple[int, int]]:
+        if self._row_positions is None:
+            self._row_positions = {}
+            for row_index, row in enumerate(self.rows):
+                for position, panel in enumerate(row):
+                    self._row_positions[id(panel)] = (row_index, position)
+
+            for segment_index, segment in enumerate(self.segments):
+                for panel in segment:
+                    self._segment_indexes[id(panel)] = segment_index
+        return self._row_positions
+
+    def row_index(self, panel: Panel) -> int:
+        """Returns index of the row the panel belongs to."""
+        return self._membership()[id(panel)][0]
+
+    def segment_index(self, panel: Panel) -> int:
+        """Returns index of the segment the panel belongs to."""
+        self._membership()
+        return self._segment_indexes[id(panel)]
+
+    def neighbours(self, panel: Panel) -> Tuple[Optional[Panel], Optional[Panel]]:
+        """
+        Returns left and right neighbours of the panel in its row (None at the row ends).
+
+        Returns:
+            Tuple[Optional[Panel], Optional[Panel]]: (left neighbour, right neighbour)
+        """
+        row_index, position = self._membership()[id(panel)]
+        row = self.rows[row_index]
+
+        left = row[position - 1] if position > 0 else None
+        right = row[position + 1] if position + 1 < len(row) else None
+
+        return left, right
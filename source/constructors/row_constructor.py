@@ -1,8 +1,55 @@
-from typing import List
+from bisect import bisect_right
+from itertools import islice
+from operator import attrgetter, le, sub
+from typing import List, NamedTuple, Sequence
 
-from source.config import JOINT_GAP_THRESHOLD
+from source.config import CONTINUOUS_GAP, JOINT_GAP_THRESHOLD
 from source.domain import Panel
 
+_top = attrgetter("top")
+_left = attrgetter("left")
+_right = attrgetter("right")
+
+
+class RowsAndSegments(NamedTuple):
+    rows: List[List[Panel]]
+    segments: List[List[Panel]]
+    segment_rows: List[int]  # row index of each segment
+
+
+def _is_sorted(values: Sequence[float]) -> bool:
+    return all(map(le, values, islice(values, 1, None)))
+
+
+def row_bounds(tops: Sequence[float]) -> List[int]:
+    """
+    Find the rows of panels ordered by top: a row starts at the highest panel not in a row yet (its anchor)
+    and takes every following panel whose top is within JOINT_GAP_THRESHOLD of the anchor top.
+    A row ends where bisecting the tops finds the first panel beyond the anchor top + JOINT_GAP_THRESHOLD.
+
+    Args:
+        tops: top edges of the panels in ascending order.
+
+    Returns:
+        List[int]: position of the first panel of every row, followed by len(tops).
+    """
+    count = len(tops)
+    bounds = [0]
+    start = 0
+
+    while start < count:
+        anchor = tops[start]
+        stop = bisect_right(tops, anchor + JOINT_GAP_THRESHOLD, start + 1)
+        # correcting the bound to the exact condition, anchor + JOINT_GAP_THRESHOLD is rounded
+        while stop < count and abs(tops[stop] - anchor) <= JOINT_GAP_THRESHOLD:
+            stop += 1
+        while stop > start + 1 and abs(tops[stop - 1] - anchor) > JOINT_GAP_THRESHOLD:
+            stop -= 1
+        bounds.append(stop)
+        start = stop
+
+    return bounds
+
 
 class RowConstructor:
     def __init__(self, panels: List[Panel]):
@@ -15,25 +62,62 @@ class RowConstructor:
         Returns:
             List[List[Panel]]: List of panels. [[Panel, Panel], [Panel, Panel]]
         """
+        return self._group(split_segments=False).rows
+
+    def group_panels_into_rows_and_segments(self) -> RowsAndSegments:
+        """
+        Group panels into rows and split the rows into segments in the same pass.
+        Segments are the ones SegmentConstructor.split_rows_into_segments gives for the rows.
+
+        Returns:
+            RowsAndSegments: rows, segments and the row index of each segment.
+        """
+        return self._group(split_segments=True)
+
+    def _group(self, split_segments: bool) -> RowsAndSegments:
+        """
+        Rows are found by row_bounds, then ordered by X.
+
+        Panels are ordered by top with a stable sort, skipped when the input is already in that order
+        (e.g. scanned row by row). Rows already ordered by X are not sorted again.
+        Sorting keys are attribute getters, so the per-panel work stays in C.
+        """
+        result = RowsAndSegments([], [], [])
         if not self.panels:
-            return []
+            return result
 
-        sorted_panels = sorted(self.panels, key=lambda p: p.top)  # sorting panels by Y
+        tops = list(map(_top, self.panels))
+        presorted = _is_sorted(tops)
+        if presorted:
+            ordered = list(self.panels)
+        else:
+            ordered = sorted(self.panels, key=_top)  # sorting panels by Y
+            tops = list(map(_top, ordered))
 
-        rows: List[List[Panel]] = []
-        current_row: List[Panel] = [sorted_panels[0]]
+        bounds = row_bounds(tops)
 
-        for panel in sorted_panels[1:]:
-            if abs(panel.top - current_row[0].top) <= JOINT_GAP_THRESHOLD:
-                current_row.append(panel)
-            else:
-                current_row.sort(
-                    key=lambda p: p.left
-                )  # sorting panels by X before adding them to row
-                rows.append(current_row)
-                current_row = [panel]
+        for start, stop in zip(bounds, islice(bounds, 1, None)):
+            row = ordered[start:stop]
+            # rows of a layout given row by row are usually in X order already
+            if not (presorted and _is_sorted(list(map(_left, row)))):
+                row.sort(key=_left)  # sorting panels by X, ties stay in the order of Y
+            row_index = len(result.rows)
+            result.rows.append(row)
 
-        current_row.sort(key=lambda p: p.left)  # sorting panels by X in last row
-        rows.append(current_row)
+            if split_segments:
+                # positions of the panels starting a new segment: gap to the previous one too wide
+                gaps = map(sub, map(_left, islice(row, 1, None)), map(_right, row))
+                segment_bounds = [0]
+                segment_bounds += [
+                    position
+                    for position, gap in enumerate(gaps, 1)
+                    if abs(gap) >= CONTINUOUS_GAP
+                ]
+                segment_bounds.append(len(row))
+                for segment_start, segment_stop in zip(
+                    segment_bounds, islice(segment_bounds, 1, None)
+                ):
+                    result.segments.append(row[segment_start:segment_stop])
+                result.segment_rows.extend([row_index] * (len(segment_bounds) - 1))
 
-        return rows
+        return result
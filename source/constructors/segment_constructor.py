@@ -1,13 +1,35 @@
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Set
 
-from source.config import CONTINUOUS_GAP
+from source.config import CONTINUOUS_GAP, JOINT_GAP_THRESHOLD
 from source.constructors.row_constructor import RowConstructor
+from source.constructors.spatial_hash import SpatialHash, check_placement
 from source.domain import Panel
 
+if TYPE_CHECKING:
+    from source.constructors.layout_index import LayoutIndex
+
 
 class SegmentConstructor:
-    def __init__(self, panels: List[Panel]):
+    def __init__(
+        self,
+        panels: List[Panel],
+        layout_index: Optional["LayoutIndex"] = None,
+        placement: str = "rows",
+        spatial_hash: Optional[SpatialHash] = None,
+    ):
+        """
+        Args:
+            panels: Panels of the layout.
+            layout_index: LayoutIndex of the panels with already grouped rows.
+            placement: "rows" (default) to group panels into rows first, or "free" to chain panels
+                touching on the same rail line for any placement.
+            spatial_hash: SpatialHash of the panels reused by the "free" placement.
+        """
+        check_placement(placement)
         self.panels = panels
+        self.layout_index = layout_index
+        self.placement = placement
+        self.spatial_hash = spatial_hash
 
     def divide_rows_into_segments(self) -> List[List[Panel]]:
         """
@@ -20,9 +42,25 @@ class SegmentConstructor:
         if not self.panels:
             return []
 
-        row_constructor = RowConstructor(self.panels)
-        rows = row_constructor.group_panels_into_row()
+        if self.placement == "free":
+            return self._chain_touching_panels()
+
+        if self.layout_index is not None:
+            return self.layout_index.segments
+
+        return RowConstructor(self.panels).group_panels_into_rows_and_segments().segments
+
+    @staticmethod
+    def split_rows_into_segments(rows: List[List[Panel]]) -> List[List[Panel]]:
+        """
+        Split already grouped rows (sorted by X) into segments.
+
+        Args:
+            rows: List[List[Panel]], rows of panels.
 
+        Returns:
+            List[List[Panel]]: List of segments with Panels -> [Segment[Panel]]
+        """
         segments: List[List[Panel]] = []
 
         for row in rows:
@@ -40,3 +78,50 @@ class SegmentConstructor:
             segments.append(current_segment)
 
         return segments
+
+    def _chain_touching_panels(self) -> List[List[Panel]]:
+        """
+        Build segments without rows: the next panel of a segment starts closer than CONTINUOUS_GAP
+        to the right edge of the previous one and its top edge is within JOINT_GAP_THRESHOLD of
+        the previous top edge, so both hang on the same rails.
+
+        Neighbours come from the spatial hash in O(1) expected time; only the order of the
+        result (by top, then left edge of the first panel, as for rows) needs sorting.
+        """
+        spatial_hash = self.spatial_hash or SpatialHash(self.panels)
+        panels = spatial_hash.panels
+        order = sorted(range(len(panels)), key=lambda i: (panels[i].top, panels[i].left))
+
+        successors = {}
+        chained: Set[int] = set()
+
+        for index in order:
+            panel = panels[index]
+            candidates = [
+                other
+                for other in spatial_hash.right_neighbours(index, CONTINUOUS_GAP)
+                if other not in chained
+                and panels[other].left > panel.left
+                and abs(panels[other].top - panel.top) <= JOINT_GAP_THRESHOLD
+            ]
+            if candidates:
+                # the closest panel continues the segment, others start their own
+                successor = min(
+                    candidates, key=lambda i: (panels[i].left, panels[i].top, i)
+                )
+                successors[index] = successor
+                chained.add(successor)
+
+        segments: List[List[Panel]] = []
+
+        for index in order:
+            if index in chained:
+                continue
+
+            segment = [panels[index]]
+            while index in successors:
+                index = successors[index]
+                segment.append(panels[index])
+            segments.append(segment)
+
+        return segments
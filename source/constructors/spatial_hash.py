@@ -0,0 +1,121 @@
+import math
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from source.config import JOINT_GAP_THRESHOLD, PANEL_HEIGHT, PANEL_WIDTH
+from source.domain import Panel
+
+Cell = Tuple[int, int]
+
+# "rows": panels grouped into rows by top edge; "free": any placement, neighbours found via SpatialHash
+PLACEMENTS = ("rows", "free")
+
+
+def check_placement(placement: str) -> None:
+    if placement not in PLACEMENTS:
+        raise ValueError(
+            f"Unknown placement {placement!r}, expected one of {PLACEMENTS}"
+        )
+
+
+class SpatialHash:
+    """
+    Uniform grid over the panels for neighbour queries independent of rows.
+
+    Every panel is stored in each cell its rectangle overlaps. With cells the size of a panel a panel
+    covers at most four cells and a query around it looks at a constant number of cells, so finding
+    the panels touching a panel takes O(1) expected time for any placement: offset, staggered
+    or rotated panels.
+    """
+
+    def __init__(
+        self,
+        panels: Sequence[Panel],
+        cell_width: float = PANEL_WIDTH,
+        cell_height: float = PANEL_HEIGHT,
+    ):
+        """
+        Args:
+            panels: Panels of the layout.
+            cell_width, cell_height: size of a grid cell, the default panel size.
+        """
+        if cell_width <= 0 or cell_height <= 0:
+            raise ValueError("Cell size must be positive")
+
+        self.panels = list(panels)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self._cells: Dict[Cell, List[int]] = {}
+
+        for index, panel in enumerate(self.panels):
+            for cell in self._cells_of(panel.left, panel.top, panel.right, panel.bottom):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.panels)
+
+    def _cells_of(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> Iterator[Cell]:
+        for column in range(
+            math.floor(left / self.cell_width), math.floor(right / self.cell_width) + 1
+        ):
+            for row in range(
+                math.floor(top / self.cell_height),
+                math.floor(bottom / self.cell_height) + 1,
+            ):
+                yield column, row
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> List[int]:
+        """
+        Returns indexes of the panels whose rectangle intersects the given one (edges included),
+        in ascending order.
+        """
+        cells = self._cells
+        found = set()
+
+        for cell in self._cells_of(left, top, right, bottom):
+            for index in cells.get(cell, ()):
+                if index not in found:
+                    panel = self.panels[index]
+                    if (
+                        panel.left <= right
+                        and panel.right >= left
+                        and panel.top <= bottom
+                        and panel.bottom >= top
+                    ):
+                        found.add(index)
+
+        return sorted(found)
+
+    def right_neighbours(
+        self, index: int, threshold: float = JOINT_GAP_THRESHOLD
+    ) -> List[int]:
+        """
+        Returns indexes of the panels to the right of the panel whose left edge is closer than
+        threshold to its right edge and which overlap it vertically.
+        """
+        panel = self.panels[index]
+        return [
+            other
+            for other in self.query(
+                panel.right - threshold, panel.top, panel.right + threshold, panel.bottom
+            )
+            if other != index
+            and abs(self.panels[other].left - panel.right) < threshold
+            and self.panels[other].top < panel.bottom
+            and self.panels[other].bottom > panel.top
+        ]
+
+    def touching(self, index: int, threshold: float = JOINT_GAP_THRESHOLD) -> List[int]:
+        """Returns indexes of the panels touching the panel on any side within threshold."""
+        panel = self.panels[index]
+        return [
+            other
+            for other in self.query(
+                panel.left - threshold,
+                panel.top - threshold,
+                panel.right + threshold,
+                panel.bottom + threshold,
+            )
+            if other != index
+        ]
@@ -1,15 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 from source.config import PANEL_WIDTH, PANEL_HEIGHT
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Point:
     x: float
     y: float
 
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=1 << 16, typed=True)
+def intern_point(x: float, y: float) -> Point:
+    """
+    Returns a shared Point instance for repeated coordinates (flyweight).
+    Mounts on the same rafter and panel edge reuse one Point instead of allocating their own.
+    """
+    return Point(x, y)
+
+
+@dataclass(frozen=True, slots=True)
 class Mount:
     position: Point
 
@@ -17,7 +27,7 @@ class Mount:
         return f"Mount({self.position.x}, {self.position.y})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Joint:
     position: Point
 
@@ -25,24 +35,19 @@ class Joint:
         return f"Joint({self.position.x, self.position.y})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Panel:
     top_left: Point
     width: float = PANEL_WIDTH
     height: float = PANEL_HEIGHT
-
-    @property
-    def left(self):
-        return self.top_left.x
-
-    @property
-    def right(self) -> float:
-        return self.top_left.x + self.width
-
-    @property
-    def bottom(self) -> float:
-        return self.top_left.y + self.height
-
-    @property
-    def top(self) -> float:
-        return self.top_left.y
+    # edges are precomputed once instead of being recalculated on every access in the hot loops
+    left: float = field(init=False, repr=False, compare=False)
+    top: float = field(init=False, repr=False, compare=False)
+    right: float = field(init=False, repr=False, compare=False)
+    bottom: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "left", self.top_left.x)
+        object.__setattr__(self, "top", self.top_left.y)
+        object.__setattr__(self, "right", self.top_left.x + self.width)
+        object.__setattr__(self, "bottom", self.top_left.y + self.height)
@@ -0,0 +1,126 @@
+"""
+Fixed-point coordinates of the results: integers of hundredths (centi-units).
+
+A coordinate is quantized once, when it becomes a mount or joint coordinate; deduplication,
+comparison and sorting then run on exact int tuples, and floats are produced only for the output.
+Coordinates given as int stay int in the output, as round(value, 2) keeps them: their centi-units
+are IntegralCentis, equal to (and hashed as) the plain int, so deduplication keeps the type
+of the first occurrence as before.
+"""
+
+import heapq
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from source.domain import Point
+
+SCALE = 100
+
+# (x, y) in centi-units
+FixedPoint = Tuple[int, int]
+
+
+class IntegralCentis(int):
+    """Centi-units of a coordinate given as int, converted back to an int."""
+
+    __slots__ = ()
+
+
+# scaled values this close to a half are rounded through round(value, 2)
+_HALF_TOLERANCE = 1e-6
+
+
+def to_fixed(value: float) -> int:
+    """
+    Quantize a coordinate to centi-units.
+    Equals round(value, 2) * 100 exactly: the product value * 100 carries a rounding error of its own,
+    so values that land next to a half are rounded the way round(value, 2) does.
+
+    Args:
+        value: coordinate.
+
+    Returns:
+        int: coordinate in centi-units.
+    """
+    if type(value) is int:
+        return IntegralCentis(value * SCALE)
+    scaled = value * SCALE
+    fixed = round(scaled)
+    if abs(abs(scaled - fixed) - 0.5) < _HALF_TOLERANCE:
+        return round(round(value, 2) * SCALE)
+    return fixed
+
+
+def from_fixed(value: int) -> float:
+    """Returns the coordinate of centi-units, the same value round(coordinate, 2) gives."""
+    return value / SCALE if type(value) is int else value // SCALE
+
+
+def to_point(point: FixedPoint) -> Point:
+    return Point(from_fixed(point[0]), from_fixed(point[1]))
+
+
+def fixed_points_to_list(points: Iterable[FixedPoint]) -> List[dict]:
+    """
+    Converts fixed points into the list of {"x": .., "y": ..} dictionaries of the result,
+    without rounding again.
+    """
+    return [{"x": from_fixed(x), "y": from_fixed(y)} for x, y in points]
+
+
+def merge_sorted(streams: Iterable[Iterable[FixedPoint]]) -> Iterator[FixedPoint]:
+    """
+    Merges sorted streams of fixed points in a k-way heap merge, dropping duplicates
+    (the first of equal points is kept).
+    """
+    last = None
+    for point in heapq.merge(*streams):
+        if point != last:
+            last = point
+            yield point
+
+
+def merge_sorted_lazily(
+    streams: Sequence[Iterable[FixedPoint]], lower_bounds: Sequence[int]
+) -> Iterator[FixedPoint]:
+    """
+    Same as merge_sorted, but a stream is only started once the merge reaches the lower bound
+    of its X-coordinates: streams that are lazy (e.g. generators) are not evaluated before the points
+    left of them are consumed. Equal points of several streams are kept in the order of streams.
+
+    Args:
+        streams: sorted streams of fixed points.
+        lower_bounds: for every stream, a value its X-coordinates are not below.
+
+    Returns:
+        Iterator[FixedPoint]
+    """
+    pending = sorted(range(len(streams)), key=lower_bounds.__getitem__, reverse=True)
+    heap: List[Tuple[FixedPoint, int, Iterator[FixedPoint]]] = []
+    last = None
+
+    while heap or pending:
+        while pending and (not heap or lower_bounds[pending[-1]] <= heap[0][0][0]):
+            index = pending.pop()
+            iterator = iter(streams[index])
+            for point in iterator:
+                heapq.heappush(heap, (point, index, iterator))
+                break
+        if not heap:
+            return  # the remaining streams were empty
+
+        point, index, iterator = heap[0]
+        if point != last:
+            last = point
+            yield point
+        for point in iterator:
+            heapq.heapreplace(heap, (point, index, iterator))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def fixed_coordinates(points: Iterable[FixedPoint]) -> Iterable[Tuple[float, float]]:
+    """Yields (x, y) floats of fixed points, e.g. for a ResultWriter."""
+    for x, y in points:
+        yield from_fixed(x), from_fixed(y)
+
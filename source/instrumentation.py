@@ -0,0 +1,130 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+
+@dataclass
+class CalculationMetrics:
+    """Monotonic-clock stage timings (seconds) and item counters of one calculation."""
+
+    timings: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+
+class MetricsSink(ABC):
+    """Receives metrics of every finished calculation."""
+
+    @abstractmethod
+    def record(self, metrics: CalculationMetrics) -> None:
+        pass
+
+
+class MetricsCollector(MetricsSink):
+    """Keeps metrics of all recorded calculations in memory."""
+
+    def __init__(self):
+        self.metrics: List[CalculationMetrics] = []
+
+    def record(self, metrics: CalculationMetrics) -> None:
+        self.metrics.append(metrics)
+
+
+class PrometheusExporter(MetricsSink):
+    """
+    Accumulates metrics of all calculations and renders them in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix: str = "solar_panel_calculator"):
+        self.prefix = prefix
+        self.calculations = 0
+        self.stage_seconds: Dict[str, float] = {}
+        self.items: Dict[str, int] = {}
+
+    def record(self, metrics: CalculationMetrics) -> None:
+        self.calculations += 1
+        for stage, seconds in metrics.timings.items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        for item, count in metrics.counters.items():
+            self.items[item] = self.items.get(item, 0) + count
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.prefix}_calculations_total Number of finished calculations.",
+            f"# TYPE {self.prefix}_calculations_total counter",
+            f"{self.prefix}_calculations_total {self.calculations}",
+            f"# HELP {self.prefix}_stage_seconds_total Time spent in each calculation stage.",
+            f"# TYPE {self.prefix}_stage_seconds_total counter",
+        ]
+        lines.extend(
+            f'{self.prefix}_stage_seconds_total{{stage="{stage}"}} {seconds!r}'
+            for stage, seconds in self.stage_seconds.items()
+        )
+        lines.extend(
+            [
+                f"# HELP {self.prefix}_items_total Number of processed items by kind.",
+                f"# TYPE {self.prefix}_items_total counter",
+            ]
+        )
+        lines.extend(
+            f'{self.prefix}_items_total{{item="{item}"}} {count}'
+            for item, count in self.items.items()
+        )
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    """Measures calculation stages with time.perf_counter and counts processed items."""
+
+    enabled = True
+
+    def __init__(self, sink: Optional[MetricsSink] = None):
+        self.sink = sink
+        self.metrics = CalculationMetrics()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add seconds measured elsewhere, e.g. in a worker process, to the timing of name."""
+        self.metrics.timings[name] = self.metrics.timings.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int) -> None:
+        self.metrics.counters[name] = self.metrics.counters.get(name, 0) + value
+
+    def finish(self) -> None:
+        if self.sink is not None:
+            self.sink.record(self.metrics)
+
+
+_NO_STAGE = nullcontext()
+
+
+class NullInstrumentation(Instrumentation):
+    """Disabled instrumentation: every call is a no-op, so the calculation pays almost nothing for it."""
+
+    enabled = False
+
+    def __init__(self):
+        super().__init__()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return _NO_STAGE
+
+    def add_time(self, name: str, seconds: float) -> None:
+        pass
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
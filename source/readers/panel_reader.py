@@ -0,0 +1,226 @@
+import json
+import sys
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from source.arrays import PanelArray
+from source.config import PANEL_HEIGHT, PANEL_WIDTH
+from source.domain import Panel, Point
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+_WHITESPACE = " \t\n\r"
+
+
+class PanelReaderError(ValueError):
+    pass
+
+
+class JsonPanelReader:
+    """
+    Incremental reader of the "panels" array of a JSON document: {"panels": [{"x": 0, "y": 0}, ...]}.
+    The document is read in chunks and panel objects are decoded one by one, so memory stays bounded
+    by the chunk size instead of the size of the file.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        # dropping already consumed part of the buffer
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Returns next non-whitespace character without consuming it ('' at the end of the document)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise PanelReaderError(
+                f"Expected {char!r} in panels document, got {self._peek() or 'end of file'!r}"
+            )
+        self._pos += 1
+
+    def _decode_value(self) -> object:
+        """Decodes next JSON value, reading more chunks while the value is incomplete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._read_more():
+                    continue
+                raise PanelReaderError(f"Invalid panels document: {e}") from e
+
+            # a number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read_more():
+                continue
+
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[dict]:
+        self._expect("{")
+
+        if self._peek() == "}":
+            raise PanelReaderError("Panels document has no 'panels' key")
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+
+            if key == "panels":
+                yield from self._iter_array()
+                return
+
+            self._decode_value()  # skipping values of other keys
+
+            if self._peek() != ",":
+                raise PanelReaderError("Panels document has no 'panels' key")
+            self._pos += 1
+
+    def _iter_array(self) -> Iterator[dict]:
+        self._expect("[")
+
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+
+            char = self._peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise PanelReaderError(f"Expected ',' or ']' in panels array, got {char!r}")
+
+
+def iter_jsonl_panels(stream: IO[str]) -> Iterator[dict]:
+    """Reads one panel object per line (JSON Lines), skipping empty lines."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise PanelReaderError(f"Invalid panel on line {line_number}: {e}") from e
+
+
+@contextmanager
+def open_source(source: Union[str, IO[str]]) -> Iterator[IO[str]]:
+    """
+    Opens input source for reading: a path, "-" for stdin, or an already open text stream.
+    """
+    if not isinstance(source, str):
+        yield source
+    elif source == "-":
+        yield sys.stdin
+    else:
+        with open(source, "r") as f:
+            yield f
+
+
+def _is_jsonl(source: Union[str, IO[str]], jsonl: Optional[bool]) -> bool:
+    if jsonl is not None:
+        return jsonl
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    return isinstance(name, str) and name.endswith(JSONL_SUFFIXES)
+
+
+def iter_panel_records(
+    source: Union[str, IO[str]], jsonl: Optional[bool] = None
+) -> Iterator[dict]:
+    """
+    Stream raw panel records ({"x": .., "y": .., optional "width"/"height"}) from a file.
+
+    Args:
+        source: path to the file, "-" for stdin, or an open text stream.
+        jsonl: True for JSON Lines input, False for {"panels": [...]} document,
+            None to detect by the file suffix (.jsonl, .ndjson).
+
+    Returns:
+        Iterator[dict]
+    """
+    with open_source(source) as stream:
+        if _is_jsonl(source, jsonl):
+            yield from iter_jsonl_panels(stream)
+        else:
+            yield from JsonPanelReader(stream)
+
+
+def iter_panels(
+    source: Union[str, IO[str]], jsonl: Optional[bool] = None
+) -> Iterator[Panel]:
+    """
+    Stream Panel objects from a file without loading the whole document.
+
+    Args:
+        source: path to the file, "-" for stdin, or an open text stream.
+        jsonl: input format, see iter_panel_records.
+
+    Returns:
+        Iterator[Panel]
+    """
+    for p in iter_panel_records(source, jsonl):
+        yield Panel(
+            top_left=Point(p["x"], p["y"]),
+            width=p.get("width", PANEL_WIDTH),
+            height=p.get("height", PANEL_HEIGHT),
+        )
+
+
+def read_panel_array(
+    source: Union[str, IO[str]], jsonl: Optional[bool] = None
+) -> PanelArray:
+    """
+    Stream panels from a file directly into PanelArray columns, without building Panel objects.
+
+    Args:
+        source: path to the file, "-" for stdin, or an open text stream.
+        jsonl: input format, see iter_panel_records.
+
+    Returns:
+        PanelArray
+    """
+    return panel_array_from_records(iter_panel_records(source, jsonl))
+
+
+def panel_array_from_records(records: Iterable[dict]) -> PanelArray:
+    """
+    Store raw panel records ({"x": .., "y": .., optional "width"/"height"}) in PanelArray columns.
+
+    Args:
+        records: Iterable of panel records.
+
+    Returns:
+        PanelArray
+    """
+    panels = PanelArray()
+    for p in records:
+        panels.append(
+            p["x"], p["y"], p.get("width", PANEL_WIDTH), p.get("height", PANEL_HEIGHT)
+        )
+    return panels
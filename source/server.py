@@ -0,0 +1,419 @@
+"""
+HTTP/JSON calculation service on asyncio (standard library only).
+
+Layouts are queued and calculated on a worker pool, never on the event loop. Concurrent requests are
+collected into micro-batches, so one worker dispatch serves many small layouts. The queue is bounded:
+when it is full, requests are rejected at once with 503 and Retry-After instead of piling up.
+
+Endpoints:
+    POST /calculate   body {"id": .., "panels": [{"x": .., "y": ..}, ...]},
+                      response {"id": .., "result": {...}} with X-Latency-Ms, X-Queue-Ms and
+                      X-Batch-Size headers
+    GET  /stats       request, rejection and batch counters, latency percentiles
+    GET  /health
+
+Usage:
+    python -m source.server --port 8080 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from source.batch import evaluate_layout
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+def calculate_requests(bodies: List[str], backend: str = "python") -> List[Tuple[int, str]]:
+    """
+    Calculate a micro-batch of request bodies in a worker.
+
+    Returns:
+        List[Tuple[int, str]]: HTTP status and JSON response body of every request.
+    """
+    responses = []
+    for body in bodies:
+        layout_id, result, valid = evaluate_layout(body, backend)
+        responses.append(
+            (200 if valid else 400, json.dumps({"id": layout_id, "result": result}))
+        )
+    return responses
+
+
+class ServiceOverloaded(Exception):
+    """The request queue is full."""
+
+
+@dataclass
+class _Request:
+    body: str
+    future: "asyncio.Future[Tuple[int, str]]"
+    received: float = field(default_factory=time.perf_counter)
+    dispatched: float = 0.0
+    batch_size: int = 0
+
+
+class CalculationService:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_batch_size: int = 32,
+        max_batch_delay: float = 0.002,
+        max_queue: int = 1024,
+        backend: str = "python",
+        latency_window: int = 10_000,
+    ):
+        """
+        Args:
+            workers: number of worker processes (default: CPU count), 0 to calculate on one thread
+                beside the event loop.
+            max_batch_size: max number of requests dispatched to a worker at once.
+            max_batch_delay: seconds to wait for more requests before dispatching an incomplete batch.
+            max_queue: max number of requests waiting for a worker; more are rejected with 503.
+            backend: SolarPanelCalculator backend.
+            latency_window: number of latest requests kept for latency percentiles.
+        """
+        if backend not in SolarPanelCalculator.BACKENDS:
+            raise ValueError(
+                f"Unknown backend {backend!r}, expected one of {SolarPanelCalculator.BACKENDS}"
+            )
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_queue = max_queue
+        self.backend = backend
+
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._executor: Optional[Executor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the worker pool and the dispatcher; called by serve()."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self.workers >= 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self) -> None:
+        """Stop dispatching, wait for running batches and shut the worker pool down."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def calculate(self, body: str) -> Tuple[int, str, Dict[str, str]]:
+        """
+        Queue a layout record and wait for its calculation.
+        Raises ServiceOverloaded if the queue is full.
+
+        Returns:
+            Tuple[int, str, Dict[str, str]]: HTTP status, JSON response body and latency headers.
+        """
+        self.requests += 1
+        request = _Request(body, asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceOverloaded() from None
+
+        status, response = await request.future
+
+        latency = time.perf_counter() - request.received
+        self._latencies.append(latency)
+        headers = {
+            "X-Latency-Ms": f"{latency * 1000:.3f}",
+            "X-Queue-Ms": f"{(request.dispatched - request.received) * 1000:.3f}",
+            "X-Batch-Size": str(request.batch_size),
+        }
+        return status, response, headers
+
+    def stats(self) -> dict:
+        """Returns request counters, batch sizes and latency percentiles of the latest requests."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": percentile(1.0),
+            },
+        }
+
+    async def _dispatch(self) -> None:
+        """
+        Collect queued requests into batches and dispatch them to the workers.
+        At most one batch per worker runs at a time; meanwhile requests wait in the bounded queue.
+        """
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max(self.workers, 1))
+
+        while True:
+            await slots.acquire()
+            batch = [await self._queue.get()]
+
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._run_batch(batch, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[_Request], slots: asyncio.Semaphore) -> None:
+        dispatched = time.perf_counter()
+        for request in batch:
+            request.dispatched, request.batch_size = dispatched, len(batch)
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                calculate_requests,
+                [request.body for request in batch],
+                self.backend,
+            )
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        else:
+            for request, response in zip(batch, responses):
+                if not request.future.done():
+                    request.future.set_result(response)
+        finally:
+            slots.release()
+
+
+class HttpServer:
+    def __init__(self, service: CalculationService, max_body: int = 16 << 20):
+        """
+        Args:
+            service: CalculationService answering POST /calculate.
+            max_body: max request body size in bytes, larger requests are rejected with 413.
+        """
+        self.service = service
+        self.max_body = max_body
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Start the service and listen; port 0 picks a free port (see the port property)."""
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    async def close(self) -> None:
+        """Stop listening, close open connections and stop the service."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for connection in self._connections:
+            connection.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        await self.service.close()
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, _error("Malformed request line."), close=True)
+                    break
+
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > self.max_body:
+                    status = 400 if length < 0 else 413
+                    await self._respond(writer, status, _error("Invalid body size."), close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, response, extra = await self._route(
+                        method, path.split("?", 1)[0], body
+                    )
+                except Exception as e:  # e.g. BrokenProcessPool of the calculation workers
+                    status, response, extra = (
+                        500,
+                        _error(f"Calculation failed: {type(e).__name__}."),
+                        {},
+                    )
+                await self._respond(writer, status, response, extra, close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # the server is closing
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[int, str, Dict[str, str]]:
+        if path == "/calculate":
+            if method != "POST":
+                return 405, _error("Use POST."), {"Allow": "POST"}
+            try:
+                return await self.service.calculate(body.decode("utf-8", "replace"))
+            except ServiceOverloaded:
+                return 503, _error("Too many queued layouts, retry later."), {"Retry-After": "1"}
+        if path == "/stats" and method == "GET":
+            return 200, json.dumps(self.service.stats()), {}
+        if path == "/health" and method == "GET":
+            return 200, json.dumps({"status": "OK"}), {}
+        return 404, _error("Not found."), {}
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: str,
+        headers: Optional[Dict[str, str]] = None,
+        close: bool = False,
+    ) -> None:
+        payload = body.encode("utf-8")
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'close' if close else 'keep-alive'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+
+def _error(message: str) -> str:
+    return json.dumps({"status": "ERROR", "message": message})
+
+
+async def serve(host: str, port: int, service: CalculationService) -> None:
+    server = HttpServer(service)
+    await server.start(host, port)
+    print(f"Listening on http://{host}:{server.port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-batch-delay", type=float, default=0.002, help="seconds")
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--backend", choices=SolarPanelCalculator.BACKENDS, default="python")
+    args = parser.parse_args(argv)
+
+    service = CalculationService(
+        workers=args.workers,
+        max_batch_size=args.max_batch_size,
+        max_batch_delay=args.max_batch_delay,
+        max_queue=args.max_queue,
+        backend=args.backend,
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
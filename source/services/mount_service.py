@@ -1,19 +1,48 @@
-from typing import List, Set
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple
 
 from source.config import EDGE_CLEARANCE
 from source.domain import Panel
 
 
 class MountService:
-    def __init__(self, mounts_x_coordinates: List[float]):
-        self.mounts_x_coordinates = sorted(float(x) for x in mounts_x_coordinates)
+    def __init__(
+        self,
+        mounts_x_coordinates: Iterable[float],
+        edge_clearance: float = EDGE_CLEARANCE,
+    ):
+        self.edge_clearance = edge_clearance
+        # compact sorted array of rafter positions, queried with binary search
+        self.mounts_x_coordinates = array(
+            "d", sorted(float(x) for x in mounts_x_coordinates)
+        )
+
+    def get_rafter_range(self, panel: Panel) -> Tuple[int, int]:
+        """
+        Returns the half-open index range [start, stop) of rafters lying within the
+        panel's mountable area [left + edge_clearance, right - edge_clearance].
+
+        Args:
+            panel: Panel to calculate the rafter range for.
+
+        Returns:
+            Tuple[int, int]: (start, stop) indexes into mounts_x_coordinates.
+        """
+        min_allowed_x = panel.left + self.edge_clearance
+        max_allowed_x = panel.right - self.edge_clearance
+
+        start = bisect_left(self.mounts_x_coordinates, min_allowed_x)
+        stop = bisect_right(self.mounts_x_coordinates, max_allowed_x, lo=start)
+
+        return start, stop
 
     def get_mounts_for_panel(self, panel: Panel) -> List[float]:
         """
         Calculates valid X-coordinates for supports on a single panel.
         Filters available rafter positions to ensure:
         1. Rafter alignment.
-        2. Edge Clearance (not closer than 2.0 units) from panel edges.
+        2. Edge Clearance (not closer than edge_clearance, 2.0 units by default) from panel edges.
 
         Args:
             panel: Panel to calculate mounts for.
@@ -21,17 +50,36 @@ class MountService:
         Returns:
             List[float]: List of mounts X-coordinates.
         """
-        min_allowed_x = panel.left + EDGE_CLEARANCE
-        max_allowed_x = panel.right - EDGE_CLEARANCE
+        start, stop = self.get_rafter_range(panel)
 
-        mounts = [
-            x
-            for x in self.mounts_x_coordinates
-            # checking if the mount not closer than 2 units(EDGE_CLEARANCE) to the edge of panel
-            if min_allowed_x <= x <= max_allowed_x
-        ]
+        return self.get_mounts_in_range(start, stop)
 
-        return sorted(mounts)
+    def get_mounts_in_range(self, start: int, stop: int) -> List[float]:
+        """
+        Returns X-coordinates of rafters for the index range returned by get_rafter_range.
+        """
+        return self.mounts_x_coordinates[start:stop].tolist()
+
+    def merge_rafter_ranges(self, ranges: Iterable[Tuple[int, int]]) -> List[float]:
+        """
+        Merges rafter index ranges into one sorted list of X-coordinates without duplicates.
+
+        Args:
+            ranges: Iterable of (start, stop) index ranges.
+
+        Returns:
+            List[float]: List of mounts X-coordinates.
+        """
+        mounts: List[float] = []
+        last_stop = 0
+
+        for start, stop in sorted(ranges):
+            start = max(start, last_stop)  # skipping rafters already taken by previous range
+            if start < stop:
+                mounts.extend(self.mounts_x_coordinates[start:stop])
+                last_stop = stop
+
+        return mounts
 
     def get_mounts_for_segment(self, segment: List[Panel]) -> List[float]:
         """
@@ -43,10 +91,6 @@ class MountService:
         Returns:
             List[float]: List of mounts X-coordinates.
         """
-        mounts: Set[float] = set()
-
-        for panel in segment:
-            panel_mounts_x = self.get_mounts_for_panel(panel)
-            mounts.update(panel_mounts_x)
-
-        return sorted(mounts)
+        return self.merge_rafter_ranges(
+            self.get_rafter_range(panel) for panel in segment
+        )
@@ -0,0 +1,246 @@
+import math
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from source.config import (
+    CANTILEVER_LIMIT,
+    EDGE_CLEARANCE,
+    RAFTER_SPACING,
+    SPAN_LIMIT,
+)
+from source.domain import Panel
+
+# relative rafter index ranges [start, stop) of the segment panels
+SegmentRanges = Tuple[Tuple[int, int], ...]
+# ranges, indexes of panels with a bound close to a rafter, relative indexes of the first and the last
+# mounted rafter, whether a cantilever is close to the limit
+SegmentPattern = Tuple[SegmentRanges, Tuple[int, ...], Optional[Tuple[int, int]], bool]
+
+
+class PatternCache:
+    """
+    Bounded LRU memo of mount patterns of valid segments on a regular rafter grid.
+
+    Rafters lying under a segment and the cantilever/span verdict depend only on the segment shape
+    (relative left edges and widths of its panels) and on its phase: the position of the segment
+    start relative to the last rafter before it. The key is that shape and phase quantized to
+    `quantum`, the value is the rafter index ranges of the panels relative to that rafter, which
+    are translated into place for every segment with the same key.
+
+    Panel bounds and cantilever checks farther than `guard` from flipping give the same result for
+    every segment sharing the key. The ones closer than that (e.g. a cantilever of exactly 16.0 on an
+    aligned layout) are recorded with the pattern and checked again with the exact coordinates on
+    every hit, so a hit always gives the same rafters and verdict as the full calculation.
+    Segments failing validation are never stored.
+    """
+
+    def __init__(
+        self,
+        first_rafter: float = 0.0,
+        spacing: float = RAFTER_SPACING,
+        maxsize: int = 4096,
+        quantum: float = 1e-6,
+        guard: float = 1e-4,
+        edge_clearance: float = EDGE_CLEARANCE,
+        cantilever_limit: float = CANTILEVER_LIMIT,
+        span_limit: float = SPAN_LIMIT,
+    ):
+        self.first_rafter = first_rafter
+        self.spacing = spacing
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.guard = guard
+        self.edge_clearance = edge_clearance
+        self.cantilever_limit = cantilever_limit
+        self.span_limit = span_limit
+
+        self.hits = 0
+        self.misses = 0
+        self._patterns: "OrderedDict[Hashable, SegmentPattern]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def info(self) -> dict:
+        """Returns hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._patterns),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        self._patterns.clear()
+        self.hits = self.misses = 0
+
+    def segment_key(self, segment: Sequence[Panel]) -> Tuple[int, Hashable]:
+        """
+        Returns (base rafter index, key) of the segment.
+        Base rafter is the last rafter at or before the segment start.
+        """
+        start = segment[0].left
+        base = math.floor((start - self.first_rafter) / self.spacing)
+        phase = start - (self.first_rafter + base * self.spacing)
+
+        # int(x + 0.5) is a cheaper round() for the non-negative phase, offsets and widths,
+        # so coordinates given with a few decimals do not straddle the key boundaries
+        scale = 1 / self.quantum
+        key = (int(phase * scale + 0.5),) + tuple(
+            [
+                int(value * scale + 0.5)
+                for panel in segment
+                for value in (panel.left - start, panel.width)
+            ]
+        )
+        return base, key
+
+    def get(
+        self, key: Hashable, base: int, segment: Sequence[Panel]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns absolute rafter index ranges [start, stop) of the segment panels, or None if the
+        pattern is not stored. Segments on the base rafter 0 or before are not looked up,
+        as rafters with negative index do not exist.
+        """
+        pattern = self._patterns.get(key) if base >= 1 else None
+
+        if pattern is not None:
+            relative_ranges, tight_panels, extent, tight_cantilever = pattern
+            ranges = [(base + start, base + stop) for start, stop in relative_ranges]
+
+            if (
+                not tight_panels
+                or self._check_tight_panels(segment, ranges, tight_panels)
+            ) and (
+                not tight_cantilever
+                or self._check_cantilevers(segment, self._translate(extent, base))
+            ):
+                self.hits += 1
+                self._patterns.move_to_end(key)
+                return ranges
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        key: Hashable,
+        base: int,
+        segment: Sequence[Panel],
+        ranges: List[Tuple[int, int]],
+    ) -> bool:
+        """
+        Store rafter ranges of a validated segment if its pattern is translation safe.
+
+        Args:
+            key, base: result of segment_key(segment).
+            segment: List of Panels.
+            ranges: absolute rafter index ranges [start, stop) of every panel.
+
+        Returns:
+            bool: True if the pattern was stored.
+        """
+        if base < 1 or abs(self.spacing - self.span_limit) <= self.guard:
+            return False
+
+        extent = self._mounted_extent(ranges)
+        tight_cantilever = any(
+            abs(cantilever - self.cantilever_limit) <= self.guard
+            for cantilever in self._cantilevers(segment, extent)
+        )
+
+        self._patterns[key] = (
+            tuple((start - base, stop - base) for start, stop in ranges),
+            self._tight_panels(segment, ranges),
+            self._translate(extent, -base),
+            tight_cantilever,
+        )
+        self._patterns.move_to_end(key)
+        if len(self._patterns) > self.maxsize:
+            self._patterns.popitem(last=False)
+
+        return True
+
+    def _position(self, index: int) -> float:
+        return self.first_rafter + index * self.spacing
+
+    def _mounted_extent(self, ranges: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        """Returns indexes of the first and the last mounted rafter of the segment."""
+        mounted = [(start, stop) for start, stop in ranges if start < stop]
+        if not mounted:
+            return None
+        return min(start for start, _ in mounted), max(stop for _, stop in mounted) - 1
+
+    def _tight_panels(
+        self, segment: Sequence[Panel], ranges: List[Tuple[int, int]]
+    ) -> Tuple[int, ...]:
+        guard, position = self.guard, self._position
+        tight = []
+
+        for index, (panel, (start, stop)) in enumerate(zip(segment, ranges)):
+            min_allowed_x = panel.left + self.edge_clearance
+            max_allowed_x = panel.right - self.edge_clearance
+
+            if (
+                position(start) - min_allowed_x <= guard
+                or min_allowed_x - position(start - 1) <= guard
+                or max_allowed_x - position(stop - 1) <= guard
+                or position(stop) - max_allowed_x <= guard
+            ):
+                tight.append(index)
+
+        return tuple(tight)
+
+    @staticmethod
+    def _translate(
+        extent: Optional[Tuple[int, int]], offset: int
+    ) -> Optional[Tuple[int, int]]:
+        return None if extent is None else (extent[0] + offset, extent[1] + offset)
+
+    def _cantilevers(
+        self, segment: Sequence[Panel], extent: Optional[Tuple[int, int]]
+    ) -> Tuple[float, ...]:
+        """Returns distances compared with the cantilever limit, the same as CantileverValidator does."""
+        start_of_segment, end_of_segment = segment[0].left, segment[-1].right
+
+        if extent is None:
+            return (end_of_segment - start_of_segment,)
+
+        return (
+            self._position(extent[0]) - start_of_segment,
+            end_of_segment - self._position(extent[1]),
+        )
+
+    def _check_cantilevers(
+        self, segment: Sequence[Panel], extent: Optional[Tuple[int, int]]
+    ) -> bool:
+        return all(
+            not cantilever > self.cantilever_limit
+            for cantilever in self._cantilevers(segment, extent)
+        )
+
+    def _check_tight_panels(
+        self,
+        segment: Sequence[Panel],
+        ranges: List[Tuple[int, int]],
+        tight_panels: Tuple[int, ...],
+    ) -> bool:
+        """Repeats bound checks recorded as close to flipping with the exact coordinates of the segment."""
+        position = self._position
+
+        for index in tight_panels:
+            panel, (start, stop) = segment[index], ranges[index]
+            min_allowed_x = panel.left + self.edge_clearance
+            max_allowed_x = panel.right - self.edge_clearance
+
+            # the same comparisons as bisect_left/bisect_right in MountService.get_rafter_range
+            if not (
+                position(start - 1) < min_allowed_x <= position(start)
+                and position(stop - 1) <= max_allowed_x < position(stop)
+            ):
+                return False
+
+        return True
@@ -1,46 +1,150 @@
-from typing import List
+import math
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple, Union
 
+from source.arrays import PanelArray
 from source.config import RAFTER_SPACING
 from source.domain import Panel
 
 
+class RafterSequence(Sequence):
+    """
+    Lazy, range-like sequence of rafter X-coordinates.
+    The i-th rafter lies at first_rafter + (start + i) * spacing, so positions never accumulate float drift.
+    """
+
+    __slots__ = ("first_rafter", "spacing", "start", "stop")
+
+    def __init__(self, first_rafter: float, spacing: float, start: int, stop: int):
+        self.first_rafter = first_rafter
+        self.spacing = spacing
+        self.start = start
+        self.stop = max(start, stop)
+
+    def position(self, index: int) -> float:
+        """Returns X-coordinate of the rafter with absolute grid index."""
+        return self.first_rafter + index * self.spacing
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(item, slice):
+            first, spacing = self.first_rafter, self.spacing
+            return [first + index * spacing for index in range(self.start, self.stop)[item]]
+
+        return self.position(range(self.start, self.stop)[item])
+
+    def __iter__(self) -> Iterator[float]:
+        for index in range(self.start, self.stop):
+            yield self.position(index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"RafterSequence(first_rafter={self.first_rafter}, spacing={self.spacing}, "
+            f"start={self.start}, stop={self.stop})"
+        )
+
+    def index_range(self, min_x: float, max_x: float) -> Tuple[int, int]:
+        """
+        Returns the half-open range [start, stop) of sequence indexes of rafters lying within [min_x, max_x].
+
+        Args:
+            min_x: float, lower bound (inclusive).
+            max_x: float, upper bound (inclusive).
+
+        Returns:
+            Tuple[int, int]
+        """
+        if self.stop == self.start or max_x < min_x:
+            return 0, 0
+
+        first, spacing = self.first_rafter, self.spacing
+
+        lower = math.ceil((min_x - first) / spacing)
+        # correcting possible off-by-one error of the float division at the bound
+        if first + lower * spacing < min_x:
+            lower += 1
+        elif first + (lower - 1) * spacing >= min_x:
+            lower -= 1
+
+        upper = math.floor((max_x - first) / spacing)
+        if first + upper * spacing > max_x:
+            upper -= 1
+        elif first + (upper + 1) * spacing <= max_x:
+            upper += 1
+
+        start = min(max(lower, self.start), self.stop) - self.start
+        stop = min(max(upper + 1, self.start), self.stop) - self.start
+
+        return start, max(start, stop)
+
+    def between(self, min_x: float, max_x: float) -> List[float]:
+        """Returns X-coordinates of rafters lying within [min_x, max_x]."""
+        start, stop = self.index_range(min_x, max_x)
+        return self[start:stop]
+
+
 class RafterGrid:
     def __init__(self, first_rafter: float = 0.0, spacing: float = RAFTER_SPACING):
         self.first_rafter = first_rafter
         self.spacing = spacing
 
-    def generate_grid(self, panels: List[Panel]) -> list[float]:
+    def generate_grid(self, panels: Union[List[Panel], PanelArray]) -> RafterSequence:
         """
         Generate and returns X-coordinates of all rafters in the grid.
-        Returns empty list if there are no Panels.
+        Grid starts from the last rafter before the leftmost panel edge (but not before first_rafter)
+        and ends with the last rafter not further than the rightmost panel edge.
+        Returns empty sequence if there are no Panels.
 
         Args:
-            panels: List of Panels.
+            panels: List of Panels or PanelArray.
 
         Returns:
-            List[float]: List of X-coordinates.
+            RafterSequence: Lazy sequence of X-coordinates.
         """
-        if not panels:
-            return []
+        if not len(panels):
+            return RafterSequence(self.first_rafter, self.spacing, 0, 0)
 
-        min_x = panels[0].left
-        max_x = panels[0].right
+        if isinstance(panels, PanelArray):
+            min_x, max_x = panels.extent()
+        else:
+            min_x = min(panel.left for panel in panels)
+            max_x = max(panel.right for panel in panels)
 
-        for panel in panels:
-            if panel.left < min_x:
-                min_x = panel.left
-            if panel.right > max_x:
-                max_x = panel.right
+        return self.generate_grid_for_extent(min_x, max_x)
 
-        rafters_x_coordinates = []
+    def generate_grid_for_extent(self, min_x: float, max_x: float) -> RafterSequence:
+        """
+        Generate rafters covering the horizontal extent [min_x, max_x] of a layout.
 
-        x = self.first_rafter
+        Args:
+            min_x: float, leftmost panel edge.
+            max_x: float, rightmost panel edge.
+
+        Returns:
+            RafterSequence: Lazy sequence of X-coordinates.
+        """
+        grid = RafterSequence(self.first_rafter, self.spacing, 0, 0)
 
-        while x + self.spacing < min_x:
-            x += self.spacing
+        # first rafter index: the last one for which the next rafter is still left of min_x
+        start = max(0, math.ceil((min_x - self.first_rafter) / self.spacing) - 1)
+        while start > 0 and grid.position(start + 1) >= min_x:
+            start -= 1
+        while grid.position(start + 1) < min_x:
+            start += 1
 
-        while x <= max_x:
-            rafters_x_coordinates.append(x)
-            x += self.spacing
+        stop = math.floor((max_x - self.first_rafter) / self.spacing) + 1
+        while stop > start and grid.position(stop - 1) > max_x:
+            stop -= 1
+        while grid.position(stop) <= max_x:
+            stop += 1
 
-        return sorted(rafters_x_coordinates)
+        return RafterSequence(self.first_rafter, self.spacing, start, stop)
@@ -0,0 +1,362 @@
+import copy
+import hashlib
+import json
+import math
+import os
+from array import array
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from source import config
+from source.domain import Panel
+from source.services.rafter_service import RafterGrid
+
+# (x, y) offset of the layout origin, subtracted from coordinates before hashing
+Origin = Tuple[float, float]
+
+# results are rounded to two decimals, translated layouts must be given on that grid
+_CENTI = 0.01
+
+
+class CacheHit(NamedTuple):
+    """
+    Cached result of a layout. For a translated layout (translated=True) the result has only
+    the shifted mounts and the caller adds the joints of the layout.
+    """
+
+    result: dict
+    translated: bool
+
+
+class ResultCache:
+    """
+    Content-addressed cache of SolarPanelCalculator.calculate() results.
+
+    The key is a hash of the config constants and of the sorted panel list quantized to `quantum`.
+    Coordinates are taken relative to the layout origin: the last rafter at or before the leftmost panel
+    edge and the top edge of the highest panel. Layouts given on the 0.01 grid of the results and
+    translated by whole rafter spacings (and any multiple of 0.01 vertically) share the key and the cached
+    mounts are shifted into place. The float comparisons of the calculation give the same outcome after
+    a translation for quantities off their threshold and for exact (multiples of 0.25) ones: a layout with
+    another panel gap or top difference at CONTINUOUS_GAP or JOINT_GAP_THRESHOLD, panel bound on a rafter
+    or run of panels as long as the cantilever limit (e.g. a gap of exactly 1.00 between panels at
+    x=4625.12 and x=4670.82) is only cached as it is, so a hit always gives the verdict and mounts of
+    the full calculation. Joints are not shifted, as
+    joints half-way between two 0.01 steps are rounded depending on the absolute coordinates;
+    the caller recalculates them (see CacheHit). Error results carry absolute coordinates in their
+    messages, so they only hit for the same origin.
+
+    Entries live in an in-memory LRU tier and, if `directory` is given, in JSON files on disk whose total
+    size is bounded by `max_disk_bytes` (least recently used files are removed first).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 256 << 20,
+        quantum: float = 1e-6,
+        translations: bool = True,
+    ):
+        """
+        Args:
+            maxsize: max number of results in memory.
+            directory: directory of the on-disk tier, None to keep results in memory only.
+            max_disk_bytes: max total size of the on-disk tier.
+            quantum: coordinates closer than that are treated as equal.
+            translations: recognise translated layouts; False to hit only the same coordinates.
+        """
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.quantum = quantum
+
+        grid = RafterGrid()
+        self.first_rafter, self.spacing = grid.first_rafter, grid.spacing
+        # translations must keep the rafter grid and the 0.01 grid of the results, the thresholds
+        # compared with coordinates must lie on it too (see _near_thresholds), and spans of
+        # consecutive rafters are compared with the span limit
+        self.translations = (
+            translations
+            and all(
+                abs(value / _CENTI - round(value / _CENTI)) < 1e-9
+                and abs(value / quantum - round(value / quantum)) < 1e-9
+                for value in (
+                    self.first_rafter,
+                    self.spacing,
+                    _CENTI,
+                    config.EDGE_CLEARANCE,
+                    config.CANTILEVER_LIMIT,
+                    config.CONTINUOUS_GAP,
+                    config.JOINT_GAP_THRESHOLD,
+                )
+            )
+            and self.spacing != config.SPAN_LIMIT
+        )
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.translated_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+
+        self._files: "OrderedDict[str, int]" = OrderedDict()  # file name -> size, LRU first
+        self.disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            files = []
+            for name in os.listdir(directory):
+                if name.endswith(".json"):
+                    stat = os.stat(os.path.join(directory, name))
+                    files.append((stat.st_mtime, name, stat.st_size))
+            for _, name, size in sorted(files):
+                self._files[name] = size
+                self.disk_bytes += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> dict:
+        """Returns hit/miss counters per tier, hit ratio and size of the cache."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "translated_hits": self.translated_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._entries),
+            "maxsize": self.maxsize,
+            "disk_files": len(self._files),
+            "disk_bytes": self.disk_bytes,
+        }
+
+    def clear(self) -> None:
+        """Remove all entries of both tiers and reset the counters."""
+        self._entries.clear()
+        for name in self._files:
+            self._remove_file(name)
+        self._files.clear()
+        self.disk_bytes = 0
+        self.memory_hits = self.disk_hits = self.translated_hits = self.misses = 0
+
+    def layout_key(self, panels: Sequence[Panel], placement: str = "rows") -> Tuple[str, Origin]:
+        """
+        Returns (key, origin) of the layout: the hash of its canonical form and the origin
+        its coordinates are relative to, (0, 0) for layouts that are only cached as they are.
+        """
+        scale = 1 / self.quantum
+        quantized = [
+            (
+                round(panel.left * scale),
+                round(panel.top * scale),
+                round(panel.width * scale),
+                round(panel.height * scale),
+            )
+            for panel in panels
+        ]
+
+        origin, translatable = (0.0, 0.0), False
+        ox = oy = 0
+        if self.translations and quantized:
+            centi = round(_CENTI * scale)
+            min_left = min(panel.left for panel in panels)
+            base = math.floor((min_left - self.first_rafter) / self.spacing)
+
+            # rafters before the first one do not exist, and off-grid coordinates would round
+            # differently after a translation
+            if (
+                base >= 0
+                and all(value % centi == 0 for item in quantized for value in item)
+                and not self._near_thresholds(quantized)
+            ):
+                origin = (
+                    self.first_rafter + base * self.spacing,
+                    min(panel.top for panel in panels),
+                )
+                ox, oy = round(origin[0] * scale), min(item[1] for item in quantized)
+                translatable = True
+
+        canonical = sorted(
+            (left - ox, top - oy, width, height) for left, top, width, height in quantized
+        )
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(self._config(placement)).encode())
+        digest.update(b"relative" if translatable else b"absolute")
+        digest.update(array("q", [value for item in canonical for value in item]).tobytes())
+        return digest.hexdigest(), origin
+
+    def _near_thresholds(self, quantized: List[Tuple[int, int, int, int]]) -> bool:
+        """
+        Whether a comparison of the calculation may flip when the layout is translated: a gap between
+        panels or a difference of tops at CONTINUOUS_GAP or JOINT_GAP_THRESHOLD, a panel bound with
+        edge clearance or cantilever limit on a rafter, or a run of panels as long as the cantilever limit,
+        unless all its operands are multiples of 0.25 (exact in floats, so the tie is decided the same
+        way at every origin). On the 0.01 grid a quantity is within float error of its threshold only
+        when equal to it. Pairs are checked regardless of rows and segments.
+        """
+        scale = 1 / self.quantum
+        quarter = round(0.25 * scale)
+        lefts = {item[0] for item in quantized}
+        tops = {item[1] for item in quantized}
+        spans = {(item[0], item[2]) for item in quantized}
+
+        def inexact(*values: int) -> bool:
+            return any(value % quarter for value in values)
+
+        gaps = {round(config.CONTINUOUS_GAP * scale), round(config.JOINT_GAP_THRESHOLD * scale)}
+        cantilever = round(config.CANTILEVER_LIMIT * scale)
+        clearance = round(config.EDGE_CLEARANCE * scale)
+        first_rafter, spacing = round(self.first_rafter * scale), round(self.spacing * scale)
+
+        for gap in gaps:
+            if any(top + gap in tops for top in tops if inexact(top, gap)):
+                return True
+        for left in lefts:
+            for offset in (clearance, cantilever):
+                if (left + offset - first_rafter) % spacing == 0 and inexact(
+                    left, offset, first_rafter, spacing
+                ):
+                    return True
+        for left, width in spans:
+            right = left + width
+            if not inexact(left, width, *gaps) and not inexact(
+                cantilever, clearance, first_rafter, spacing
+            ):
+                continue
+            if any(right + gap in lefts or right - gap in lefts for gap in gaps):
+                return True
+            if right - cantilever in lefts or any(
+                (right - offset - first_rafter) % spacing == 0 for offset in (clearance, cantilever)
+            ):
+                return True
+        return False
+
+    def get(self, key: str, origin: Origin) -> Optional[CacheHit]:
+        """
+        Returns the cached result for the layout with the key and origin (a copy the caller may modify),
+        or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            tier = "memory"
+        else:
+            entry = self._read_file(key)
+            tier = "disk"
+
+        result = self._result_at(entry, origin) if entry is not None else None
+        if result is None:
+            self.misses += 1
+            return None
+
+        if tier == "memory":
+            self.memory_hits += 1
+        else:
+            self.disk_hits += 1
+            self._store(key, entry)
+        translated = tuple(entry["origin"]) != origin
+        if translated:
+            self.translated_hits += 1
+
+        return CacheHit(result, translated)
+
+    def put(self, key: str, origin: Origin, result: dict) -> None:
+        """Store the calculation result of the layout with the key and origin in both tiers."""
+        entry = {
+            "origin": list(origin),
+            "result": self._copy(
+                {name: value for name, value in result.items() if name != "metrics"}
+            ),
+        }
+        self._store(key, entry)
+        if self.directory is not None:
+            self._write_file(key, entry)
+
+    def _config(self, placement: str) -> tuple:
+        return (
+            placement,
+            self.quantum,
+            self.first_rafter,
+            self.spacing,
+            config.EDGE_CLEARANCE,
+            config.CANTILEVER_LIMIT,
+            config.SPAN_LIMIT,
+            config.JOINT_GAP_THRESHOLD,
+            config.CONTINUOUS_GAP,
+        )
+
+    def _store(self, key: str, entry: dict) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(result: dict) -> dict:
+        if "mounts" not in result:
+            return copy.deepcopy(result)
+        return {
+            name: [dict(point) for point in points] for name, points in result.items()
+        }
+
+    @staticmethod
+    def _result_at(entry: dict, origin: Origin) -> Optional[dict]:
+        """Returns the cached result translated to origin, None for an error of another origin."""
+        result = entry["result"]
+        dx, dy = origin[0] - entry["origin"][0], origin[1] - entry["origin"][1]
+
+        if dx == 0 and dy == 0:
+            return ResultCache._copy(result)
+        if "mounts" not in result:
+            return None
+
+        return {
+            "mounts": [
+                {"x": round(point["x"] + dx, 2), "y": round(point["y"] + dy, 2)}
+                for point in result["mounts"]
+            ]
+        }
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_file(self, key: str) -> Optional[dict]:
+        name = f"{key}.json"
+        if name not in self._files:
+            return None
+        try:
+            with open(self._path(name), "r") as file:
+                entry = json.load(file)
+            os.utime(self._path(name))
+        except (OSError, ValueError):
+            self.disk_bytes -= self._files.pop(name)
+            return None
+        self._files.move_to_end(name)
+        return entry
+
+    def _write_file(self, key: str, entry: dict) -> None:
+        name = f"{key}.json"
+        payload = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self.max_disk_bytes:
+            return
+
+        temporary = self._path(f"{name}.tmp")
+        with open(temporary, "wb") as file:
+            file.write(payload)
+        os.replace(temporary, self._path(name))
+
+        self.disk_bytes += len(payload) - self._files.pop(name, 0)
+        self._files[name] = len(payload)
+        while self.disk_bytes > self.max_disk_bytes:
+            oldest, size = self._files.popitem(last=False)
+            self._remove_file(oldest)
+            self.disk_bytes -= size
+
+    def _remove_file(self, name: str) -> None:
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,314 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source.calculators.joint_calculator import (
+    deduplicate_joints,
+    horizontal_joints_in_row,
+    shared_joints_between_rows,
+)
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.config import EDGE_CLEARANCE, JOINT_GAP_THRESHOLD
+from source.constructors.segment_constructor import SegmentConstructor
+from source.domain import Panel, Point
+from source.fixed_point import FixedPoint, fixed_points_to_list, to_fixed
+from source.services.rafter_service import RafterGrid, RafterSequence
+from source.validators.cantilever_validator import (
+    CantileverValidator,
+    CantileverValidatorError,
+)
+from source.validators.span_limit_validator import (
+    SpanLimitValidator,
+    SpanLimitValidatorError,
+)
+
+# (top, panel id): the order in which RowConstructor meets the panels
+RowKey = Tuple[float, int]
+MountKey = FixedPoint  # (x, y) in centi-units
+
+
+class _Row:
+    """Row of the session together with everything that depends on this row alone."""
+
+    __slots__ = ("anchor", "panel_ids", "panels", "joints", "error")
+
+    def __init__(self, anchor: RowKey, panel_ids: List[int], panels: List[Panel]):
+        self.anchor = anchor  # key of the first panel of the row, the one others are compared with
+        self.panel_ids = panel_ids
+        self.panels = panels  # sorted by X
+        self.joints: List[FixedPoint] = []  # horizontal joints
+        self.error: Optional[Exception] = None  # first validation error of the row segments
+
+
+class LayoutSession:
+    """
+    Layout kept between edits for interactive editing.
+
+    Rows, validation errors of their segments, horizontal joints of every row, shared joints of every
+    pair of adjacent rows and reference counts of mount points are stored. An edit regroups only the
+    rows around the changed panel and recomputes their segments and shared joints with the neighbour
+    rows, so result() stays equal to SolarPanelCalculator(session.panels).calculate().
+    """
+
+    def __init__(self, panels: Iterable[Panel] = ()):
+        self._panels: Dict[int, Panel] = {}  # insertion order is the order of the layout
+        self._next_id = 0
+
+        self._keys: List[RowKey] = []  # sorted
+        self._rows: List[_Row] = []
+        self._anchors: List[RowKey] = []  # anchor of every row, sorted
+        self._shared_joints: List[List[FixedPoint]] = []  # joints shared by rows i and i + 1
+
+        self._panel_mounts_x: Dict[int, List[float]] = {}
+        self._mount_counts: Dict[MountKey, int] = {}
+        self._mount_keys: List[MountKey] = []  # sorted by (x, y)
+
+        grid = RafterGrid()
+        # rafters of a panel do not depend on the extent of the layout, so the sequence is unbounded
+        self._rafters = RafterSequence(grid.first_rafter, grid.spacing, 0, sys.maxsize)
+        self._cantilever_validator = CantileverValidator()
+        self._span_limit_validator = SpanLimitValidator()
+        self._result: Optional[dict] = None
+
+        for panel in panels:
+            self._keys.append((panel.top, self._register(panel)))
+        self._keys.sort()
+        self._regroup(None)
+
+    @property
+    def panels(self) -> List[Panel]:
+        """Panels of the layout in insertion order (a moved panel keeps its place)."""
+        return list(self._panels.values())
+
+    def __len__(self) -> int:
+        return len(self._panels)
+
+    def panel(self, panel_id: int) -> Panel:
+        """Returns the panel with id returned by add_panel."""
+        return self._panels[self._check_id(panel_id)]
+
+    def add_panel(self, panel: Panel) -> int:
+        """
+        Add panel to the layout.
+
+        Args:
+            panel: Panel
+
+        Returns:
+            int: id of the panel for remove_panel and move_panel.
+        """
+        panel_id = self._register(panel)
+        key = (panel.top, panel_id)
+
+        insort(self._keys, key)
+        self._regroup(key)
+
+        return panel_id
+
+    def remove_panel(self, panel_id: int) -> Panel:
+        """
+        Remove panel from the layout.
+
+        Args:
+            panel_id: int, id returned by add_panel.
+
+        Returns:
+            Panel: removed panel.
+        """
+        panel = self._panels.pop(self._check_id(panel_id))
+        self._update_mounts(panel_id, panel, -1)
+
+        key = (panel.top, panel_id)
+        del self._keys[bisect_left(self._keys, key)]
+        self._regroup(key)
+
+        return panel
+
+    def move_panel(self, panel_id: int, top_left: Point) -> Panel:
+        """
+        Move panel to a new top-left corner, keeping its size and place in the layout order.
+
+        Args:
+            panel_id: int, id returned by add_panel.
+            top_left: Point, new top-left corner.
+
+        Returns:
+            Panel: moved panel.
+        """
+        old_panel = self._panels[self._check_id(panel_id)]
+        panel = Panel(top_left=top_left, width=old_panel.width, height=old_panel.height)
+
+        self._update_mounts(panel_id, old_panel, -1)
+        self._panels[panel_id] = panel
+        self._update_mounts(panel_id, panel, 1)
+
+        old_key, key = (old_panel.top, panel_id), (panel.top, panel_id)
+        del self._keys[bisect_left(self._keys, old_key)]
+        insort(self._keys, key)
+
+        # a panel dragged within its row is regrouped once, otherwise both rows separately
+        anchors = self._anchors
+        if bisect_right(anchors, old_key) == bisect_right(anchors, key):
+            self._regroup(min(old_key, key), max(old_key, key))
+        else:
+            self._regroup(old_key)
+            self._regroup(key)
+
+        return panel
+
+    def result(self) -> dict:
+        """
+        Returns mounts and joints of the current layout, the same structure as SolarPanelCalculator.calculate().
+        The result is built once after every edit and must not be modified.
+        """
+        if self._result is None:
+            self._result = self._build_result()
+        return self._result
+
+    def _check_id(self, panel_id: int) -> int:
+        if panel_id not in self._panels:
+            raise KeyError(f"Unknown panel id {panel_id}")
+        return panel_id
+
+    def _register(self, panel: Panel) -> int:
+        panel_id = self._next_id
+        self._next_id += 1
+
+        self._panels[panel_id] = panel
+        self._update_mounts(panel_id, panel, 1)
+
+        return panel_id
+
+    def _mounts_x(self, panel: Panel) -> List[float]:
+        return self._rafters.between(
+            panel.left + EDGE_CLEARANCE, panel.right - EDGE_CLEARANCE
+        )
+
+    def _update_mounts(self, panel_id: int, panel: Panel, delta: int) -> None:
+        """Adds (delta=1) or removes (delta=-1) references of the panel to its mount points."""
+        self._result = None
+        counts, keys = self._mount_counts, self._mount_keys
+
+        if delta > 0:
+            mounts_x = self._panel_mounts_x[panel_id] = self._mounts_x(panel)
+        else:
+            mounts_x = self._panel_mounts_x.pop(panel_id)
+
+        for x in mounts_x:
+            x = to_fixed(x)
+            for y in (panel.top, panel.bottom):
+                key = (x, to_fixed(y))
+                count = counts.get(key, 0) + delta
+                if count:
+                    counts[key] = count
+                    if count == 1 and delta == 1:
+                        insort(keys, key)
+                else:
+                    del counts[key]
+                    del keys[bisect_left(keys, key)]
+
+    def _regroup(
+        self, edit_key: Optional[RowKey], last_edit_key: Optional[RowKey] = None
+    ) -> None:
+        """
+        Regroup rows after keys between edit_key and last_edit_key (edit_key by default) were inserted
+        into or removed from the sorted keys, the same way as RowConstructor does. All rows are
+        grouped if edit_key is None.
+
+        Grouping from a row anchor depends only on the keys from that anchor on, so regrouping starts
+        at the last row anchored before the edit and stops at the first old anchor after it.
+        """
+        self._result = None
+        keys, anchors = self._keys, self._anchors
+        if last_edit_key is None:
+            last_edit_key = edit_key
+
+        lo, start = 0, 0
+        if edit_key is not None and anchors:
+            lo = bisect_right(anchors, edit_key) - 1
+            if lo < 0:
+                lo = 0
+            else:
+                start = bisect_left(keys, anchors[lo])
+
+        old_count = len(self._rows)
+        hi = old_count
+        new_rows: List[_Row] = []
+
+        i = start
+        while i < len(keys):
+            anchor = keys[i]
+            if edit_key is not None and anchor > last_edit_key:
+                old_index = bisect_left(anchors, anchor, lo)
+                if old_index < old_count and anchors[old_index] == anchor:
+                    hi = old_index
+                    break
+
+            j = i + 1
+            while j < len(keys) and abs(keys[j][0] - anchor[0]) <= JOINT_GAP_THRESHOLD:
+                j += 1
+
+            new_rows.append(self._build_row(anchor, [panel_id for _, panel_id in keys[i:j]]))
+
+            i = j
+
+        self._rows[lo:hi] = new_rows
+        anchors[lo:hi] = [row.anchor for row in new_rows]
+
+        # shared joints of the pairs touching replaced rows
+        new_count = len(self._rows)
+        first_pair = max(lo - 1, 0)
+        old_stop = max(min(hi, old_count - 1), first_pair)
+        new_stop = min(lo + len(new_rows), new_count - 1)
+
+        self._shared_joints[first_pair:old_stop] = [
+            shared_joints_between_rows(
+                self._rows[i].panels,
+                self._rows[i + 1].panels,
+                self._rows[i].joints,
+                self._rows[i + 1].joints,
+            )
+            for i in range(first_pair, new_stop)
+        ]
+
+    def _build_row(self, anchor: RowKey, panel_ids: List[int]) -> _Row:
+        all_panels = self._panels
+        panel_ids.sort(key=lambda panel_id: all_panels[panel_id].left)
+        panels = [all_panels[panel_id] for panel_id in panel_ids]
+
+        row = _Row(anchor, panel_ids, panels)
+        row.joints = horizontal_joints_in_row(panels)
+
+        position = 0
+        try:
+            for segment in SegmentConstructor.split_rows_into_segments([panels]):
+                panels_mounts_x = [
+                    self._panel_mounts_x[panel_id]
+                    for panel_id in panel_ids[position : position + len(segment)]
+                ]
+                position += len(segment)
+
+                self._cantilever_validator.validate(
+                    segment, sorted({x for mounts_x in panels_mounts_x for x in mounts_x})
+                )
+
+                for mounts_x in panels_mounts_x:
+                    self._span_limit_validator.validate(mounts_x)
+        except (CantileverValidatorError, SpanLimitValidatorError) as e:
+            row.error = e
+
+        return row
+
+    def _build_result(self) -> dict:
+        for row in self._rows:
+            if row.error is not None:
+                return SolarPanelCalculator.error_result(row.error)
+
+        joints = [joint for row in self._rows for joint in row.joints]
+        for shared_joints in self._shared_joints:
+            joints.extend(shared_joints)
+
+        return {
+            "mounts": fixed_points_to_list(self._mount_keys),
+            "joints": fixed_points_to_list(deduplicate_joints(joints)),
+        }
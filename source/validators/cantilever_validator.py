@@ -5,7 +5,13 @@ from source.domain import Panel
 
 
 class CantileverValidatorError(ValueError):
-    pass
+    def __init__(self, message: str, limit: float = CANTILEVER_LIMIT):
+        super().__init__(message)
+        # the limit of the validator that raised the error
+        self.limit = limit
+
+    def __reduce__(self):
+        return type(self), (str(self), self.limit)
 
 
 class CantileverValidator:
@@ -19,28 +25,32 @@ class CantileverValidator:
         if not segment:
             return
 
+        limit = self.cantilevers_limit
         start_of_segment = segment[0].left
         end_of_segment = segment[-1].right
 
         if not mounts:
-            if (end_of_segment - start_of_segment) > CANTILEVER_LIMIT:
+            if (end_of_segment - start_of_segment) > limit:
                 raise CantileverValidatorError(
                     f"Cantilever exceeded: Segment {start_of_segment} to {end_of_segment}"
-                    f" has no mounts, and full length is > {CANTILEVER_LIMIT}"
+                    f" has no mounts, and full length is > {limit}",
+                    limit,
                 )
             return
 
         first_mount = mounts[0]
         last_mount = mounts[-1]
 
-        if first_mount - start_of_segment > CANTILEVER_LIMIT:
+        if first_mount - start_of_segment > limit:
             raise CantileverValidatorError(
                 f"Cantilever exceeded on the left side of segment: "
-                f"{first_mount} - {start_of_segment} > {CANTILEVER_LIMIT}"
+                f"{first_mount} - {start_of_segment} > {limit}",
+                limit,
             )
 
-        if end_of_segment - last_mount > CANTILEVER_LIMIT:
+        if end_of_segment - last_mount > limit:
             raise CantileverValidatorError(
                 f"Cantilever exceeded on the right side of segment: "
-                f"{end_of_segment} - {last_mount} > {CANTILEVER_LIMIT}"
+                f"{end_of_segment} - {last_mount} > {limit}",
+                limit,
             )
@@ -4,7 +4,13 @@ from source.config import SPAN_LIMIT
 
 
 class SpanLimitValidatorError(Exception):
-    pass
+    def __init__(self, message: str, limit: float = SPAN_LIMIT):
+        super().__init__(message)
+        # the limit of the validator that raised the error
+        self.limit = limit
+
+    def __reduce__(self):
+        return type(self), (str(self), self.limit)
 
 
 class SpanLimitValidator:
@@ -15,5 +21,6 @@ class SpanLimitValidator:
         for mount_a, mount_b in zip(mounts, mounts[1:]):
             if mount_b - mount_a > self.span_limit:
                 raise SpanLimitValidatorError(
-                    f"Span limit exceeded: {mount_b} - {mount_a} > {self.span_limit}"
+                    f"Span limit exceeded: {mount_b} - {mount_a} > {self.span_limit}",
+                    self.span_limit,
                 )
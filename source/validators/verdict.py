@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from source.domain import Panel
+
+CANTILEVER_RULE = "cantilever"
+SPAN_RULE = "span"
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """
+    One violated rule of a layout.
+
+    rule is CANTILEVER_RULE for the whole segment or SPAN_RULE for one panel of the segment,
+    message is the message of the validator error.
+    """
+
+    rule: str
+    message: str
+    segment_index: int
+    segment_left: float
+    segment_right: float
+    panel: Optional[Panel] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "rule": self.rule,
+            "message": self.message,
+            "segment": {
+                "index": self.segment_index,
+                "left": self.segment_left,
+                "right": self.segment_right,
+            },
+            "panel": (
+                None
+                if self.panel is None
+                else {"x": self.panel.left, "y": self.panel.top}
+            ),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Verdict:
+    """Result of the feasibility check: feasible if no rule is violated."""
+
+    violations: List[Violation] = field(default_factory=list)
+
+    @property
+    def feasible(self) -> bool:
+        return not self.violations
+
+    def __bool__(self) -> bool:
+        return self.feasible
+
+    def to_dict(self) -> dict:
+        return {
+            "feasible": self.feasible,
+            "violations": [violation.to_dict() for violation in self.violations],
+        }
@@ -0,0 +1,211 @@
+import json
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import contextmanager
+from math import isfinite
+from typing import IO, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+Coordinates = Iterable[Tuple[float, float]]
+
+
+def _not_json_compliant(x: float, y: float) -> ValueError:
+    return ValueError(f"Out of range coordinates ({x!r}, {y!r}) are not JSON compliant")
+
+
+class ResultWriter(ABC):
+    """
+    Writes calculation result incrementally to a text stream.
+    Items are formatted straight from (x, y) coordinates (rounded to 2 decimals like OutputFormatter)
+    without building a dict per item, and written in batches, so output memory stays constant.
+    """
+
+    def __init__(self, stream: IO[str], batch_size: int = 4096):
+        self.stream = stream
+        self.batch_size = batch_size
+        self._batch: List[str] = []
+
+    def _write(self, text: str) -> None:
+        self._batch.append(text)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._batch:
+            self.stream.write("".join(self._batch))
+            self._batch.clear()
+        self.stream.flush()
+
+    @abstractmethod
+    def write_result(self, mounts: Coordinates, joints: Coordinates) -> None:
+        """
+        Writes mounts and joints of a successful calculation.
+
+        Args:
+            mounts: Iterable of mount (x, y) coordinates.
+            joints: Iterable of joint (x, y) coordinates.
+        """
+
+    @abstractmethod
+    def write_error(self, error: dict) -> None:
+        """
+        Writes error structure of a failed calculation.
+
+        Args:
+            error: dict, {"status": "ERROR", "message": ..., "details": ...}
+        """
+
+
+class JsonResultWriter(ResultWriter):
+    """{"mounts": [{"x": .., "y": ..}, ...], "joints": [...]} - same shape as SolarPanelCalculator.calculate()."""
+
+    def _write_items(self, items: Coordinates) -> None:
+        separator = ""
+        for x, y in items:
+            if not (isfinite(x) and isfinite(y)):
+                raise _not_json_compliant(x, y)
+            self._write(f'{separator}{{"x": {round(x, 2)!r}, "y": {round(y, 2)!r}}}')
+            separator = ", "
+
+    def write_result(self, mounts: Coordinates, joints: Coordinates) -> None:
+        self._write('{"mounts": [')
+        self._write_items(mounts)
+        self._write('], "joints": [')
+        self._write_items(joints)
+        self._write("]}\n")
+        self.flush()
+
+    def write_error(self, error: dict) -> None:
+        self._write(json.dumps(error) + "\n")
+        self.flush()
+
+
+class JsonlResultWriter(ResultWriter):
+    """One JSON object per line: {"type": "mount"|"joint", "x": .., "y": ..}."""
+
+    def _write_items(self, item_type: str, items: Coordinates) -> None:
+        prefix = f'{{"type": "{item_type}", "x": '
+        for x, y in items:
+            if not (isfinite(x) and isfinite(y)):
+                raise _not_json_compliant(x, y)
+            self._write(f'{prefix}{round(x, 2)!r}, "y": {round(y, 2)!r}}}\n')
+
+    def write_result(self, mounts: Coordinates, joints: Coordinates) -> None:
+        self._write_items("mount", mounts)
+        self._write_items("joint", joints)
+        self.flush()
+
+    def write_error(self, error: dict) -> None:
+        self._write(json.dumps({"type": "error", **error}) + "\n")
+        self.flush()
+
+
+class CsvResultWriter(ResultWriter):
+    """CSV with header "type,x,y"; an error is written as a single "error,message,details" row."""
+
+    def _write_items(self, item_type: str, items: Coordinates) -> None:
+        for x, y in items:
+            self._write(f"{item_type},{round(x, 2)!r},{round(y, 2)!r}\n")
+
+    def write_result(self, mounts: Coordinates, joints: Coordinates) -> None:
+        self._write("type,x,y\n")
+        self._write_items("mount", mounts)
+        self._write_items("joint", joints)
+        self.flush()
+
+    def write_error(self, error: dict) -> None:
+        message = error["message"].replace('"', '""')
+        details = error["details"].replace('"', '""')
+        self._write(f'type,message,details\nerror,"{message}","{details}"\n')
+        self.flush()
+
+
+class BinaryResultWriter(ResultWriter):
+    """
+    Packed little-endian binary result, written to a binary stream in blocks of batch_size points:
+    header (magic b"SPCR", version), float64 (x, y) pairs of the mounts, then of the joints,
+    and a trailer with the mount and joint counts, so output memory stays constant also on pipes.
+    An error is written as magic b"SPCE", version, length and the UTF-8 JSON error structure.
+    """
+
+    MAGIC = b"SPCR"
+    ERROR_MAGIC = b"SPCE"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHxx")
+    TRAILER = struct.Struct("<QQ")
+    ERROR_HEADER = struct.Struct("<4sHxxQ")
+
+    def _write_points(self, items: Coordinates) -> int:
+        """Writes (x, y) pairs of the items block by block, returns their count."""
+        block = array("d")
+        block_length = 2 * self.batch_size
+        count = 0
+
+        for x, y in items:
+            block.append(round(x, 2))
+            block.append(round(y, 2))
+            if len(block) >= block_length:
+                count += self._write_block(block)
+        return count + self._write_block(block)
+
+    def _write_block(self, block: array) -> int:
+        if sys.byteorder != "little":
+            block.byteswap()
+        self.stream.write(block.tobytes())
+        count = len(block) // 2
+        del block[:]
+        return count
+
+    def write_result(self, mounts: Coordinates, joints: Coordinates) -> None:
+        self.stream.write(self.HEADER.pack(self.MAGIC, self.VERSION))
+        mount_count = self._write_points(mounts)
+        joint_count = self._write_points(joints)
+        self.stream.write(self.TRAILER.pack(mount_count, joint_count))
+        self.stream.flush()
+
+    def write_error(self, error: dict) -> None:
+        payload = json.dumps(error).encode("utf-8")
+        self.stream.write(self.ERROR_HEADER.pack(self.ERROR_MAGIC, self.VERSION, len(payload)))
+        self.stream.write(payload)
+        self.stream.flush()
+
+
+WRITERS: Dict[str, Type[ResultWriter]] = {
+    "json": JsonResultWriter,
+    "jsonl": JsonlResultWriter,
+    "csv": CsvResultWriter,
+    "binary": BinaryResultWriter,
+}
+
+BINARY_FORMATS = ("binary",)
+
+
+def get_writer(output_format: str, stream: IO) -> ResultWriter:
+    """
+    Returns a result writer for the output format ("json", "jsonl", "csv" or "binary").
+    The "binary" writer expects a binary stream, see open_output.
+    """
+    try:
+        writer_class = WRITERS[output_format]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output format {output_format!r}, expected one of {tuple(WRITERS)}"
+        ) from None
+    return writer_class(stream)
+
+
+@contextmanager
+def open_output(
+    target: Union[str, IO], binary: bool = False, buffer_size: int = 1 << 20
+) -> Iterator[IO]:
+    """
+    Opens output target for writing: a path, "-" for stdout, or an already open stream.
+    """
+    if not isinstance(target, str):
+        yield target
+    elif target == "-":
+        yield sys.stdout.buffer if binary else sys.stdout
+    else:
+        with open(target, "wb" if binary else "w", buffering=buffer_size) as f:
+            yield f
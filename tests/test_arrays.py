@@ -0,0 +1,80 @@
+from source.arrays import JointArray, MountArray, PanelArray
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Mount, Panel, Point, intern_point
+from source.fixed_point import IntegralCentis, to_fixed
+from source.services.rafter_service import RafterGrid
+
+
+PANELS = [
+    Panel(top_left=Point(0.0, 0.0)),
+    Panel(top_left=Point(45.05, 0.0)),
+    Panel(top_left=Point(0.0, 71.6), width=40.0, height=70.0),
+]
+
+
+def test_panel_edges_are_precomputed():
+    """Tests that panel edges are stored on the instance and not part of equality."""
+    panel = Panel(top_left=Point(5.0, 10.0), width=40.0, height=70.0)
+
+    assert (panel.left, panel.top, panel.right, panel.bottom) == (5.0, 10.0, 45.0, 80.0)
+    assert panel == Panel(top_left=Point(5.0, 10.0), width=40.0, height=70.0)
+    assert not hasattr(panel, "__dict__")
+
+
+def test_intern_point_returns_shared_instance():
+    """Tests that repeated coordinates share one Point instance."""
+    assert intern_point(16.0, 71.1) is intern_point(16.0, 71.1)
+    assert intern_point(16.0, 0) is not intern_point(16.0, 0.0)  # typed: int and float kept apart
+
+
+def test_panel_array_round_trip():
+    """Tests conversion between Panel objects and PanelArray columns."""
+    panel_array = PanelArray.from_panels(PANELS)
+
+    assert len(panel_array) == 3
+    assert panel_array.to_panels() == PANELS
+    assert panel_array[2] == PANELS[2]
+    assert panel_array.extent() == (0.0, 89.75)
+    assert PanelArray.from_columns(
+        panel_array.left, panel_array.top, panel_array.width, panel_array.height
+    ).to_panels() == PANELS
+
+
+def test_calculator_accepts_panel_array():
+    """Tests that the calculator and rafter grid take PanelArray input directly."""
+    panel_array = PanelArray.from_panels(PANELS)
+
+    assert RafterGrid().generate_grid(panel_array) == RafterGrid().generate_grid(PANELS)
+    assert SolarPanelCalculator(panel_array).calculate() == SolarPanelCalculator(PANELS).calculate()
+
+
+def test_panel_array_keeps_int_coordinates():
+    """Tests that int coordinates are flagged and restored by the Panels of the columns."""
+    panel_array = PanelArray()
+    panel_array.append(0.0, 0.0)
+    panel_array.append(45, 0.0, 45, 72)
+
+    panels = panel_array.to_panels()
+
+    assert list(panel_array.integral) == [0, 0b1101]
+    assert [type(panels[1].left), type(panels[1].top), type(panels[1].height)] == [int, float, int]
+    assert type(panel_array[1].width) is int
+    assert PanelArray.from_panels(PANELS).integral is None
+
+
+def test_mount_array_round_trip():
+    """Tests that result points are stored in columns and give back their keys and result coordinates."""
+    keys = [(to_fixed(16.0), to_fixed(0)), (to_fixed(16.0), to_fixed(71.1))]
+    mounts = MountArray.from_keys(keys)
+    joints = JointArray()
+    for key in keys:
+        joints.append(key)
+
+    assert len(mounts) == 2
+    assert list(mounts) == keys
+    assert [type(y) for _, y in joints] == [IntegralCentis, int]
+    assert mounts.to_list() == [{"x": 16.0, "y": 0}, {"x": 16.0, "y": 71.1}]
+    assert type(mounts.to_list()[0]["y"]) is int
+    assert list(joints.iter_coordinates()) == [(16.0, 0), (16.0, 71.1)]
+    assert mounts.to_mounts() == [Mount(position=Point(16.0, 0)), Mount(position=Point(16.0, 71.1))]
+    assert MountArray.from_keys([(1600, 7110)]).integral is None
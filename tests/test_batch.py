@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from source.batch import BatchProcessor
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+
+VALID_PANELS = [{"x": 0, "y": 0}, {"x": 45.05, "y": 0}]
+
+LINES = [
+    json.dumps({"id": "roof-1", "panels": VALID_PANELS}),
+    "",  # empty lines are skipped but still counted
+    json.dumps({"id": "roof-2", "panels": [{"x": 15.5, "y": 0}]}),  # cantilever violated
+    "{not json",
+    json.dumps({"id": "roof-4", "panels": []}),
+]
+
+
+@pytest.mark.parametrize("workers, ordered", [(0, True), (2, True), (2, False)])
+def test_batch_reports_each_layout(workers, ordered):
+    """Tests that every layout gets its own output record and errors do not stop the batch."""
+    processor = BatchProcessor(workers=workers, chunk_size=2, max_in_flight=1, ordered=ordered)
+
+    records = [json.loads(record) for record in processor.run(LINES)]
+    if not ordered:
+        records.sort(key=lambda r: r["line"])
+
+    assert [r["line"] for r in records] == [1, 3, 4, 5]
+    assert [r["id"] for r in records] == ["roof-1", "roof-2", None, "roof-4"]
+
+    expected = SolarPanelCalculator(
+        [Panel(top_left=Point(p["x"], p["y"])) for p in VALID_PANELS]
+    ).calculate()
+    assert records[0]["result"] == expected
+    assert records[1]["result"]["message"].startswith("Cantilever Limit violated")
+    assert records[2]["result"]["message"] == "Invalid layout record."
+    assert records[3]["result"] == {"mounts": [], "joints": []}
+    assert processor.failed == 2
+
+
+def test_run_file(tmp_path):
+    """Tests batch processing from a JSON Lines file to a JSON Lines file."""
+    input_path = tmp_path / "layouts.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_text("\n".join(LINES) + "\n")
+
+    count = BatchProcessor(workers=0).run_file(str(input_path), str(output_path))
+
+    assert count == 4
+    assert len(output_path.read_text().splitlines()) == 4
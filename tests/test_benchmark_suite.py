@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from benchmarks.suite import STAGES, find_regressions, run_suite
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+
+
+@pytest.mark.parametrize("kind", list(LAYOUTS))
+def test_generated_layouts_are_seeded_and_valid(kind):
+    """Tests that every layout kind is reproducible, has the requested size and passes validation."""
+    panels = generate_layout(kind, 250, seed=3)
+
+    assert len(panels) == 250
+    assert panels == generate_layout(kind, 250, seed=3)
+    assert "mounts" in SolarPanelCalculator(panels).calculate()
+
+
+def test_gappy_layout_has_many_segments():
+    """Tests that the gappy layout splits rows into several segments."""
+    from source.constructors.layout_index import LayoutIndex
+
+    index = LayoutIndex(generate_layout("gappy", 400, seed=1))
+
+    assert len(index.segments) > 2 * len(index.rows)
+
+
+def test_run_suite_times_every_stage():
+    """Tests that the suite reports every stage for every case."""
+    results = run_suite(["grid", "gappy"], [10, 50])
+
+    assert list(results) == ["grid/10", "grid/50", "gappy/10", "gappy/50"]
+    assert all(set(stages) == set(STAGES) for stages in results.values())
+
+
+def test_find_regressions():
+    """Tests the regression gate: threshold and timer noise floor."""
+    baseline = {"grid/1000": {"joints": 0.010, "mounts": 0.010, "rafter_grid": 0.0001}}
+    results = {"grid/1000": {"joints": 0.0124, "mounts": 0.0126, "rafter_grid": 0.0009}}
+
+    regressions = find_regressions(results, baseline, threshold=0.25, min_seconds=0.001)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("grid/1000 mounts")
@@ -0,0 +1,170 @@
+import io
+import json
+
+import pytest
+
+from benchmarks.layouts import generate_layout
+from source.binary import (
+    PANELS_MAGIC,
+    RESULT_MAGIC,
+    BinaryFormatError,
+    convert,
+    detect_container,
+    np,
+    read_binary_panels,
+    read_binary_result,
+    write_binary_panels,
+)
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.cli import main
+from source.domain import Panel, Point
+from source.readers.panel_reader import PanelReaderError
+from source.writers.result_writer import BinaryResultWriter
+
+PANELS = generate_layout("grid", 60, seed=3) + [
+    Panel(top_left=Point(0.0, 1000.0), width=71.1, height=44.7)
+]
+
+
+@pytest.fixture
+def panels_path(tmp_path):
+    path = tmp_path / "layout.spcp"
+    with open(path, "wb") as stream:
+        assert write_binary_panels(PANELS, stream) == len(PANELS)
+    return str(path)
+
+
+def test_panels_round_trip_without_copy(panels_path):
+    panels = read_binary_panels(panels_path)
+
+    assert detect_container(panels_path) == PANELS_MAGIC
+    assert isinstance(panels.left, memoryview) and panels.left.readonly
+    assert list(panels) == PANELS
+
+
+def test_calculator_takes_mapped_panels(panels_path):
+    assert SolarPanelCalculator(read_binary_panels(panels_path)).calculate() == (
+        SolarPanelCalculator(PANELS).calculate()
+    )
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_numpy_backend_on_mapped_panels(panels_path):
+    assert SolarPanelCalculator(
+        read_binary_panels(panels_path), backend="numpy"
+    ).calculate() == SolarPanelCalculator(PANELS).calculate()
+
+
+def test_result_round_trip(tmp_path):
+    path = tmp_path / "result.spcr"
+    with open(path, "wb") as stream:
+        assert SolarPanelCalculator(PANELS).write(BinaryResultWriter(stream))
+
+    result = read_binary_result(str(path))
+
+    assert detect_container(str(path)) == RESULT_MAGIC
+    assert result.ok
+    assert result.to_dict() == SolarPanelCalculator(PANELS).calculate()
+    if np is not None:
+        mounts_x, _, _, joints_y = result.numpy()
+        assert len(mounts_x) == len(result.mounts_x)
+        assert not mounts_x.flags.writeable
+        assert list(joints_y) == list(result.joints_y)
+
+
+def test_error_result(tmp_path):
+    path = tmp_path / "error.spcr"
+    panels = [Panel(top_left=Point(15.5, 0.0))]
+    with open(path, "wb") as stream:
+        assert not SolarPanelCalculator(panels).write(BinaryResultWriter(stream))
+
+    result = read_binary_result(str(path))
+
+    assert not result.ok
+    assert result.to_dict() == SolarPanelCalculator(panels).calculate()
+
+
+def test_truncated_result(tmp_path):
+    path = tmp_path / "result.spcr"
+    buffer = io.BytesIO()
+    SolarPanelCalculator(PANELS).write(BinaryResultWriter(buffer))
+    path.write_bytes(buffer.getvalue()[:-8])
+
+    with pytest.raises(BinaryFormatError):
+        read_binary_result(str(path))
+
+
+def test_invalid_containers(tmp_path):
+    truncated = tmp_path / "truncated.spcp"
+    buffer = io.BytesIO()
+    write_binary_panels(PANELS, buffer)
+    truncated.write_bytes(buffer.getvalue()[:-8])
+
+    with pytest.raises(BinaryFormatError):
+        read_binary_panels(str(truncated))
+    with pytest.raises(BinaryFormatError):
+        read_binary_result(str(truncated))
+
+    empty = tmp_path / "empty.spcp"
+    empty.write_bytes(b"")
+    with pytest.raises(BinaryFormatError):
+        read_binary_panels(str(empty))
+
+
+def test_json_converters(tmp_path):
+    layout = tmp_path / "layout.json"
+    layout.write_text(
+        json.dumps(
+            {
+                "panels": [
+                    {"x": p.left, "y": p.top, "width": p.width, "height": p.height}
+                    for p in PANELS
+                ]
+            }
+        )
+    )
+
+    convert(str(layout), str(tmp_path / "layout.spcp"))
+    assert list(read_binary_panels(str(tmp_path / "layout.spcp"))) == PANELS
+
+    convert(str(tmp_path / "layout.spcp"), str(tmp_path / "back.json"))
+    assert json.loads((tmp_path / "back.json").read_text()) == json.loads(layout.read_text())
+
+    result = tmp_path / "result.json"
+    result.write_text(json.dumps(SolarPanelCalculator(PANELS).calculate()))
+    convert(str(result), str(tmp_path / "result.spcr"))
+    convert(str(tmp_path / "result.spcr"), str(tmp_path / "result_back.json"))
+    assert json.loads((tmp_path / "result_back.json").read_text()) == json.loads(result.read_text())
+
+
+def test_json_result_is_detected_by_keys(tmp_path):
+    """Tests that pretty-printed results and results with other key orders are converted as results."""
+    result = SolarPanelCalculator(PANELS).calculate()
+    pretty = tmp_path / "pretty.json"
+    pretty.write_text(json.dumps(result, indent=2))
+    reordered = tmp_path / "reordered.json"
+    reordered.write_text(json.dumps({"joints": result["joints"], "mounts": result["mounts"]}))
+
+    for source in (pretty, reordered):
+        convert(str(source), str(tmp_path / "result.spcr"))
+        assert read_binary_result(str(tmp_path / "result.spcr")).to_dict() == result
+
+
+def test_failed_conversion_leaves_no_target(tmp_path):
+    document = tmp_path / "other.json"
+    document.write_text('{"roofs": []}')
+    target = tmp_path / "other.spcp"
+
+    with pytest.raises(PanelReaderError):
+        convert(str(document), str(target))
+    assert not target.exists()
+
+
+def test_cli_reads_binary_panels(panels_path, tmp_path, capsys):
+    output = tmp_path / "result.spcr"
+
+    assert main([panels_path, "-o", str(output), "--format", "binary"]) == 0
+    assert read_binary_result(str(output)).to_dict() == SolarPanelCalculator(PANELS).calculate()
+
+    assert main([panels_path]) == 0
+    assert json.loads(capsys.readouterr().out) == SolarPanelCalculator(PANELS).calculate()
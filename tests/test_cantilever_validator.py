@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from source.validators.cantilever_validator import CantileverValidator
 from source.validators.cantilever_validator import CantileverValidatorError
@@ -61,3 +63,18 @@ def test_no_mounts_in_large_segment_fails(cantilever_validator):
 
     with pytest.raises(CantileverValidatorError):
         cantilever_validator.validate(segment, mount_positions)
+
+
+def test_custom_cantilever_limit_is_used():
+    """Verifies that the limit passed to the validator replaces the default one."""
+    segment = create_segment(start_x=0.0, end_x=50.0)
+
+    CantileverValidator(cantilevers_limit=20.0).validate(segment, [18.0, 32.0])
+
+    with pytest.raises(CantileverValidatorError) as excinfo:
+        CantileverValidator(cantilevers_limit=10.0).validate(segment, [16.0, 40.0])
+
+    assert "16.0 - 0.0 > 10.0" in str(excinfo.value)
+    assert excinfo.value.limit == 10.0
+    # the limit survives pickling, e.g. an error raised in a row worker process
+    assert pickle.loads(pickle.dumps(excinfo.value)).limit == 10.0
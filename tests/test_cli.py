@@ -0,0 +1,135 @@
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from source.calculators.mount_calculator import NoRaftersWarning
+from source.cli import main
+
+SAMPLE_INPUT = str(Path(__file__).parent.parent / "examples" / "sample_input.json")
+
+
+def test_json_output_to_stdout(capsys):
+    """Tests that the default run writes the calculation result as valid JSON to stdout."""
+    assert main([SAMPLE_INPUT]) == 0
+
+    result = json.loads(capsys.readouterr().out)
+    assert len(result["mounts"]) == 54
+    assert {"x": 44.88, "y": 0} in result["joints"]
+
+
+def test_streamed_output_matches_default(tmp_path, capsys):
+    """Tests that --stream writes the same JSON to a file and --timings reports phases on stderr."""
+    output = tmp_path / "result.json"
+
+    main([SAMPLE_INPUT])
+    expected = json.loads(capsys.readouterr().out)
+
+    assert main([SAMPLE_INPUT, "-o", str(output), "--stream", "--timings"]) == 0
+    assert json.loads(output.read_text()) == expected
+    assert "calculate+write" in capsys.readouterr().err
+
+
+def test_binary_output(tmp_path):
+    """Tests the binary output header (magic, version) and trailer (mount and joint counts)."""
+    output = tmp_path / "result.bin"
+
+    main([SAMPLE_INPUT, "-o", str(output), "--format", "binary"])
+
+    data = output.read_bytes()
+    assert struct.unpack_from("<4sHxx", data) == (b"SPCR", 2)
+    assert struct.unpack_from("<QQ", data, len(data) - 16) == (54, 12)
+    assert len(data) == 8 + 16 * (54 + 12) + 16
+
+
+def test_invalid_layout_exit_code(tmp_path, capsys):
+    """Tests that an invalid layout writes the error structure and exits with 1."""
+    layout = tmp_path / "layout.json"
+    layout.write_text('{"panels": [{"x": 15.5, "y": 0}]}')
+
+    assert main([str(layout)]) == 1
+    assert json.loads(capsys.readouterr().out)["status"] == "ERROR"
+
+
+def test_skipped_panel_warning_keeps_stdout_parseable(tmp_path, capsys):
+    """Tests that the warning of a panel without rafters goes to stderr, not into the JSON or CSV output."""
+    layout = tmp_path / "layout.json"
+    layout.write_text('{"panels": [{"x": 20, "y": 0, "width": 10}]}')
+
+    with pytest.warns(NoRaftersWarning):
+        assert main([str(layout)]) == 0
+    assert json.loads(capsys.readouterr().out) == {"mounts": [], "joints": []}
+
+    with pytest.warns(NoRaftersWarning):
+        assert main([str(layout), "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["type,x,y"]
+
+
+def test_batch_mode(tmp_path):
+    """Tests that --workers runs the batch mode over JSON Lines layouts."""
+    layouts = tmp_path / "roofs.jsonl"
+    output = tmp_path / "results.jsonl"
+    layouts.write_text(
+        '{"id": "a", "panels": [{"x": 0, "y": 0}]}\n{"id": "b", "panels": []}\n'
+    )
+
+    assert main([str(layouts), "-o", str(output), "--workers", "0"]) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["id"] for r in records] == ["a", "b"]
+
+
+def test_batch_exit_code(tmp_path):
+    """Tests that the batch mode exits with 1 when any layout failed, and still writes every record."""
+    layouts = tmp_path / "roofs.jsonl"
+    output = tmp_path / "results.jsonl"
+    layouts.write_text(
+        '{"id": "a", "panels": [{"x": 0, "y": 0}]}\n'
+        '{"id": "b", "panels": [{"x": 15.5, "y": 0}]}\n'
+        '{"id": "c", "panels": []}\n'
+    )
+
+    assert main([str(layouts), "-o", str(output), "--batch"]) == 1
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["id"] for r in records] == ["a", "b", "c"]
+    assert records[1]["result"]["status"] == "ERROR"
+
+
+def test_check_mode(tmp_path, capsys):
+    """Tests that --check writes the verdict and reports an infeasible layout with exit code 1."""
+    assert main([SAMPLE_INPUT, "--check"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"feasible": True, "violations": []}
+
+    layout = tmp_path / "invalid.json"
+    layout.write_text(json.dumps({"panels": [{"x": -1, "y": 0}, {"x": -1, "y": 200}]}))
+
+    assert main([str(layout), "--check"]) == 1
+    verdict = json.loads(capsys.readouterr().out)
+    assert not verdict["feasible"]
+    assert len(verdict["violations"]) == 2
+
+
+def test_free_placement(tmp_path, capsys):
+    """Tests that --placement free finds joints of panels shifted by half a panel."""
+    layout = tmp_path / "staggered.json"
+    layout.write_text(json.dumps({"panels": [{"x": 0, "y": 0}, {"x": 45.05, "y": 35}]}))
+
+    assert main([str(layout)]) == 0
+    assert json.loads(capsys.readouterr().out)["joints"] == []
+
+    assert main([str(layout), "--placement", "free"]) == 0
+    assert json.loads(capsys.readouterr().out)["joints"] == [
+        {"x": 44.88, "y": 35},
+        {"x": 44.88, "y": 71.1},
+    ]
+
+
+def test_row_workers(capsys):
+    """Tests that --row-workers writes the same result as a single process."""
+    assert main([SAMPLE_INPUT]) == 0
+    expected = capsys.readouterr().out
+
+    assert main([SAMPLE_INPUT, "--row-workers", "2", "--row-pool", "thread"]) == 0
+    assert capsys.readouterr().out == expected
@@ -0,0 +1,61 @@
+import random
+
+from source.calculators.joint_calculator import JointCalculator
+from source.calculators.mount_calculator import MountCalculator
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Mount, Panel, Point
+from source.fixed_point import fixed_points_to_list, from_fixed, to_fixed
+
+
+def test_to_fixed_matches_round_to_two_decimals():
+    """Tests that centi-units convert back to exactly round(value, 2), half-way values included."""
+    rng = random.Random(0)
+    values = [0.125, 1.005, 2.675, 44.875, 71.355, -0.015, 1e6 + 0.005]
+    values += [rng.uniform(-1e4, 1e4) for _ in range(10000)]
+    values += [rng.randint(-10**6, 10**6) / 1000 for _ in range(10000)]
+    values += [(rng.randint(-10**6, 10**6) + 0.5) / 100 for _ in range(10000)]
+
+    for value in values:
+        assert from_fixed(to_fixed(value)) == round(value, 2), value
+
+
+def test_int_coordinates_stay_int():
+    """Tests that coordinates given as int are output as int, as round(value, 2) keeps them."""
+    assert to_fixed(16) == to_fixed(16.0) == 1600
+    assert fixed_points_to_list([(to_fixed(16), to_fixed(0.0))]) == [{"x": 16, "y": 0.0}]
+    assert type(from_fixed(to_fixed(16))) is int
+    assert type(from_fixed(to_fixed(16.0))) is float
+
+    result = SolarPanelCalculator([Panel(top_left=Point(0, 0))]).calculate()
+    assert [type(mount["y"]) for mount in result["mounts"]] == [int, float, int, float]
+
+
+def test_deduplicate_mounts_on_fixed_keys():
+    """Tests that mounts closer than 0.005 are merged and the rest sorted by (x, y)."""
+    mounts = [
+        Mount(position=Point(16.001, 71.1)),
+        Mount(position=Point(16.0, 0.0)),
+        Mount(position=Point(15.999, 71.104)),
+        Mount(position=Point(16.0, 0.004)),
+    ]
+
+    unique = MountCalculator.deduplicate_mounts(mounts)
+
+    assert [(m.position.x, m.position.y) for m in unique] == [(16.0, 0.0), (16.0, 71.1)]
+
+
+def test_joint_keys_match_joints():
+    """Tests that calculate_joints builds its Joints from calculate_joint_keys."""
+    panels = [
+        Panel(top_left=Point(round(c * 45.05, 2), round(r * 71.6, 2)))
+        for r in range(3)
+        for c in range(4)
+    ]
+    calculator = JointCalculator(panels)
+
+    keys = calculator.calculate_joint_keys()
+
+    assert [(j.position.x, j.position.y) for j in calculator.calculate_joints()] == [
+        (from_fixed(x), from_fixed(y)) for x, y in keys
+    ]
+    assert len(set(keys)) == len(keys)
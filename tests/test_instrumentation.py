@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.instrumentation import (
+    CalculationMetrics,
+    MetricsCollector,
+    MetricsSink,
+    NullInstrumentation,
+    PrometheusExporter,
+)
+from source.writers.result_writer import JsonResultWriter
+
+PANELS = [
+    Panel(top_left=Point(0, 0)),
+    Panel(top_left=Point(45.05, 0)),
+    Panel(top_left=Point(0, 71.6)),
+    Panel(top_left=Point(45.05, 71.6)),
+]
+
+STAGES = {"rafter_grid", "rows_segments", "validation", "mounts", "joints", "formatting"}
+
+
+def test_metrics_are_not_included_by_default():
+    """Tests that the result keeps its original structure without instrumentation."""
+    result = SolarPanelCalculator(PANELS).calculate()
+
+    assert set(result) == {"mounts", "joints"}
+
+
+def test_include_metrics_adds_timings_and_counters():
+    """Tests stage timings and item counters in the result."""
+    result = SolarPanelCalculator(PANELS, include_metrics=True).calculate()
+    metrics = result.pop("metrics")
+
+    assert result == SolarPanelCalculator(PANELS).calculate()
+    assert set(metrics["timings"]) == STAGES
+    assert all(seconds >= 0 for seconds in metrics["timings"].values())
+
+    counters = metrics["counters"]
+    assert counters["panels"] == 4
+    assert counters["rows"] == 2
+    assert counters["segments"] == 2
+    assert counters["mounts"] == len(result["mounts"])
+    assert counters["joints"] == len(result["joints"])
+    assert counters["candidate_mounts"] >= counters["mounts"]
+    assert counters["candidate_joints"] >= counters["joints"]
+
+
+def test_metrics_sink_receives_every_calculation():
+    """Tests that the sink records metrics of calculate() and write()."""
+    collector = MetricsCollector()
+
+    SolarPanelCalculator(PANELS, metrics_sink=collector).calculate()
+    SolarPanelCalculator(PANELS, metrics_sink=collector).write(
+        JsonResultWriter(io.StringIO())
+    )
+
+    assert len(collector.metrics) == 2
+    assert "writing" in collector.metrics[1].timings
+    assert collector.metrics[1].counters["mounts"] == collector.metrics[0].counters["mounts"]
+
+
+def test_metrics_of_invalid_layout():
+    """Tests that metrics are reported for layouts failing validation."""
+    panels = [Panel(top_left=Point(-1, 0))]
+
+    result = SolarPanelCalculator(panels, include_metrics=True).calculate()
+
+    assert result["status"] == "ERROR"
+    assert result["metrics"]["counters"]["panels"] == 1
+    assert "validation" in result["metrics"]["timings"]
+    assert "mounts" not in result["metrics"]["counters"]
+
+
+def test_null_instrumentation_records_nothing():
+    """Tests that disabled instrumentation ignores stages and counters."""
+    instrumentation = NullInstrumentation()
+
+    with instrumentation.stage("stage"):
+        instrumentation.count("items", 1)
+
+    assert instrumentation.metrics == CalculationMetrics()
+
+
+def test_prometheus_exporter_accumulates_calculations():
+    """Tests the Prometheus text format of accumulated metrics."""
+    exporter = PrometheusExporter()
+
+    for _ in range(2):
+        SolarPanelCalculator(PANELS, metrics_sink=exporter).calculate()
+
+    text = exporter.render()
+
+    assert "solar_panel_calculator_calculations_total 2" in text
+    assert '# TYPE solar_panel_calculator_stage_seconds_total counter' in text
+    assert 'solar_panel_calculator_stage_seconds_total{stage="joints"}' in text
+    assert 'solar_panel_calculator_items_total{item="panels"} 8' in text
+
+
+def test_metrics_sink_without_record_cannot_be_created():
+    class EmptySink(MetricsSink):
+        pass
+
+    with pytest.raises(TypeError):
+        EmptySink()
@@ -85,3 +85,30 @@ def test_full_calculation_with_minimal_data(minimal_panels):
 
     # Checking length
     assert len(joints) >= 5, "Incorrect number of unique joints found"
+
+
+def test_rafter_ranges_are_computed_once_per_panel(minimal_panels, monkeypatch):
+    """Tests that the calculation pipeline looks up each panel's rafters exactly once
+    and produces the same mounts as collecting them panel by panel."""
+    from source.calculators.mount_calculator import MountCalculator
+    from source.formatter import OutputFormatter
+    from source.services.mount_service import MountService
+    from source.services.rafter_service import RafterGrid
+
+    calls = []
+    original = MountService.get_rafter_range
+
+    def counting_get_rafter_range(self, panel):
+        calls.append(panel)
+        return original(self, panel)
+
+    monkeypatch.setattr(MountService, "get_rafter_range", counting_get_rafter_range)
+
+    result = SolarPanelCalculator(minimal_panels).calculate()
+
+    assert len(calls) == len(minimal_panels)
+
+    monkeypatch.undo()
+    rafters = RafterGrid().generate_grid(minimal_panels)
+    expected = MountCalculator(rafters).collect_mounts_for_all_panels(minimal_panels)
+    assert result["mounts"] == OutputFormatter.mounts_to_list(expected)
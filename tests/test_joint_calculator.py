@@ -0,0 +1,90 @@
+from source.calculators.joint_calculator import (
+    JointCalculator,
+    horizontal_joints_in_row,
+    shared_joints_between_rows,
+)
+from source.domain import Panel, Point
+
+
+def create_grid(columns: int, rows: int) -> list:
+    """Helper to create a grid of touching panels (horizontal gap 0.35, vertical gap 0.5)."""
+    return [
+        Panel(top_left=Point(round(c * 45.05, 2), round(r * 71.6, 2)))
+        for r in range(rows)
+        for c in range(columns)
+    ]
+
+
+def test_shared_joints_between_rows():
+    """Tests that every horizontal joint between two touching rows produces one shared joint."""
+    panels = create_grid(columns=3, rows=2)
+    top_row, bottom_row = panels[:3], panels[3:]
+
+    shared = shared_joints_between_rows(top_row, bottom_row)
+
+    # (x, y) in centi-units
+    assert shared == [(4488, 7135), (8992, 7135)]
+
+
+def test_shared_joints_reuse_precomputed_row_joints():
+    """Tests that precomputed row joints give the same shared joints as recomputing them."""
+    panels = create_grid(columns=200, rows=2)
+    calculator = JointCalculator(panels)
+    top_row, bottom_row = panels[:200], panels[200:]
+
+    top_joints = horizontal_joints_in_row(top_row)
+    bottom_joints = horizontal_joints_in_row(bottom_row)
+
+    assert shared_joints_between_rows(
+        top_row, bottom_row, top_joints, bottom_joints
+    ) == shared_joints_between_rows(top_row, bottom_row)
+    # 199 gaps per row: top and bottom joints of both rows plus one shared joint
+    assert len(calculator.calculate_joints()) == 199 * 5
+
+
+def test_rows_with_vertical_gap_have_no_shared_joints():
+    """Tests that rows separated by more than JOINT_GAP_THRESHOLD share no joints."""
+    top_row = [Panel(top_left=Point(0.0, 0.0)), Panel(top_left=Point(45.05, 0.0))]
+    bottom_row = [Panel(top_left=Point(0.0, 73.0)), Panel(top_left=Point(45.05, 73.0))]
+
+    assert shared_joints_between_rows(top_row, bottom_row) == []
+
+
+def test_iter_joints_are_sorted_calculated_joints():
+    """Tests that the merged joints are the calculated joints, sorted by (x, y)."""
+    panels = create_grid(columns=6, rows=4)
+    calculator = JointCalculator(panels)
+
+    joints = calculator.calculate_joints()
+    merged = list(JointCalculator(panels).iter_joints())
+
+    assert merged == sorted(joints, key=lambda j: (j.position.x, j.position.y))
+    assert list(JointCalculator(panels, placement="free").iter_joint_keys()) == [
+        (round(j.position.x * 100), round(j.position.y * 100)) for j in merged
+    ]
+
+
+def test_iter_joint_keys_calculates_rows_when_reached(monkeypatch):
+    """Tests that consuming the first joints calculates only the rows starting left of them."""
+    # every row starts one table further right
+    panels = [
+        Panel(top_left=Point(round(r * 500 + c * 45.05, 2), round(r * 71.6, 2)))
+        for r in range(10)
+        for c in range(4)
+    ]
+    calculated_rows = []
+
+    def counting_horizontal_joints(row):
+        calculated_rows.append(row[0].top)
+        return horizontal_joints_in_row(row)
+
+    monkeypatch.setattr(
+        "source.calculators.joint_calculator.horizontal_joints_in_row",
+        counting_horizontal_joints,
+    )
+    joints = JointCalculator(panels).iter_joint_keys()
+
+    assert next(joints) == (4488, 0)
+    assert calculated_rows == [0.0, 71.6]  # the first row and the row it shares joints with
+
+    assert list(joints) == sorted(JointCalculator(panels).calculate_joint_keys())[1:]
@@ -0,0 +1,86 @@
+from source.calculators.joint_calculator import JointCalculator
+from source.constructors.layout_index import LayoutIndex
+from source.constructors.row_constructor import RowConstructor
+from source.constructors.segment_constructor import SegmentConstructor
+from source.domain import Panel, Point
+
+
+def create_panel(x: float, y: float) -> Panel:
+    """Helper to create a Panel instance with default size."""
+    return Panel(top_left=Point(x, y))
+
+
+PANELS = [
+    create_panel(91.0, 0.0),  # Row 1, Segment 2 (gap 1.25)
+    create_panel(0.0, 71.6),  # Row 2, Segment 3
+    create_panel(45.05, 0.0),  # Row 1, Segment 1
+    create_panel(0.0, 0.0),  # Row 1, Segment 1
+]
+
+
+def test_rows_and_segments_match_constructors():
+    """Tests that the index holds the same rows and segments the constructors build on their own."""
+    index = LayoutIndex(PANELS)
+
+    assert index.rows == RowConstructor(PANELS).group_panels_into_row()
+    assert index.segments == SegmentConstructor(PANELS).divide_rows_into_segments()
+    assert SegmentConstructor(PANELS, index).divide_rows_into_segments() is index.segments
+
+
+def test_panel_membership_and_neighbours():
+    """Tests row/segment membership and in-row adjacency lookups."""
+    index = LayoutIndex(PANELS)
+    right_panel, lower_panel, middle_panel, left_panel = PANELS
+
+    assert index.row_index(left_panel) == 0
+    assert index.row_index(lower_panel) == 1
+    assert index.segment_index(left_panel) == index.segment_index(middle_panel) == 0
+    assert index.segment_index(right_panel) == 1
+    assert index.segment_rows == [0, 0, 1]
+
+    assert index.neighbours(middle_panel) == (left_panel, right_panel)
+    assert index.neighbours(left_panel) == (None, middle_panel)
+    assert index.neighbours(lower_panel) == (None, None)
+
+
+def test_joint_calculator_with_shared_index():
+    """Tests that joints calculated from a shared index are identical to standalone calculation."""
+    index = LayoutIndex(PANELS)
+
+    assert (
+        JointCalculator(PANELS, index).calculate_joints()
+        == JointCalculator(PANELS).calculate_joints()
+    )
+
+
+def group_greedily(panels):
+    """Reference grouping: walk panels sorted by top, start a row when the anchor is too far."""
+    rows = []
+    for panel in sorted(panels, key=lambda p: p.top):
+        if rows and abs(panel.top - rows[-1][0].top) <= 1.0:
+            rows[-1].append(panel)
+        else:
+            rows.append([panel])
+    return [sorted(row, key=lambda p: p.left) for row in rows]
+
+
+def test_rows_and_segments_in_one_pass():
+    """Tests one-pass rows and segments on presorted and shuffled input, tops at the threshold included."""
+    tops = [0.0, 0.5, 1.0, 1.0000000000000002, 2.0, 71.6, 72.6, 72.61, 0.1 + 0.2, 0.3]
+    panels = [
+        create_panel(x, top)
+        for top in tops
+        for x in (0.0, 45.05, 91.0, 136.05, 200.0)
+    ]
+
+    for layout in (panels, list(reversed(panels)), sorted(panels, key=lambda p: (p.top, p.left))):
+        rows, segments, segment_rows = RowConstructor(layout).group_panels_into_rows_and_segments()
+
+        assert [[id(p) for p in row] for row in rows] == [
+            [id(p) for p in row] for row in group_greedily(layout)
+        ]
+        assert segments == SegmentConstructor.split_rows_into_segments(rows)
+        assert all(
+            any(panel is segment[0] for panel in rows[row_index])
+            for row_index, segment in zip(segment_rows, segments)
+        )
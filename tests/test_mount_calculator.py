@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from source.calculators.mount_calculator import MountCalculator, NoRaftersWarning
+from source.domain import Panel, Point
+from source.fixed_point import to_fixed
+from source.services.rafter_service import RafterGrid
+
+
+def test_iter_mounts_matches_collected_mounts():
+    """Tests that the merged row streams give the collected mounts in the same order."""
+    for kind in sorted(LAYOUTS):
+        panels = generate_layout(kind, 200, seed=3)
+        calculator = MountCalculator(RafterGrid().generate_grid(panels))
+
+        assert list(calculator.iter_mounts_for_all_panels(panels)) == (
+            calculator.collect_mounts_for_all_panels(panels)
+        )
+
+
+def test_iter_mount_keys_merges_interleaved_panels():
+    """Tests that panels sharing rafters in one row are merged and deduplicated."""
+    calculator = MountCalculator([0.0, 16.0, 32.0, 48.0, 64.0])
+    a = Panel(top_left=Point(0.0, 0.0))
+    b = Panel(top_left=Point(20.0, 0.5))  # overlaps a, shares the rafter at 32
+    c = Panel(top_left=Point(0.0, 71.1))  # next row, its top edge is the bottom edge of a
+
+    rows = [[(a, [16.0, 32.0]), (b, [32.0, 48.0])], [(c, [16.0, 32.0])]]
+    keys = list(calculator.iter_mount_keys(rows))
+
+    assert keys == sorted(set(keys))
+    assert keys == calculator.collect_mount_keys([pair for row in rows for pair in row])
+    assert (to_fixed(32.0), to_fixed(71.1)) in keys
+
+
+def test_iter_mount_keys_skips_panels_without_rafters():
+    calculator = MountCalculator([16.0])
+    panel = Panel(top_left=Point(0.0, 0.0))
+
+    with pytest.warns(NoRaftersWarning, match="No rafters available"):
+        keys = list(calculator.iter_mount_keys([[(panel, [16.0]), (panel, [])]]))
+
+    assert keys == [(1600, 0), (1600, 7110)]
@@ -75,3 +75,36 @@ def test_segment_mount_aggregation(mount_service):
     actual_mounts_x = mount_service.get_mounts_for_segment(segment)
 
     assert actual_mounts_x == expected_mounts_x
+
+
+def test_segment_mount_aggregation_with_overlapping_panels(mount_service):
+    """Verifies that rafters shared by overlapping panels appear only once in the segment mounts."""
+    segment = [
+        Panel(top_left=Point(0.0, 0.0)),  # Mounts: 16.0, 32.0
+        Panel(top_left=Point(10.0, 0.0)),  # Mounts: 16.0, 32.0, 48.0
+        Panel(top_left=Point(45.05, 0.0)),  # Mounts: 48.0, 64.0, 80.0
+    ]
+
+    expected_mounts_x = [16.0, 32.0, 48.0, 64.0, 80.0]
+    actual_mounts_x = mount_service.get_mounts_for_segment(segment)
+
+    assert actual_mounts_x == expected_mounts_x
+
+
+def test_panel_rafter_range(mount_service):
+    """Verifies that the rafter range is a half-open index range into the sorted rafter positions."""
+    panel = Panel(top_left=Point(0.0, 0.0))
+    start, stop = mount_service.get_rafter_range(panel)
+
+    assert list(mount_service.mounts_x_coordinates[start:stop]) == [16.0, 32.0]
+
+
+def test_custom_edge_clearance(global_rafter_grid):
+    """Tests that the edge clearance passed to the service replaces the default one."""
+    panel = Panel(top_left=Point(14.0, 0.0))
+
+    assert MountService(global_rafter_grid).get_mounts_for_panel(panel) == [16.0, 32.0, 48.0]
+    assert MountService(global_rafter_grid, edge_clearance=3.0).get_mounts_for_panel(panel) == [
+        32.0,
+        48.0,
+    ]
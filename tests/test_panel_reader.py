@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from source.domain import Panel, Point
+from source.readers.panel_reader import (
+    JsonPanelReader,
+    PanelReaderError,
+    iter_panels,
+    read_panel_array,
+)
+
+DOCUMENT = {
+    "site": {"name": "panels [not the array]", "version": 12345},
+    "panels": [
+        {"x": 0, "y": 0},
+        {"x": 45.05, "y": 0},
+        {"x": 0, "y": 71.6, "width": 40.0, "height": 70.0},
+    ],
+    "comment": "ignored",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+def test_reader_handles_any_chunk_boundary(chunk_size):
+    """Tests that panel records are decoded identically whatever the chunk size is."""
+    stream = io.StringIO(json.dumps(DOCUMENT, indent=2))
+
+    records = list(JsonPanelReader(stream, chunk_size=chunk_size))
+
+    assert records == DOCUMENT["panels"]
+
+
+def test_iter_panels_from_json_file(tmp_path):
+    """Tests streaming Panel objects from a JSON document, with optional width and height."""
+    path = tmp_path / "layout.json"
+    path.write_text(json.dumps(DOCUMENT))
+
+    panels = list(iter_panels(str(path)))
+
+    assert panels == [
+        Panel(top_left=Point(0, 0)),
+        Panel(top_left=Point(45.05, 0)),
+        Panel(top_left=Point(0, 71.6), width=40.0, height=70.0),
+    ]
+
+
+def test_read_panel_array_from_jsonl_file(tmp_path):
+    """Tests reading JSON Lines input directly into PanelArray columns."""
+    path = tmp_path / "layout.jsonl"
+    path.write_text('{"x": 0, "y": 0}\n\n{"x": 45.05, "y": 0}\n')
+
+    panel_array = read_panel_array(str(path))
+
+    assert list(panel_array.left) == [0.0, 45.05]
+    assert list(panel_array.top) == [0.0, 0.0]
+
+
+def test_empty_panels_array():
+    """Tests that an empty panels array yields no panels."""
+    assert list(JsonPanelReader(io.StringIO('{"panels": []}'))) == []
+
+
+@pytest.mark.parametrize(
+    "document", ['{"site": 1}', '{"panels": [{"x": 0, "y": 0} {"x": 1, "y": 0}]}', "[]"]
+)
+def test_invalid_documents(document):
+    """Tests that documents without a valid panels array raise PanelReaderError."""
+    with pytest.raises(PanelReaderError):
+        list(JsonPanelReader(io.StringIO(document)))
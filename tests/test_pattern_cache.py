@@ -0,0 +1,117 @@
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.services.pattern_cache import PatternCache
+
+
+def tables(count: int, top: float = 0, pitch: float = 192.0, offset: float = 192.0):
+    """Rows of 4-panel tables; the left cantilever of every table is exactly 16.0."""
+    return [
+        Panel(top_left=Point(offset + t * pitch + i * 45.05, top))
+        for t in range(count)
+        for i in range(4)
+    ]
+
+
+def test_cached_calculation_matches_full_calculation():
+    """Tests that repeated segments are taken from the cache with the same result."""
+    panels = tables(20) + tables(20, top=71.6)
+    cache = PatternCache()
+
+    result = SolarPanelCalculator(panels, pattern_cache=cache).calculate()
+
+    assert result == SolarPanelCalculator(panels).calculate()
+    assert cache.misses == 1
+    assert cache.hits == 39
+    assert len(cache) == 1
+
+
+def test_cache_is_reused_between_translated_layouts():
+    """Tests that a pattern stored for one layout is translated into place in another one."""
+    cache = PatternCache()
+    SolarPanelCalculator(tables(1), pattern_cache=cache).calculate()
+
+    shifted = tables(3, offset=1600.0)
+    result = SolarPanelCalculator(shifted, pattern_cache=cache).calculate()
+
+    assert result == SolarPanelCalculator(shifted).calculate()
+    assert cache.info()["hits"] == 3
+
+
+def test_invalid_segment_is_reported_exactly():
+    """Tests that a segment differing only beyond the cached tolerance is validated in full."""
+    cache = PatternCache()
+    SolarPanelCalculator(tables(1), pattern_cache=cache).calculate()
+
+    # one unit more to the left of the first rafter than the cached table: the cantilever exceeds 16.0
+    panels = tables(1, offset=383.0)
+    result = SolarPanelCalculator(panels, pattern_cache=cache).calculate()
+
+    assert result["status"] == "ERROR"
+    assert result == SolarPanelCalculator(panels).calculate()
+    assert len(cache) == 1
+
+
+def test_tight_bound_is_checked_again_on_hit():
+    """Tests that a panel bound within the guard of a rafter is compared with exact coordinates."""
+    cache = PatternCache(quantum=1e-3, guard=0.01)
+
+    # left + EDGE_CLEARANCE lies exactly on the rafter 208.0
+    panels = [Panel(top_left=Point(206.0, 0))]
+    assert SolarPanelCalculator(panels, pattern_cache=cache).calculate()["mounts"]
+    assert len(cache) == 1
+
+    # the same key, but the rafter 368.0 is just outside of the mountable area
+    panels = [Panel(top_left=Point(366.00001, 0))]
+    result = SolarPanelCalculator(panels, pattern_cache=cache).calculate()
+
+    assert result["status"] == "ERROR"
+    assert result == SolarPanelCalculator(panels).calculate()
+    assert cache.hits == 0
+
+
+def test_segments_at_the_grid_start_are_not_cached():
+    """Tests that segments before the second rafter never use the cache."""
+    cache = PatternCache()
+
+    SolarPanelCalculator(tables(1, offset=0.0), pattern_cache=cache).calculate()
+    SolarPanelCalculator(tables(1, offset=0.0), pattern_cache=cache).calculate()
+
+    assert cache.hits == 0
+    assert len(cache) == 0
+
+
+def test_cache_is_bounded():
+    """Tests that the least recently used pattern is evicted."""
+    cache = PatternCache(maxsize=2)
+
+    for phase in (1.0, 2.0, 3.0):
+        panels = [Panel(top_left=Point(192.0 + phase, 0))]
+        SolarPanelCalculator(panels, pattern_cache=cache).calculate()
+
+    assert len(cache) == 2
+    cache.clear()
+    assert cache.info() == {
+        "hits": 0,
+        "misses": 0,
+        "hit_ratio": 0.0,
+        "size": 0,
+        "maxsize": 2,
+    }
+
+
+def test_cache_for_another_grid_is_rejected():
+    """Tests that the cache must be built for the rafter grid of the calculator."""
+    with pytest.raises(ValueError):
+        SolarPanelCalculator(tables(1), pattern_cache=PatternCache(spacing=24.0))
+
+
+def test_cache_counters_in_metrics():
+    """Tests that hits and misses of one calculation are reported in metrics."""
+    result = SolarPanelCalculator(
+        tables(5), pattern_cache=PatternCache(), include_metrics=True
+    ).calculate()
+
+    assert result["metrics"]["counters"]["pattern_cache_hits"] == 4
+    assert result["metrics"]["counters"]["pattern_cache_misses"] == 1
@@ -43,3 +43,37 @@ def test_generate_grid_empty_input(rafter_generator):
     actual_rafters = rafter_generator.generate_grid(panels)
 
     assert expected_rafters == actual_rafters
+
+
+def test_generate_grid_far_from_origin(rafter_generator):
+    """Tests that a layout far from the origin starts at the last rafter before the leftmost panel edge."""
+    panels = [Panel(top_left=Point(1_000_005.0, 0.0))]
+    actual_rafters = rafter_generator.generate_grid(panels)
+
+    assert actual_rafters == [1_000_000.0, 1_000_016.0, 1_000_032.0, 1_000_048.0]
+    assert actual_rafters[0] == 1_000_000.0
+    assert actual_rafters[-1] == 1_000_048.0
+
+
+def test_generate_grid_has_no_float_drift():
+    """Tests that rafter positions are computed as first_rafter + i * spacing rather than accumulated."""
+    grid = RafterGrid(first_rafter=0.0, spacing=0.1).generate_grid(
+        [Panel(top_left=Point(0.0, 0.0), width=100.0, height=10.0)]
+    )
+
+    assert len(grid) == 1001
+    assert grid[1000] == 1000 * 0.1
+    assert grid[-1] <= 100.0
+
+
+def test_rafters_in_interval(rafter_generator):
+    """Tests the interval query: rafters lying within [min_x, max_x] inclusive."""
+    grid = rafter_generator.generate_grid(
+        [Panel(top_left=Point(0.0, 0.0)), Panel(top_left=Point(100.0, 0.0))]
+    )
+
+    assert grid.between(2.0, 42.7) == [16.0, 32.0]
+    assert grid.between(16.0, 32.0) == [16.0, 32.0]
+    assert grid.between(16.5, 31.5) == []
+    assert grid.between(-100.0, 1.0) == [0.0]
+    assert grid.between(140.0, 500.0) == [144.0]
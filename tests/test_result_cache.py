@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.services.result_cache import ResultCache
+
+
+def translate(panels, dx: float, dy: float):
+    return [
+        Panel(top_left=Point(p.left + dx, p.top + dy), width=p.width, height=p.height)
+        for p in panels
+    ]
+
+
+def test_same_layout_hits_in_any_order():
+    cache = ResultCache()
+    panels = generate_layout("grid", 40, seed=1)
+
+    first = SolarPanelCalculator(panels, result_cache=cache).calculate()
+    second = SolarPanelCalculator(list(reversed(panels)), result_cache=cache).calculate()
+
+    assert second == first
+    assert cache.info()["memory_hits"] == 1
+    assert cache.info()["misses"] == 1
+    assert cache.info()["hit_ratio"] == 0.5
+
+
+@pytest.mark.parametrize("kind", sorted(LAYOUTS))
+def test_translated_layout_hits_with_shifted_result(kind):
+    """Layouts translated by whole rafter spacings are cache hits equal to a fresh calculation."""
+    cache = ResultCache()
+    panels = generate_layout(kind, 120, seed=2)
+    SolarPanelCalculator(panels, result_cache=cache).calculate()
+
+    for dx, dy in [(16.0, 0.0), (320.0, 12.34), (1600.0, -40.5)]:
+        translated = translate(panels, dx, dy)
+        assert SolarPanelCalculator(translated, result_cache=cache).calculate() == (
+            SolarPanelCalculator(translated).calculate()
+        )
+
+    assert cache.info()["translated_hits"] == 3
+    assert cache.info()["misses"] == 1
+
+
+def test_translation_off_the_rafter_phase_misses():
+    cache = ResultCache()
+    panels = generate_layout("grid", 40, seed=1)
+    SolarPanelCalculator(panels, result_cache=cache).calculate()
+
+    SolarPanelCalculator(translate(panels, 8.0, 0.0), result_cache=cache).calculate()
+    cache.layout_key(translate(panels, 0.001, 0.0))
+
+    assert cache.info()["misses"] == 2
+    assert cache.layout_key(panels)[0] != cache.layout_key(translate(panels, 8.0, 0.0))[0]
+    # off the 0.01 grid layouts are cached only as they are
+    assert cache.layout_key(translate(panels, 16.001, 0.0))[1] == (0.0, 0.0)
+
+
+def test_error_results_hit_only_at_the_same_origin():
+    cache = ResultCache()
+    panels = [Panel(top_left=Point(20.0, 0.0))]  # cantilever violated on the left
+
+    error = SolarPanelCalculator(panels, result_cache=cache).calculate()
+    assert error["status"] == "ERROR"
+    assert SolarPanelCalculator(panels, result_cache=cache).calculate() == error
+
+    translated = translate(panels, 16.0, 0.0)
+    assert SolarPanelCalculator(translated, result_cache=cache).calculate() == (
+        SolarPanelCalculator(translated).calculate()
+    )
+    assert cache.info()["memory_hits"] == 1
+    assert cache.info()["misses"] == 2
+
+
+def test_gap_at_the_threshold_is_not_translated():
+    """A gap of exactly 1.00 splits segments depending on the float error at the origin."""
+
+    def row(x0: float, y: float):
+        offsets = [(0.0, 44.7), (45.7, 44.7), (91.39, 44.7), (137.09, 30.0), (182.79, 44.7)]
+        return [Panel(top_left=Point(round(x0 + dx, 2), y), width=width) for dx, width in offsets]
+
+    cache = ResultCache()
+    assert "mounts" in SolarPanelCalculator(row(81.12, 2474.47), result_cache=cache).calculate()
+
+    # translated by 284 rafter spacings, the gap to the second panel is no longer continuous
+    translated = row(81.12 + 4544, 3134.9)
+    assert SolarPanelCalculator(translated, result_cache=cache).calculate() == (
+        SolarPanelCalculator(translated).calculate()
+    )
+    assert SolarPanelCalculator(translated).calculate()["status"] == "ERROR"
+    assert cache.info()["translated_hits"] == 0
+
+
+def test_returned_results_are_copies():
+    cache = ResultCache()
+    panels = generate_layout("grid", 8, seed=1)
+
+    result = SolarPanelCalculator(panels, result_cache=cache, include_metrics=True).calculate()
+    result["mounts"].clear()
+
+    assert SolarPanelCalculator(panels, result_cache=cache).calculate() == (
+        SolarPanelCalculator(panels).calculate()
+    )
+
+
+def test_memory_tier_is_bounded():
+    cache = ResultCache(maxsize=2)
+    layouts = [generate_layout("islands", 10, seed=seed) for seed in range(3)]
+
+    for panels in layouts:
+        SolarPanelCalculator(panels, result_cache=cache).calculate()
+    SolarPanelCalculator(layouts[0], result_cache=cache).calculate()
+
+    assert len(cache) == 2
+    assert cache.info()["misses"] == 4
+
+
+def test_disk_tier_survives_restart_and_is_bounded(tmp_path):
+    directory = str(tmp_path / "cache")
+    layouts = [generate_layout("gappy", 30, seed=seed) for seed in range(6)]
+
+    cache = ResultCache(maxsize=1, directory=directory)
+    for panels in layouts:
+        SolarPanelCalculator(panels, result_cache=cache).calculate()
+    assert cache.info()["disk_files"] == 6
+
+    restarted = ResultCache(maxsize=1, directory=directory)
+    assert SolarPanelCalculator(layouts[0], result_cache=restarted).calculate() == (
+        SolarPanelCalculator(layouts[0]).calculate()
+    )
+    assert restarted.info()["disk_hits"] == 1
+
+    file_size = max(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    bounded = ResultCache(directory=str(tmp_path / "bounded"), max_disk_bytes=2 * file_size)
+    for panels in layouts:
+        SolarPanelCalculator(panels, result_cache=bounded).calculate()
+
+    assert bounded.disk_bytes <= 2 * file_size
+    assert len(os.listdir(tmp_path / "bounded")) == bounded.info()["disk_files"] <= 2
+
+    bounded.clear()
+    assert os.listdir(tmp_path / "bounded") == []
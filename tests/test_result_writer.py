@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.writers.result_writer import (
+    BinaryResultWriter,
+    CsvResultWriter,
+    JsonlResultWriter,
+    JsonResultWriter,
+    ResultWriter,
+    get_writer,
+)
+
+PANELS = [
+    Panel(top_left=Point(0, 0)),
+    Panel(top_left=Point(45.05, 0)),
+    Panel(top_left=Point(0, 71.6)),
+    Panel(top_left=Point(45.05, 71.6)),
+]
+
+
+def test_json_writer_matches_calculate():
+    """Tests that streamed JSON is valid and equal to the calculate() result."""
+    stream = io.StringIO()
+
+    assert SolarPanelCalculator(PANELS).write(JsonResultWriter(stream, batch_size=3))
+    assert json.loads(stream.getvalue()) == SolarPanelCalculator(PANELS).calculate()
+
+
+def test_jsonl_writer():
+    """Tests that JSON Lines output has one typed record per mount and joint."""
+    stream = io.StringIO()
+    SolarPanelCalculator(PANELS).write(JsonlResultWriter(stream))
+    expected = SolarPanelCalculator(PANELS).calculate()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert [{"x": r["x"], "y": r["y"]} for r in records if r["type"] == "mount"] == expected["mounts"]
+    assert [{"x": r["x"], "y": r["y"]} for r in records if r["type"] == "joint"] == expected["joints"]
+
+
+def test_csv_writer():
+    """Tests CSV output with a type,x,y header."""
+    stream = io.StringIO()
+    SolarPanelCalculator(PANELS).write(CsvResultWriter(stream))
+    expected = SolarPanelCalculator(PANELS).calculate()
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+
+    assert len(rows) == len(expected["mounts"]) + len(expected["joints"])
+    assert rows[0] == {"type": "mount", "x": "16.0", "y": "0"}
+
+
+def test_error_is_written_as_error_structure():
+    """Tests that a validation error is written instead of the result."""
+    panels = [Panel(top_left=Point(15.5, 0.0))]
+    stream = io.StringIO()
+
+    assert not SolarPanelCalculator(panels).write(JsonResultWriter(stream))
+    assert json.loads(stream.getvalue()) == SolarPanelCalculator(panels).calculate()
+
+
+@pytest.mark.parametrize("writer_class", [JsonResultWriter, JsonlResultWriter])
+def test_json_writers_reject_non_finite_coordinates(writer_class):
+    """Tests that NaN and infinity are rejected instead of written as invalid JSON tokens."""
+    for value in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            writer_class(io.StringIO()).write_result([(16.0, value)], [])
+
+
+def test_binary_writer_streams_blocks():
+    """Tests that the binary writer writes blocks of batch_size points, with the counts in the trailer."""
+    chunks = []
+
+    class Stream(io.BytesIO):
+        def write(self, data):
+            chunks.append(len(data))
+            return super().write(data)
+
+    stream = Stream()
+    mounts = ((float(x), 0.0) for x in range(10))
+    BinaryResultWriter(stream, batch_size=4).write_result(mounts, iter([(1.0, 2.0)]))
+
+    assert chunks == [8, 64, 64, 32, 16, 16]
+    assert BinaryResultWriter.TRAILER.unpack(stream.getvalue()[-16:]) == (10, 1)
+
+
+def test_unknown_format():
+    """Tests that an unknown output format is rejected."""
+    with pytest.raises(ValueError):
+        get_writer("xml", io.StringIO())
+
+
+def test_writer_without_write_error_cannot_be_created():
+    """Tests that a writer missing an override fails on construction, not in the middle of a stream."""
+
+    class MountsOnlyWriter(ResultWriter):
+        def write_result(self, mounts, joints):
+            pass
+
+    with pytest.raises(TypeError):
+        MountsOnlyWriter(io.StringIO())
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from source.arrays import PanelArray
+from source.calculators.row_parallel import _row_chunks
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.services.pattern_cache import PatternCache
+
+
+@pytest.mark.parametrize("kind", sorted(LAYOUTS))
+def test_parallel_result_matches_sequential(kind):
+    """Tests that chunks of rows calculated by thread workers give the sequential result."""
+    panels = generate_layout(kind, 300, seed=3)
+    expected = SolarPanelCalculator(panels).calculate()
+
+    for workers in (2, 3):
+        result = SolarPanelCalculator(panels, workers=workers, pool="thread").calculate()
+        assert result == expected
+
+
+def test_process_workers_match_sequential():
+    panels = generate_layout("islands", 200, seed=4)
+
+    assert SolarPanelCalculator(panels, workers=2).calculate() == (
+        SolarPanelCalculator(panels).calculate()
+    )
+
+
+def test_process_workers_keep_int_coordinates():
+    """Tests that int coordinates sent to worker processes as float columns are output as ints."""
+    panels = [
+        Panel(top_left=Point(c * 45 if c % 2 else c * 45.0, r * 72), width=45, height=72)
+        for r in range(6)
+        for c in range(4)
+    ]
+    expected = SolarPanelCalculator(panels).calculate()
+
+    result = SolarPanelCalculator(panels, workers=2).calculate()
+
+    assert "mounts" in expected
+    assert json.dumps(result) == json.dumps(expected)
+
+
+def test_panel_array_workers_record_transfer():
+    panels = generate_layout("grid", 200, seed=5)
+    expected = SolarPanelCalculator(panels).calculate()
+
+    result = SolarPanelCalculator(
+        PanelArray.from_panels(panels), workers=2, include_metrics=True
+    ).calculate()
+    metrics = result.pop("metrics")
+
+    assert result == expected
+    assert metrics["timings"]["transfer"] > 0
+    assert metrics["counters"]["transfer_bytes"] > 0
+    assert metrics["counters"]["row_chunks"] > 1
+
+
+def test_parallel_error_is_the_first_violation():
+    """Tests that the violation of the first invalid chunk is reported, as sequentially."""
+    panels = [
+        Panel(top_left=Point(round(c * 45.05, 2), round(r * 71.6, 2)))
+        for r in range(8)
+        for c in range(3)
+    ]
+    panels += [Panel(top_left=Point(-1, 8 * 71.6)), Panel(top_left=Point(-1, 10 * 71.6))]
+    expected = SolarPanelCalculator(panels).calculate()
+
+    result = SolarPanelCalculator(panels, workers=4, pool="thread").calculate()
+
+    assert result["status"] == "ERROR"
+    assert result == expected
+
+
+def test_row_chunks_balance_panels():
+    # rows of 5, 1, 1, 1, 1, 1, 5 and 5 panels
+    bounds = [0, 5, 6, 7, 8, 9, 10, 15, 20]
+
+    assert _row_chunks(bounds, 3) == [(0, 3), (3, 7), (7, 8)]
+    assert _row_chunks(bounds[:2], 4) == [(0, 1)]
+
+
+def test_invalid_parallel_configuration():
+    panels = [Panel(top_left=Point(0, 0))]
+
+    with pytest.raises(ValueError):
+        SolarPanelCalculator(panels, pool="fork")
+    with pytest.raises(ValueError):
+        SolarPanelCalculator(panels, placement="free", workers=2)
+    with pytest.raises(ValueError):
+        SolarPanelCalculator(panels, pattern_cache=PatternCache(), workers=2)
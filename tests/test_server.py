@@ -0,0 +1,143 @@
+import asyncio
+import json
+from typing import Dict, Tuple
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.server import CalculationService, HttpServer
+
+VALID_PANELS = [{"x": 0, "y": 0}, {"x": 45.05, "y": 0}]
+
+
+async def request(
+    port: int, method: str, path: str, body: bytes = b""
+) -> Tuple[int, Dict[str, str], bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(status_line.split(" ")[1]), headers, payload
+
+
+def run_with_server(scenario, **service_options):
+    async def main():
+        server = HttpServer(CalculationService(**service_options))
+        await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_calculate_endpoint():
+    """Tests that a posted layout gets the calculation result and latency headers."""
+
+    async def scenario(port):
+        body = json.dumps({"id": "roof-1", "panels": VALID_PANELS}).encode()
+        return await request(port, "POST", "/calculate", body)
+
+    status, headers, payload = run_with_server(scenario, workers=0)
+
+    expected = SolarPanelCalculator(
+        [Panel(top_left=Point(p["x"], p["y"])) for p in VALID_PANELS]
+    ).calculate()
+    assert status == 200
+    assert json.loads(payload) == {"id": "roof-1", "result": expected}
+    assert float(headers["x-latency-ms"]) >= float(headers["x-queue-ms"]) >= 0
+    assert headers["x-batch-size"] == "1"
+
+
+def test_errors_and_routes():
+    """Tests invalid records, unknown paths, wrong methods, /health and /stats."""
+
+    async def scenario(port):
+        return [
+            await request(port, "POST", "/calculate", b"{not json"),
+            await request(port, "GET", "/calculate"),
+            await request(port, "GET", "/unknown"),
+            await request(port, "GET", "/health"),
+            await request(port, "GET", "/stats"),
+        ]
+
+    invalid, wrong_method, unknown, health, stats = run_with_server(scenario, workers=0)
+
+    assert invalid[0] == 400
+    assert json.loads(invalid[2])["result"]["message"] == "Invalid layout record."
+    assert wrong_method[0] == 405
+    assert unknown[0] == 404
+    assert health[0] == 200
+    assert json.loads(stats[2])["requests"] == 1
+
+
+def test_concurrent_requests_are_batched():
+    """Tests that concurrent requests are calculated in fewer worker dispatches."""
+
+    async def scenario(port):
+        body = json.dumps({"panels": VALID_PANELS}).encode()
+        responses = await asyncio.gather(
+            *(request(port, "POST", "/calculate", body) for _ in range(20))
+        )
+        return responses, json.loads((await request(port, "GET", "/stats"))[2])
+
+    responses, stats = run_with_server(
+        scenario, workers=0, max_batch_size=8, max_batch_delay=0.05
+    )
+
+    assert all(status == 200 for status, _, _ in responses)
+    assert stats["requests"] == 20
+    assert stats["batches"] < 20
+    assert max(int(headers["x-batch-size"]) for _, headers, _ in responses) > 1
+    assert stats["latency_ms"]["p50"] is not None
+
+
+def test_full_queue_rejects_with_503():
+    """Tests back-pressure: requests beyond the queue bound are rejected, the rest answered."""
+
+    async def scenario(port):
+        body = json.dumps({"panels": VALID_PANELS}).encode()
+        return await asyncio.gather(
+            *(request(port, "POST", "/calculate", body) for _ in range(20))
+        )
+
+    responses = run_with_server(scenario, workers=0, max_batch_size=1, max_queue=1)
+    statuses = [status for status, _, _ in responses]
+
+    assert 503 in statuses
+    assert 200 in statuses
+    assert all(
+        headers["retry-after"] == "1" for status, headers, _ in responses if status == 503
+    )
+
+
+def test_failed_executor_answers_500(monkeypatch):
+    """Tests that a failure of the calculation workers is answered instead of dropping the connection."""
+
+    def broken(bodies, backend):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr("source.server.calculate_requests", broken)
+
+    async def scenario(port):
+        body = json.dumps({"panels": VALID_PANELS}).encode()
+        return await request(port, "POST", "/calculate", body)
+
+    status, _, payload = run_with_server(scenario, workers=0)
+
+    assert status == 500
+    assert json.loads(payload) == {
+        "status": "ERROR",
+        "message": "Calculation failed: RuntimeError.",
+    }
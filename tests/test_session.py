@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.session import LayoutSession
+
+
+def table(left: float, top: float, count: int = 4):
+    """Row of touching panels, valid for the cantilever and span limits."""
+    return [Panel(top_left=Point(left + i * 45.05, top)) for i in range(count)]
+
+
+def assert_same_as_calculate(session: LayoutSession):
+    assert session.result() == SolarPanelCalculator(session.panels).calculate()
+
+
+def test_session_from_panels_matches_calculate():
+    """Tests that a session built from a layout gives the calculate() result."""
+    panels = table(0, 0) + table(192.0, 0) + table(0, 71.6) + table(0, 200)
+
+    session = LayoutSession(panels)
+
+    assert session.panels == panels
+    assert_same_as_calculate(session)
+
+
+def test_empty_session():
+    """Tests the result of a session without panels."""
+    session = LayoutSession()
+
+    assert len(session) == 0
+    assert session.result() == {"mounts": [], "joints": []}
+
+
+def test_add_panel_creates_joints_and_mounts():
+    """Tests that adding panels updates mounts and joints."""
+    session = LayoutSession(table(0, 0, 2))
+
+    panel_id = session.add_panel(Panel(top_left=Point(0, 71.6)))
+    session.add_panel(Panel(top_left=Point(45.05, 71.6)))
+
+    assert session.panel(panel_id) == Panel(top_left=Point(0, 71.6))
+    assert {"x": 44.88, "y": 71.35} in session.result()["joints"]
+    assert_same_as_calculate(session)
+
+
+def test_remove_panel_releases_shared_mounts():
+    """Tests that mount points shared by panels stay until the last panel is removed."""
+    upper, lower = Panel(top_left=Point(0, 0)), Panel(top_left=Point(0, 71.1))
+    session = LayoutSession([upper, lower])
+
+    shared_mount = {"x": 16.0, "y": 71.1}
+    assert shared_mount in session.result()["mounts"]
+
+    assert session.remove_panel(0) == upper
+    assert shared_mount in session.result()["mounts"]
+
+    session.remove_panel(1)
+    assert session.result() == {"mounts": [], "joints": []}
+
+
+def test_move_panel_keeps_its_place_in_layout():
+    """Tests that a moved panel keeps its size and place in the panels order."""
+    session = LayoutSession(table(0, 0, 3))
+
+    moved = session.move_panel(1, Point(45.05, 300))
+
+    assert session.panels[1] is moved
+    assert moved.width == 44.7
+    assert_same_as_calculate(session)
+
+
+def test_move_panel_reports_validation_error():
+    """Tests that the session reports the same error as calculate() after an invalid edit."""
+    session = LayoutSession(table(0, 0))
+
+    session.move_panel(0, Point(-1, 0))
+
+    assert session.result()["status"] == "ERROR"
+    assert_same_as_calculate(session)
+
+
+def test_unknown_panel_id():
+    """Tests that removing or moving an unknown panel raises KeyError."""
+    session = LayoutSession(table(0, 0, 1))
+    session.remove_panel(0)
+
+    with pytest.raises(KeyError):
+        session.remove_panel(0)
+    with pytest.raises(KeyError):
+        session.move_panel(5, Point(0, 0))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_match_calculate(seed):
+    """Tests that the session equals calculate() after every edit of a random editing sequence."""
+    rnd = random.Random(seed)
+    session = LayoutSession()
+    panel_ids = []
+
+    def random_point():
+        # rows closer than JOINT_GAP_THRESHOLD to each other regroup their neighbours
+        return Point(
+            rnd.randrange(4) * 192.0 + rnd.randrange(4) * 45.05,
+            rnd.randrange(4) * 71.6 + rnd.choice([0, 0, 0.4, 0.8, 1.0, -0.5]),
+        )
+
+    for _ in range(40):
+        action = rnd.random()
+        if action < 0.6 or not panel_ids:
+            panel_ids.append(session.add_panel(Panel(top_left=random_point())))
+        elif action < 0.75:
+            session.remove_panel(panel_ids.pop(rnd.randrange(len(panel_ids))))
+        else:
+            session.move_panel(rnd.choice(panel_ids), random_point())
+
+        assert_same_as_calculate(session)
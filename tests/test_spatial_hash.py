@@ -0,0 +1,112 @@
+import pytest
+
+from benchmarks.layouts import LAYOUTS, generate_layout
+from source.calculators.joint_calculator import JointCalculator
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.constructors.segment_constructor import SegmentConstructor
+from source.constructors.spatial_hash import SpatialHash
+from source.domain import Panel, Point
+
+
+def create_panel(x: float, y: float, width: float = 44.7, height: float = 71.1) -> Panel:
+    return Panel(top_left=Point(x, y), width=width, height=height)
+
+
+def joint_coords(joints):
+    return [(joint.position.x, joint.position.y) for joint in joints]
+
+
+def test_query_returns_intersecting_panels():
+    panels = [create_panel(0.0, 0.0), create_panel(500.0, 0.0), create_panel(0.0, 500.0)]
+    spatial_hash = SpatialHash(panels)
+
+    assert spatial_hash.query(40.0, 10.0, 60.0, 20.0) == [0]
+    assert spatial_hash.query(-100.0, -100.0, 1000.0, 1000.0) == [0, 1, 2]
+    assert spatial_hash.query(100.0, 100.0, 200.0, 200.0) == []
+
+
+def test_right_neighbours_and_touching():
+    panels = [
+        create_panel(0.0, 0.0),
+        create_panel(45.05, 0.0),  # gap 0.35
+        create_panel(44.0, 71.5),  # 0.4 below the first panel, not beside it
+        create_panel(91.0, 0.0),  # gap 1.25 to the second panel
+        create_panel(-10.0, -72.5),  # 1.4 above the first panel
+    ]
+    spatial_hash = SpatialHash(panels)
+
+    assert spatial_hash.right_neighbours(0) == [1]
+    assert spatial_hash.right_neighbours(1) == []
+    assert spatial_hash.right_neighbours(1, threshold=1.5) == [3]
+    assert spatial_hash.touching(0) == [1, 2]
+
+
+def test_large_panels_span_several_cells():
+    panels = [create_panel(0.0, 0.0, width=300.0), create_panel(300.5, 10.0)]
+    spatial_hash = SpatialHash(panels)
+
+    assert spatial_hash.right_neighbours(0) == [1]
+    assert spatial_hash.query(150.0, 0.0, 151.0, 1.0) == [0]
+
+
+def test_invalid_cell_size_and_placement():
+    with pytest.raises(ValueError):
+        SpatialHash([], cell_width=0.0)
+    with pytest.raises(ValueError):
+        SegmentConstructor([], placement="grid")
+    with pytest.raises(ValueError):
+        JointCalculator([], placement="grid")
+    with pytest.raises(ValueError):
+        SolarPanelCalculator([], backend="numpy", placement="free")
+
+
+def test_free_segments_follow_stepped_rows():
+    """Every panel is 0.8 lower than the previous one: rows split at the third panel,
+    while the panels still hang on the same rails pairwise."""
+    panels = [create_panel(i * 45.05, i * 0.8) for i in range(4)]
+
+    rows_segments = SegmentConstructor(panels).divide_rows_into_segments()
+    free_segments = SegmentConstructor(panels, placement="free").divide_rows_into_segments()
+
+    assert [len(segment) for segment in rows_segments] == [2, 2]
+    assert free_segments == [panels]
+
+
+def test_free_joints_of_staggered_panels():
+    """The right panel is shifted down by half a panel: the common edge is from 35.0 to 71.1."""
+    panels = [create_panel(0.0, 0.0), create_panel(45.05, 35.0)]
+
+    assert JointCalculator(panels).calculate_joints() == []
+    assert joint_coords(JointCalculator(panels, placement="free").calculate_joints()) == [
+        (44.88, 35.0),
+        (44.88, 71.1),
+    ]
+    assert SegmentConstructor(panels, placement="free").divide_rows_into_segments() == [
+        [panels[0]],
+        [panels[1]],
+    ]
+
+
+def test_free_shared_joint_of_four_panels():
+    panels = [
+        create_panel(0.0, 0.0),
+        create_panel(45.05, 0.0),
+        create_panel(0.0, 71.6),
+        create_panel(45.05, 71.6),
+    ]
+
+    assert joint_coords(
+        JointCalculator(panels, placement="free").calculate_joints()
+    ) == joint_coords(JointCalculator(panels).calculate_joints())
+
+
+@pytest.mark.parametrize("kind", sorted(LAYOUTS))
+def test_free_placement_matches_rows_on_row_layouts(kind):
+    panels = generate_layout(kind, 300, seed=1)
+
+    assert SolarPanelCalculator(panels, placement="free").calculate() == (
+        SolarPanelCalculator(panels).calculate()
+    )
+    assert SolarPanelCalculator(panels, placement="free").check().to_dict() == (
+        SolarPanelCalculator(panels).check().to_dict()
+    )
@@ -0,0 +1,117 @@
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.calculators.sweep import (
+    ParameterSweep,
+    SweepCandidate,
+    candidate_grid,
+)
+from source.domain import Panel, Point
+
+
+def tables(count: int, top: float = 0):
+    """Row of 4-panel tables placed every 192.0 units."""
+    return [
+        Panel(top_left=Point(t * 192.0 + i * 45.05, top))
+        for t in range(count)
+        for i in range(4)
+    ]
+
+
+PANELS = tables(3) + tables(3, top=71.6)
+
+
+def test_default_candidate_matches_calculate():
+    """Tests that the default parameters give the calculate() mounts and validity."""
+    sweep = ParameterSweep(PANELS)
+    expected = SolarPanelCalculator(PANELS).calculate()
+
+    result = sweep.evaluate(SweepCandidate())
+
+    assert result.feasible
+    assert result.mounts == len(expected["mounts"])
+    assert sweep.result(SweepCandidate()) == expected
+
+
+def test_candidate_grid():
+    """Tests that the grid contains every combination of values."""
+    candidates = candidate_grid([0.0, 8.0], [16.0, 24.0], [2.0, 3.0])
+
+    assert len(candidates) == 8
+    assert candidates[0] == SweepCandidate(0.0, 16.0, 2.0)
+    assert candidates[-1] == SweepCandidate(8.0, 24.0, 3.0)
+
+
+def test_invalid_spacing():
+    """Tests that the rafter spacing must be positive."""
+    with pytest.raises(ValueError):
+        SweepCandidate(spacing=0)
+
+
+def test_infeasible_candidate_reports_calculate_error():
+    """Tests that an invalid candidate reports the same message as the full calculation."""
+    sweep = ParameterSweep(PANELS)
+    candidate = SweepCandidate(cantilever_limit=10.0)
+
+    result = sweep.evaluate(candidate)
+
+    assert not result.feasible
+    assert result.message == sweep.result(candidate)["message"]
+    assert "> 10.0" in result.message
+
+
+def test_error_details_report_candidate_limits():
+    """Tests that the error details name the limits of the candidate, not the default ones."""
+    sweep = ParameterSweep(PANELS)
+
+    cantilever_error = sweep.result(SweepCandidate(cantilever_limit=10.0))
+    span_error = sweep.result(
+        SweepCandidate(spacing=24.0, cantilever_limit=30.0, span_limit=20.0)
+    )
+
+    assert cantilever_error["details"].endswith("exceeds 10.0 units.")
+    assert span_error["message"].startswith("Span Limit violated")
+    assert span_error["details"].endswith("exceeds 20.0 units.")
+
+
+def test_mount_counts_match_full_calculation():
+    """Tests mount counts of shifted and wider rafter grids against the full calculation."""
+    sweep = ParameterSweep(PANELS)
+
+    for result in sweep.run(candidate_grid([0.0, 5.0, 11.5], [16.0, 24.0], [2.0, 6.0])):
+        full_result = sweep.result(result.candidate)
+        if result.feasible:
+            assert result.mounts == len(full_result["mounts"])
+        else:
+            assert result.message == full_result["message"]
+
+
+def test_best_candidate():
+    """Tests that the feasible candidate with the fewest mounts is chosen."""
+    sweep = ParameterSweep(PANELS)
+    results = sweep.run(candidate_grid([0.0, 4.0, 8.0, 12.0], [16.0, 24.0]))
+
+    best = ParameterSweep.best(results)
+
+    assert best.feasible
+    assert best.mounts == min(result.mounts for result in results if result.feasible)
+    assert ParameterSweep.best([]) is None
+
+
+def test_joints_are_calculated_once():
+    """Tests that joints do not depend on the candidate."""
+    sweep = ParameterSweep(PANELS)
+
+    assert sweep.joints is sweep.joints
+    assert (
+        sweep.result(SweepCandidate(first_rafter=8.0))["joints"]
+        == SolarPanelCalculator(PANELS).calculate()["joints"]
+    )
+
+
+def test_parallel_run_matches_sequential():
+    """Tests that candidates evaluated on a process pool are returned in order."""
+    sweep = ParameterSweep(PANELS)
+    candidates = candidate_grid([0.0, 2.0, 4.0, 6.0], [16.0, 20.0])
+
+    assert sweep.run(candidates, workers=2, chunk_size=3) == sweep.run(candidates)
@@ -0,0 +1,117 @@
+import pytest
+
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+
+pytest.importorskip("numpy")
+
+from source.calculators.vectorized_calculator import VectorizedCalculator  # noqa: E402
+
+
+def create_grid(columns: int, rows: int, x0: float = 0.0, y0: float = 0.0) -> list:
+    """Helper to create a grid of touching panels (horizontal gap 0.35, vertical gap 0.5)."""
+    return [
+        Panel(top_left=Point(round(x0 + c * 45.05, 2), round(y0 + r * 71.6, 2)))
+        for r in range(rows)
+        for c in range(columns)
+    ]
+
+
+@pytest.mark.parametrize(
+    "panels",
+    [
+        create_grid(3, 2),
+        create_grid(12, 5, x0=1600.0, y0=500.5),
+        create_grid(4, 3)[::-1],  # unsorted input
+        create_grid(4, 1) + [Panel(top_left=Point(304.0, 0.3))],  # second segment in a row
+    ],
+)
+def test_numpy_backend_matches_python_backend(panels):
+    """Tests that the vectorized backend returns exactly the per-object result."""
+    expected = SolarPanelCalculator(panels).calculate()
+    actual = SolarPanelCalculator(panels, backend="numpy").calculate()
+
+    assert "mounts" in expected
+    assert actual == expected
+
+
+def test_numpy_backend_reports_same_validation_error():
+    """Tests that validation errors carry the same message in both backends."""
+    panels = [Panel(top_left=Point(15.5, 0.0))]  # left cantilever: 32.0 - 15.5 > 16.0
+
+    expected = SolarPanelCalculator(panels).calculate()
+    actual = SolarPanelCalculator(panels, backend="numpy").calculate()
+
+    assert expected["status"] == "ERROR"
+    assert actual == expected
+
+
+def test_group_rows_from_columns():
+    """Tests row grouping of column input: rows ordered by Y, panels of each row ordered by X."""
+    calculator = VectorizedCalculator(
+        left=[90.1, 0.0, 45.05, 0.0],
+        top=[0.3, 71.6, 0.0, 0.0],
+        width=[44.7] * 4,
+        height=[71.1] * 4,
+    )
+
+    order, row_ids = calculator.group_rows()
+
+    assert order.tolist() == [3, 2, 0, 1]
+    assert row_ids.tolist() == [0, 0, 0, 1]
+
+
+def test_unknown_backend():
+    """Tests that an unknown backend name is rejected."""
+    with pytest.raises(ValueError):
+        SolarPanelCalculator([], backend="fortran")
+
+
+def test_numpy_backend_with_panel_array():
+    """Tests that the vectorized backend reads PanelArray columns directly."""
+    from source.arrays import PanelArray
+
+    panels = create_grid(6, 3)
+
+    assert (
+        SolarPanelCalculator(PanelArray.from_panels(panels), backend="numpy").calculate()
+        == SolarPanelCalculator(panels).calculate()
+    )
+
+
+def test_numpy_backend_streams_result():
+    """Tests that the vectorized backend writes the same JSON as it returns."""
+    import io
+    import json
+
+    from source.writers.result_writer import JsonResultWriter
+
+    panels = create_grid(6, 3)
+    stream = io.StringIO()
+
+    SolarPanelCalculator(panels, backend="numpy").write(JsonResultWriter(stream))
+
+    assert json.loads(stream.getvalue()) == SolarPanelCalculator(panels).calculate()
+
+
+def test_int_coordinates_stay_int():
+    """Tests that int coordinates come out as in the per-object result, for both backends and PanelArray input."""
+    import json
+
+    from source.arrays import PanelArray
+
+    panels = [
+        Panel(
+            top_left=Point(c * 45 if c % 2 else c * 45.0, r * 72 if r % 2 else float(r * 72)),
+            width=45,
+            height=72,
+        )
+        for r in range(3)
+        for c in range(4)
+    ]
+    expected = json.dumps(SolarPanelCalculator(panels).calculate())
+
+    assert '"y": 144}' in expected and '"y": 72.0}' in expected
+    for layout in (panels, PanelArray.from_panels(panels)):
+        for backend in SolarPanelCalculator.BACKENDS:
+            assert json.dumps(SolarPanelCalculator(layout, backend=backend).calculate()) == expected
@@ -0,0 +1,71 @@
+from source.arrays import PanelArray
+from source.calculators.solar_panel_calculator import SolarPanelCalculator
+from source.domain import Panel, Point
+from source.validators.verdict import CANTILEVER_RULE, SPAN_RULE, Verdict, Violation
+
+VALID_PANELS = [Panel(top_left=Point(i * 45.05, 0)) for i in range(4)]
+# the left cantilever of both segments is 17.0
+INVALID_PANELS = [Panel(top_left=Point(-1, 0)), Panel(top_left=Point(-1, 200))]
+
+
+def test_valid_layout_is_feasible():
+    """Tests the verdict of a buildable layout."""
+    calculator = SolarPanelCalculator(VALID_PANELS)
+
+    verdict = calculator.check()
+
+    assert verdict.feasible
+    assert verdict.violations == []
+    assert calculator.is_feasible()
+    assert verdict.to_dict() == {"feasible": True, "violations": []}
+
+
+def test_empty_layout_is_feasible():
+    """Tests the verdict of a layout without panels."""
+    assert SolarPanelCalculator([]).is_feasible()
+
+
+def test_first_violation_matches_calculate_error():
+    """Tests that the short-circuit check reports the error of calculate()."""
+    calculator = SolarPanelCalculator(INVALID_PANELS)
+
+    verdict = calculator.check()
+
+    assert not verdict
+    assert len(verdict.violations) == 1
+    violation = verdict.violations[0]
+    assert violation.rule == CANTILEVER_RULE
+    assert violation.segment_index == 0
+    assert calculator.calculate()["message"] == (
+        f"Cantilever Limit violated: {violation.message}"
+    )
+
+
+def test_collect_all_violations():
+    """Tests that all violated segments are reported in one pass."""
+    verdict = SolarPanelCalculator(INVALID_PANELS).check(collect_all=True)
+
+    assert [violation.segment_index for violation in verdict.violations] == [0, 1]
+    assert verdict.to_dict()["violations"][1] == {
+        "rule": CANTILEVER_RULE,
+        "message": "Cantilever exceeded on the left side of segment: 16.0 - -1 > 16.0",
+        "segment": {"index": 1, "left": -1, "right": 43.7},
+        "panel": None,
+    }
+
+
+def test_check_of_panel_array():
+    """Tests that both backends and PanelArray input are checked."""
+    panels = PanelArray.from_panels(INVALID_PANELS)
+
+    assert not SolarPanelCalculator(panels).is_feasible()
+    assert SolarPanelCalculator(PanelArray.from_panels(VALID_PANELS)).is_feasible()
+
+
+def test_span_violation_to_dict():
+    """Tests the JSON-ready structure of a panel violation."""
+    panel = Panel(top_left=Point(0, 0))
+    violation = Violation(SPAN_RULE, "Span limit exceeded", 2, 0, 44.7, panel)
+
+    assert violation.to_dict()["panel"] == {"x": 0, "y": 0}
+    assert not Verdict([violation]).feasible